@@ -1,19 +1,30 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from pydantic import BaseModel
-from typing import List
-import spacy
-import time
-import re
+from typing import List, Optional
+import os
+import sys
 
-# Load smaller model for Vercel (50MB limit)
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    import subprocess
-    import sys
-    subprocess.run([sys.executable, "-m", "spacy", "download", "en_core_web_sm"])
-    nlp = spacy.load("en_core_web_sm")
+# Share the evaluation code path with src/api.py (bundled via vercel.json includeFiles)
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from pipeline.evaluation import Pipeline
+from pipeline.registry import resolve_metrics
+from pipeline.records import dumps
+
+# Smaller model for Vercel (50MB limit): the 'fast' profile only loads en_core_web_sm.
+# Set EVAL_PROFILE=tiered on deployments that can also ship en_core_web_md.
+PROFILE = os.environ.get("EVAL_PROFILE", "fast")
+
+# Built on the first evaluation, so cold starts that only serve /health stay cheap
+_pipeline = None
+
+def get_pipeline() -> Pipeline:
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = Pipeline(profile=PROFILE)
+    return _pipeline
 
 app = FastAPI(title="LLM Evaluation API")
 
@@ -29,125 +40,50 @@ class EvalRequest(BaseModel):
     query: str
     response: str
     context: List[str]
+    # Subset of registered metrics to compute (default: all but the opt-in context_relevance
+    # and groundedness), e.g. ["hallucination"]
+    metrics: Optional[List[str]] = None
 
-# ============ RELEVANCE ============
-def evaluate_relevance(query: str, response: str) -> float:
-    if not query or not response:
-        return 0.0
-    
-    q_doc = nlp(query.lower())
-    r_doc = nlp(response.lower())
-    
-    # Intent detection
-    text = query.lower()
-    expected = set()
-    if any(w in text for w in ["cost", "price", "how much"]):
-        expected.add("MONEY")
-    if any(w in text for w in ["when", "time", "date"]):
-        expected.add("DATE")
-    
-    found = {ent.label_ for ent in r_doc.ents}
-    intent_score = 0.85 if expected and not expected.isdisjoint(found) else 0.0
-    
-    # Lemma overlap
-    q_lemmas = {t.lemma_ for t in q_doc if not t.is_stop and not t.is_punct}
-    r_lemmas = {t.lemma_ for t in r_doc if not t.is_stop and not t.is_punct}
-    lemma_sim = len(q_lemmas & r_lemmas) / len(q_lemmas) if q_lemmas else 0.0
-    
-    return max(intent_score, lemma_sim, 0.3)
+class EvalMetrics(BaseModel):
+    # Metrics that were not requested are omitted (null)
+    relevance: Optional[float] = None
+    completeness: Optional[float] = None
+    hallucination: Optional[float] = None
+    context_relevance: Optional[float] = None
+    groundedness: Optional[float] = None
+    latency_ms: float
+    estimated_cost_usd: Optional[float] = None
 
-# ============ COMPLETENESS ============
-def evaluate_completeness(query: str, response: str) -> float:
-    if not query or not response:
-        return 0.0
-    
-    q_doc = nlp(query.lower())
-    r_doc = nlp(response.lower())
-    
-    q_lemmas = {t.lemma_ for t in q_doc if not t.is_stop and not t.is_punct}
-    r_lemmas = {t.lemma_ for t in r_doc if not t.is_stop and not t.is_punct}
-    
-    overlap = len(q_lemmas & r_lemmas) / len(q_lemmas) if q_lemmas else 0.5
-    
-    # Follow-up bonus
-    followup = any(p in response.lower() for p in ["would you like", "let me know", "anything else"])
-    
-    return min(overlap + (0.2 if followup else 0) + 0.3, 1.0)
+class Verdict(BaseModel):
+    status: str
+    reasons: List[str]
 
-# ============ HALLUCINATION ============
-def evaluate_hallucination(response: str, context: List[str]) -> dict:
-    if not response:
-        return {"score": 0.0, "unsupported_claims": []}
-    if not context:
-        return {"score": 1.0, "unsupported_claims": [{"text": "No context", "reason": "Cannot verify"}]}
-    
-    full_context = " ".join(context).lower()
-    r_doc = nlp(response)
-    
-    unsupported = []
-    total = 0
-    errors = 0
-    
-    # Check entities
-    for ent in r_doc.ents:
-        if ent.label_ in ["MONEY", "DATE", "CARDINAL", "PERCENT"]:
-            total += 1
-            if ent.text.lower() not in full_context:
-                errors += 1
-                unsupported.append({"text": ent.text, "reason": f"'{ent.text}' not in context"})
-    
-    score = errors / total if total > 0 else 0.0
-    return {"score": score, "unsupported_claims": unsupported}
+class EvalResponse(BaseModel):
+    metrics: EvalMetrics
+    verdict: Verdict
+    tier: Optional[str] = None
+    config_version: Optional[str] = None
 
-# ============ PIPELINE ============
-@app.post("/evaluate")
+@app.post("/evaluate", response_model=EvalResponse, response_model_exclude_none=True)
 async def evaluate(request: EvalRequest):
-    start = time.time()
-    
-    relevance = evaluate_relevance(request.query, request.response)
-    completeness = evaluate_completeness(request.query, request.response)
-    hall_result = evaluate_hallucination(request.response, request.context)
-    
-    latency = (time.time() - start) * 1000
-    cost = len(request.query + request.response) * 0.000001
-    
-    # Verdict
-    verdict = "PASS"
-    reasons = []
-    
-    if hall_result["score"] > 0.5:
-        verdict = "FAIL"
-        claims = [c["text"] for c in hall_result["unsupported_claims"][:3]]
-        reasons.append(f"High hallucination: {', '.join(claims)}" if claims else "High hallucination")
-    elif hall_result["score"] > 0.1:
-        verdict = "WARN"
-        reasons.append("Potential hallucination")
-    
-    if relevance < 0.2:
-        verdict = "FAIL" if relevance < 0.05 else "WARN"
-        reasons.append("Low relevance")
-    
-    if completeness < 0.5 and verdict == "PASS":
-        verdict = "WARN"
-        reasons.append("Incomplete")
-    
-    return {
-        "metrics": {
-            "relevance": round(relevance, 4),
-            "completeness": round(completeness, 4),
-            "hallucination": round(hall_result["score"], 4),
-            "latency_ms": round(latency, 2),
-            "estimated_cost_usd": round(cost, 6)
-        },
-        "verdict": {
-            "status": verdict,
-            "reasons": reasons
-        }
-    }
+    if not request.query or not request.response:
+        raise HTTPException(status_code=400, detail="Query and Response cannot be empty.")
+    try:
+        resolve_metrics(request.metrics)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        report = get_pipeline().run(request.query, request.response, request.context, metrics=request.metrics)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    # Serialized straight from the report objects: EvalResponse only documents the schema
+    return Response(content=dumps(report.public()), media_type="application/json")
 
 @app.get("/health")
 async def health():
-    return {"status": "healthy", "model": "en_core_web_sm", "platform": "vercel"}
+    model = "en_core_web_sm" if PROFILE == "fast" else "en_core_web_sm+en_core_web_md"
+    return {"status": "healthy", "model": model, "profile": PROFILE, "platform": "vercel"}
 
 @app.get("/")
 async def root():
@@ -31,6 +31,41 @@ function App() {
   const [result, setResult] = useState(null);
   const [error, setError] = useState(null);
 
+  // Parses a text/event-stream body, calling onEvent(event, data) for each complete event
+  const readEventStream = async (res, onEvent) => {
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+    for (;;) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+      let boundary;
+      while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+        const block = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+        let event = "message";
+        let data = "";
+        for (const line of block.split("\n")) {
+          if (line.startsWith("event: ")) event = line.slice(7);
+          else if (line.startsWith("data: ")) data += line.slice(6);
+        }
+        if (data) onEvent(event, JSON.parse(data));
+      }
+    }
+  };
+
+  const readError = async (res) => {
+    let errorMsg = `Server Error (${res.status})`;
+    try {
+      const errData = await res.json();
+      if (errData.detail) errorMsg = errData.detail;
+    } catch (e) {
+      // ignore invalid json
+    }
+    return new Error(errorMsg);
+  };
+
   const handleEvaluate = async () => {
     setLoading(true);
     setError(null);
@@ -42,7 +77,7 @@ function App() {
         .split("\n")
         .filter((line) => line.trim() !== "");
 
-      const res = await fetch(`${API_URL}/evaluate`, {
+      const request = {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -52,21 +87,40 @@ function App() {
           response,
           context: contextList,
         }),
-      });
+      };
 
-      if (!res.ok) {
-        let errorMsg = `Server Error (${res.status})`;
-        try {
-          const errData = await res.json();
-          if (errData.detail) errorMsg = errData.detail;
-        } catch (e) {
-          // ignore invalid json
-        }
-        throw new Error(errorMsg);
-      }
+      // Streamed evaluation: metrics show up as each stage finishes, the verdict last
+      const res = await fetch(`${API_URL}/evaluate/events`, request);
 
-      const data = await res.json();
-      setResult(data);
+      if (res.status === 404 || res.status === 405) {
+        // Deployments without the events endpoint (e.g. the Vercel API): one-shot evaluation
+        const fallback = await fetch(`${API_URL}/evaluate`, request);
+        if (!fallback.ok) throw await readError(fallback);
+        setResult({ ...(await fallback.json()), final: true });
+        return;
+      }
+      if (!res.ok) throw await readError(res);
+
+      setResult({ metrics: {}, verdict: null, unsupported_claims: [], final: false });
+      await readEventStream(res, (event, data) => {
+        if (event === "metric") {
+          setResult((prev) => ({
+            ...prev,
+            metrics: { ...prev.metrics, [data.name]: data.value },
+            verdict: data.verdict,
+            tier: data.tier,
+          }));
+        } else if (event === "claim") {
+          setResult((prev) => ({ ...prev, unsupported_claims: [...prev.unsupported_claims, data] }));
+        } else if (event === "escalate") {
+          // A tiered run restarts on the full tier: earlier scores are superseded
+          setResult((prev) => ({ ...prev, metrics: {}, unsupported_claims: [], verdict: null }));
+        } else if (event === "verdict") {
+          setResult((prev) => ({ ...prev, ...data, final: true }));
+        } else if (event === "error") {
+          throw new Error(data.detail);
+        }
+      });
     } catch (err) {
       setError(err.message);
     } finally {
@@ -600,7 +654,14 @@ function App() {
 
               {result && (
                 <div className="space-y-6 animate-fade-in">
-                  {/* Verdict Banner */}
+                  {!result.verdict && (
+                    <div className="glass-card rounded-2xl p-6 flex items-center gap-3 text-sm text-slate-400">
+                      <div className="w-4 h-4 border-2 border-white/30 border-t-white rounded-full animate-spin" />
+                      <span>Waiting for the first metrics...</span>
+                    </div>
+                  )}
+                  {/* Verdict Banner (provisional until the final verdict event) */}
+                  {result.verdict && (
                   <div className={`relative overflow-hidden rounded-2xl p-6 border ${result.verdict.status === 'PASS'
                     ? 'bg-green-500/10 border-green-500/20'
                     : 'bg-red-500/10 border-red-500/20'
@@ -613,7 +674,11 @@ function App() {
                             {result.verdict.status}
                           </h2>
                         </div>
-                        <p className="text-xs text-slate-400 font-mono">Latency: {result.metrics.latency_ms.toFixed(0)}ms</p>
+                        <p className="text-xs text-slate-400 font-mono">
+                          {result.final && result.metrics.latency_ms !== undefined
+                            ? `Latency: ${result.metrics.latency_ms.toFixed(0)}ms`
+                            : "Provisional: evaluating remaining metrics..."}
+                        </p>
                       </div>
                       <div className={`px-3 py-1 rounded-full text-[10px] font-bold uppercase tracking-wider border ${result.verdict.status === 'PASS'
                         ? 'bg-green-500/20 border-green-500/30 text-green-300'
@@ -637,6 +702,7 @@ function App() {
                     <div className={`absolute -right-10 -bottom-10 w-40 h-40 blur-3xl opacity-20 rounded-full ${result.verdict.status === 'PASS' ? 'bg-green-500' : 'bg-red-500'
                       }`} />
                   </div>
+                  )}
 
                   {/* Metrics Cards */}
                   <div className="grid grid-cols-3 gap-4">
@@ -649,7 +715,7 @@ function App() {
                         <div className={`absolute inset-0 opacity-0 group-hover:opacity-10 transition-opacity duration-500 ${metric.bg}`} />
                         <metric.icon className={`w-5 h-5 mb-2 ${metric.color}`} />
                         <div className="text-2xl font-bold text-slate-200 mb-1">
-                          {(metric.score * 100).toFixed(0)}%
+                          {metric.score === undefined ? "…" : `${(metric.score * 100).toFixed(0)}%`}
                         </div>
                         <div className="text-[10px] font-semibold text-slate-500 uppercase tracking-widest">{metric.label}</div>
 
@@ -657,7 +723,7 @@ function App() {
                         <div className="absolute bottom-0 left-0 h-1 w-full bg-slate-800">
                           <div
                             className={`h-full ${metric.bg} transition-all duration-1000`}
-                            style={{ width: `${metric.score * 100}%` }}
+                            style={{ width: `${(metric.score ?? 0) * 100}%` }}
                           />
                         </div>
                       </div>
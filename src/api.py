@@ -1,8 +1,14 @@
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Optional
-import uvicorn
+from fastapi.responses import Response, StreamingResponse
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+from pydantic import BaseModel, ValidationError
+from typing import Any, Dict, List, Optional
+import json
+import logging
+import tempfile
+import threading
 import os
 import sys
 
@@ -11,18 +17,42 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 try:
     from src.pipeline.evaluation import Pipeline
+    from src.pipeline.registry import resolve_metrics
+    from src.pipeline.admission import AdmissionController, AdmissionRejected
+    from src.pipeline.log import configure_logging, request_context
+    from src.pipeline.session import SessionEvaluator, SessionStore, StaleTurn
+    from src.pipeline.records import dumps
 except ImportError:
     try:
         from pipeline.evaluation import Pipeline
+        from pipeline.registry import resolve_metrics
+        from pipeline.admission import AdmissionController, AdmissionRejected
+        from pipeline.log import configure_logging, request_context
+        from pipeline.session import SessionEvaluator, SessionStore, StaleTurn
+        from pipeline.records import dumps
     except ImportError:
         # Last resort for local runs inside src
         sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
         from pipeline.evaluation import Pipeline
+        from pipeline.registry import resolve_metrics
+        from pipeline.admission import AdmissionController, AdmissionRejected
+        from pipeline.log import configure_logging, request_context
+        from pipeline.session import SessionEvaluator, SessionStore, StaleTurn
+        from pipeline.records import dumps
+
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Structured JSON logs through a background queue listener
+    configure_logging()
+    yield
 
 app = FastAPI(
     title="LLM Evaluation Microservice",
     description="API for evaluating Relevance, Completeness, and Hallucination of LLM responses.",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -33,20 +63,78 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize pipeline once (load models)
-pipeline = Pipeline()
+@app.middleware("http")
+async def correlation_id(request: Request, call_next):
+    """
+    Binds a request id (from X-Request-ID, or a new one) to all log records
+    of the request and echoes it back in the response headers.
+    """
+    with request_context(request.headers.get("X-Request-ID")) as request_id:
+        response = await call_next(request)
+    response.headers["X-Request-ID"] = request_id
+    return response
+
+# The pipeline is built on first use, not at import time, so that cold starts
+# and /health stay cheap (spaCy itself is only imported when a model loads).
+# EVAL_PROFILE: 'full' (default), 'fast' or 'tiered' (see pipeline.evaluation.PROFILES)
+# EVAL_PARALLEL=1: run evaluators concurrently within a request (lower single-request latency)
+# EVAL_PRESELECT=topk: verify claims only against the best-matching context chunks
+#
+# Per-request and global cost budgets (EVAL_MAX_REQUEST_BYTES, EVAL_MAX_REQUEST_COST,
+# EVAL_DEGRADE_COST, EVAL_MAX_INFLIGHT_COST, EVAL_DEGRADED_CONTEXT_COST): oversized requests
+# are evaluated with the 'degraded' profile, or rejected with 413 (never fits) / 503 (at capacity, retry)
+#
+# Conversation sessions (/sessions): EVAL_MAX_SESSIONS, EVAL_SESSION_TTL_S (idle expiry)
+# and EVAL_SESSION_WINDOW (turn pairs in the rolling window)
+_pipeline = None
+_admission = None
+_sessions = None
+_init_lock = threading.Lock()
+
+def get_pipeline() -> Pipeline:
+    global _pipeline, _admission, _sessions
+    if _pipeline is None:
+        with _init_lock:
+            if _pipeline is None:
+                pipeline = Pipeline(
+                    profile=os.environ.get("EVAL_PROFILE", "full"),
+                    parallel=os.environ.get("EVAL_PARALLEL") == "1",
+                    preselect=os.environ.get("EVAL_PRESELECT", "exhaustive"),
+                )
+                _admission = AdmissionController.from_env(token_counter=pipeline.cost_evaluator)
+                _sessions = SessionEvaluator(pipeline, SessionStore(
+                    max_sessions=int(os.environ.get("EVAL_MAX_SESSIONS", 1024)),
+                    idle_ttl_s=float(os.environ.get("EVAL_SESSION_TTL_S", 30 * 60)),
+                    window=int(os.environ.get("EVAL_SESSION_WINDOW", 8)),
+                ))
+                _pipeline = pipeline
+    return _pipeline
+
+def get_admission() -> AdmissionController:
+    get_pipeline()
+    return _admission
+
+def get_sessions() -> SessionEvaluator:
+    get_pipeline()
+    return _sessions
 
 class EvalRequest(BaseModel):
     query: str
     response: str
     context: List[str]
+    # Subset of registered metrics to compute (default: all but the opt-in context_relevance
+    # and groundedness), e.g. ["hallucination"]
+    metrics: Optional[List[str]] = None
 
 class EvalMetrics(BaseModel):
-    relevance: float
-    completeness: float
-    hallucination: float
+    # Metrics that were not requested are omitted (null)
+    relevance: Optional[float] = None
+    completeness: Optional[float] = None
+    hallucination: Optional[float] = None
+    context_relevance: Optional[float] = None
+    groundedness: Optional[float] = None
     latency_ms: float
-    estimated_cost_usd: float
+    estimated_cost_usd: Optional[float] = None
 
 class Verdict(BaseModel):
     status: str
@@ -55,22 +143,302 @@ class Verdict(BaseModel):
 class EvalResponse(BaseModel):
     metrics: EvalMetrics
     verdict: Verdict
+    tier: Optional[str] = None
+    config_version: Optional[str] = None
+    # 'degraded' when admission control downgraded the request to the 'degraded' profile
+    admission: Optional[str] = None
+
+def _admission_error(e: AdmissionRejected) -> HTTPException:
+    logger.warning("Request rejected", extra={"fields": {"status": e.status_code, "reason": e.detail}})
+    headers = {"Retry-After": str(e.retry_after)} if e.retry_after else None
+    return HTTPException(status_code=e.status_code, detail=e.detail, headers=headers)
 
-@app.post("/evaluate", response_model=EvalResponse)
+@app.post("/evaluate", response_model=EvalResponse, response_model_exclude_none=True)
 async def evaluate_response(request: EvalRequest):
     """
     Evaluates a single Query-Response pair against the provided Context.
     """
     if not request.query or not request.response:
         raise HTTPException(status_code=400, detail="Query and Response cannot be empty.")
+    try:
+        resolve_metrics(request.metrics)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    pipeline, admission = get_pipeline(), get_admission()
+
+    # Off the event loop: estimating a large request means tokenizing it
+    try:
+        ticket = await run_in_threadpool(admission.admit, request.query, request.response, request.context)
+    except AdmissionRejected as e:
+        raise _admission_error(e)
+
+    try:
+        result = await run_in_threadpool(
+            pipeline.run, request.query, request.response, request.context,
+            request.metrics, "degraded" if ticket.degraded else None,
+        )
+        if ticket.degraded:
+            result.admission = "degraded"
+        # Serialized straight from the report objects: EvalResponse only documents the schema
+        return Response(content=dumps(result.public()), media_type="application/json")
+    except Exception as e:
+        logger.exception("Evaluation failed")
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        admission.release(ticket)
+
+def _sse(event: str, payload) -> bytes:
+    return b"event: " + event.encode("ascii") + b"\ndata: " + dumps(payload) + b"\n\n"
+
+class _AdmittedStreamingResponse(StreamingResponse):
+    """
+    Holds an admission ticket until the response is sent or abandoned, also when
+    the client disconnects before the body starts (the body generator, never
+    started, would not run its own cleanup).
+    """
+
+    def __init__(self, content, admission: AdmissionController, ticket, **kwargs):
+        super().__init__(content, **kwargs)
+        self.admission = admission
+        self.ticket = ticket
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.admission.release(self.ticket)
+
+@app.post("/evaluate/events")
+async def evaluate_events(request: EvalRequest):
+    """
+    Same evaluation as /evaluate, as server-sent events emitted as each stage completes:
+    `metric` ({name, value, tier, elapsed_ms, verdict}: the provisional verdict so far),
+    `claim` (an unsupported claim), `escalate` (a tiered run restarts on the full tier),
+    then `verdict` (the /evaluate response body) or `error`.
+    """
+    if not request.query or not request.response:
+        raise HTTPException(status_code=400, detail="Query and Response cannot be empty.")
+    try:
+        resolve_metrics(request.metrics)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    pipeline, admission = get_pipeline(), get_admission()
+    try:
+        ticket = await run_in_threadpool(admission.admit, request.query, request.response, request.context)
+    except AdmissionRejected as e:
+        raise _admission_error(e)
+
+    async def events():
+        try:
+            stages = pipeline.run_events(request.query, request.response, request.context,
+                                         request.metrics, "degraded" if ticket.degraded else None)
+            # Each stage runs on the threadpool; the event loop only forwards the events
+            async for event, payload in iterate_in_threadpool(stages):
+                if event == "report":
+                    if ticket.degraded:
+                        payload.admission = "degraded"
+                    yield _sse("verdict", payload.public())
+                else:
+                    yield _sse(event, payload)
+        except Exception as e:
+            logger.exception("Evaluation failed")
+            yield _sse("error", {"detail": str(e)})
+
+    return _AdmittedStreamingResponse(events(), admission, ticket, media_type="text/event-stream",
+                                      headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+# Uploads up to this size stay in memory, larger ones spill to a temp file
+STREAM_SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+def _stream_error(line_no: int, message: str, record_id=None) -> str:
+    entry = {"line": line_no, "error": message}
+    if record_id is not None:
+        entry["id"] = record_id
+    return json.dumps(entry) + "\n"
+
+@app.post("/evaluate/stream")
+async def evaluate_stream(request: Request):
+    """
+    Batch evaluation over NDJSON: one {query, response, context} object per line
+    (an optional "id" is echoed back). Results are streamed as NDJSON, one line
+    per input line, in order, as soon as each is evaluated.
+
+    The upload is spooled (to disk past STREAM_SPOOL_MAX_BYTES), and the next
+    record is only evaluated once the previous result has been handed to the
+    client, so a slow reader throttles evaluation and memory stays constant.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=STREAM_SPOOL_MAX_BYTES)
+    async for chunk in request.stream():
+        spool.write(chunk)
+    spool.seek(0)
+
+    pipeline, admission = get_pipeline(), get_admission()
+
+    async def results():
+        try:
+            for line_no, raw in enumerate(spool, start=1):
+                if not raw.strip():
+                    continue
+                try:
+                    data = json.loads(raw)
+                    item = EvalRequest.model_validate(data)
+                except (json.JSONDecodeError, ValidationError) as e:
+                    yield _stream_error(line_no, f"Invalid record: {e}")
+                    continue
+
+                record_id = data.get("id")
+                if not item.query or not item.response:
+                    yield _stream_error(line_no, "Query and Response cannot be empty.", record_id)
+                    continue
+
+                try:
+                    ticket = await run_in_threadpool(admission.admit, item.query, item.response, item.context)
+                except AdmissionRejected as e:
+                    yield _stream_error(line_no, e.detail, record_id)
+                    continue
+
+                try:
+                    report = await run_in_threadpool(
+                        pipeline.run, item.query, item.response, item.context,
+                        item.metrics, "degraded" if ticket.degraded else None,
+                    )
+                except Exception as e:
+                    logger.exception("Evaluation failed", extra={"fields": {"line": line_no}})
+                    yield _stream_error(line_no, str(e), record_id)
+                    continue
+                finally:
+                    admission.release(ticket)
+                if ticket.degraded:
+                    report.admission = "degraded"
+
+                entry = {"line": line_no}
+                if record_id is not None:
+                    entry["id"] = record_id
+                entry.update(report.public())
+                yield dumps(entry) + b"\n"
+        finally:
+            spool.close()
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+class TurnRequest(BaseModel):
+    # One User/AI turn pair of the conversation
+    query: str
+    response: str
+    # Number of the AI turn (default: the one after the last evaluated turn)
+    turn: Optional[int] = None
+    # Replaces the session's context from this turn on (required for a new session)
+    context: Optional[List[str]] = None
+    metrics: Optional[List[str]] = None
+
+class SyncRequest(BaseModel):
+    # A `conversation_turns` export with its chat_id (see samples/sample-chat-conversation-*.json)
+    conversation: Dict[str, Any]
+    context: Optional[List[str]] = None
+    metrics: Optional[List[str]] = None
+
+@app.post("/sessions/{chat_id}/turns")
+async def append_turn(chat_id: str, request: TurnRequest):
+    """
+    Evaluates the new turn pair of a conversation and updates its rolling
+    conversation-level metrics. Earlier turns are not re-scored.
+    """
+    if not request.query or not request.response:
+        raise HTTPException(status_code=400, detail="Query and Response cannot be empty.")
+    try:
+        resolve_metrics(request.metrics)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    sessions, admission = get_sessions(), get_admission()
+    context = request.context
+    if context is None:
+        session = sessions.store.get(chat_id)
+        context = session.context if session is not None else []
+
+    try:
+        ticket = await run_in_threadpool(admission.admit, request.query, request.response, context)
+    except AdmissionRejected as e:
+        raise _admission_error(e)
+
+    try:
+        result = await run_in_threadpool(
+            sessions.append, chat_id, request.query, request.response, request.turn,
+            request.context, request.metrics, "degraded" if ticket.degraded else None,
+        )
+    except StaleTurn as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        logger.exception("Evaluation failed")
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        admission.release(ticket)
+    if ticket.degraded:
+        result["turn"]["admission"] = "degraded"
+    return {"turn": result["turn"], "conversation": result["conversation"]}
 
+@app.post("/sessions/sync")
+async def sync_session(request: SyncRequest):
+    """
+    Takes the whole conversation export (as re-sent by the frontend after every
+    turn) and evaluates only the turn pairs after the session's last evaluated turn.
+    """
+    if request.conversation.get("chat_id") is None:
+        raise HTTPException(status_code=400, detail="Conversation has no chat_id.")
     try:
-        result = pipeline.run(request.query, request.response, request.context)
-        return result
+        resolve_metrics(request.metrics)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    sessions, admission = get_sessions(), get_admission()
+    # Charged for the turn pairs after the session's last evaluated turn (what this
+    # sync evaluates) and the context they are checked against, not the whole export
+    pending = sessions.pending(request.conversation)
+    if not pending:
+        return await run_in_threadpool(sessions.sync, request.conversation, request.context, request.metrics)
+    context = request.context
+    if context is None:
+        session = sessions.store.get(request.conversation["chat_id"])
+        context = session.context if session is not None else []
+    try:
+        ticket = await run_in_threadpool(
+            admission.admit,
+            "\n".join(user_message for _, user_message, _ in pending),
+            "\n".join(ai_message for _, _, ai_message in pending),
+            context,
+        )
+    except AdmissionRejected as e:
+        raise _admission_error(e)
+
+    try:
+        result = await run_in_threadpool(
+            sessions.sync, request.conversation, request.context, request.metrics,
+            "degraded" if ticket.degraded else None,
+        )
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Evaluation failed")
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        admission.release(ticket)
+    if ticket.degraded:
+        result["admission"] = "degraded"
+    return result
+
+@app.get("/sessions/{chat_id}")
+async def get_session(chat_id: str):
+    """Conversation-level metrics of a live session."""
+    summary = get_sessions().summary(chat_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail=f"No session for chat {chat_id}.")
+    return summary
+
+@app.delete("/sessions/{chat_id}")
+async def delete_session(chat_id: str):
+    if not get_sessions().store.delete(chat_id):
+        raise HTTPException(status_code=404, detail=f"No session for chat {chat_id}.")
+    return {"deleted": chat_id}
 
 @app.get("/health")
 async def health_check():
@@ -87,4 +455,6 @@ async def probe_check():
     return {"status": "ok"}
 
 if __name__ == "__main__":
+    import uvicorn
+
     uvicorn.run(app, host="0.0.0.0", port=8000)
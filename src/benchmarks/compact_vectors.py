@@ -0,0 +1,154 @@
+"""
+Builds a compact (PCA-reduced and/or int8) copy of the model's static vector
+table, and reports what it changes: the golden corpus is evaluated with full
+precision (en_core_web_md) and with the compact table (en_core_web_sm parses,
+en_core_web_md is not loaded), each in a fresh process, and the peak RSS,
+scores and verdicts of the two runs are compared.
+
+Usage (from the repo root):
+    python src/benchmarks/compact_vectors.py build --dim 128 --int8 --out vectors/md-128-int8.npz
+    python src/benchmarks/compact_vectors.py report --table vectors/md-128-int8.npz --out runs/compact.json
+    EVAL_COMPACT_VECTORS=vectors/md-128-int8.npz python src/main.py --conv ... --ctx ...
+Exits 1 if the report finds a verdict change.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Optional
+
+# Allow importing 'pipeline' from 'src'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.golden import SAMPLES_DIR, _load, _save, run_corpus
+from pipeline.vectors import CompactVectors
+
+# Metrics that read the vector table
+VECTOR_METRICS = ["relevance", "completeness", "context_relevance", "groundedness"]
+
+
+def build_table(model_name: str = "en_core_web_md", dim: int = None, quantize: bool = True) -> CompactVectors:
+    from pipeline.model import LazyNLP
+
+    model = LazyNLP(model_name)
+    return CompactVectors.build(model.vocab.vectors, dim=dim, quantize=quantize, source=model_name)
+
+
+def compare_runs(full: dict, compact: dict) -> dict:
+    """
+    Per-metric absolute score differences and verdict changes between a
+    full-precision run and a compact-table run of the same corpus.
+    """
+    deltas: Dict[str, List[float]] = {metric: [] for metric in VECTOR_METRICS}
+    verdict_changes = []
+    for record_id in sorted(set(full["results"]) & set(compact["results"])):
+        before, after = full["results"][record_id], compact["results"][record_id]
+        if before["verdict"] != after["verdict"]:
+            verdict_changes.append({"id": record_id, "full": before["verdict"], "compact": after["verdict"]})
+        for metric in VECTOR_METRICS:
+            if metric in before["metrics"] and metric in after["metrics"]:
+                deltas[metric].append(abs(after["metrics"][metric] - before["metrics"][metric]))
+
+    scores = {
+        metric: {
+            "max_abs_delta": round(max(values, default=0.0), 4),
+            "mean_abs_delta": round(sum(values) / len(values), 6) if values else 0.0,
+            "changed": sum(1 for value in values if value > 1e-4),
+        }
+        for metric, values in deltas.items()
+    }
+    return {"scores": scores, "verdict_changes": verdict_changes, "ok": not verdict_changes}
+
+
+def peak_rss_mib() -> float:
+    """Peak resident set size of this process, in MiB."""
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # KiB on Linux, bytes on macOS
+    return round(peak / (2 ** 20 if sys.platform == "darwin" else 2 ** 10), 1)
+
+
+def measured_run(corpus_path: str, table_path: Optional[str] = None) -> dict:
+    """
+    Golden run of the corpus in a fresh interpreter, so that its peak RSS
+    ('peak_rss_mib') only counts the models and tables of that configuration.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, "run.json")
+        command = [sys.executable, os.path.abspath(__file__), "run", "--corpus", corpus_path, "--out", out]
+        if table_path:
+            command += ["--table", table_path]
+        subprocess.run(command, check=True)
+        return _load(out)
+
+
+def accuracy_report(table_path: str, corpus_path: str) -> dict:
+    table = CompactVectors.load(table_path)
+    full = measured_run(corpus_path)
+    compact = measured_run(corpus_path, table_path)
+    report = compare_runs(full, compact)
+    report["table"] = dict(table.meta, path=table_path, bytes=table.nbytes)
+    report["peak_rss_mib"] = {"full": full["peak_rss_mib"], "compact": compact["peak_rss_mib"]}
+    report["records"] = len(full["results"])
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact vector table builder and accuracy report")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="Build a compact table from the model's vectors")
+    build.add_argument("--model", default="en_core_web_md")
+    build.add_argument("--dim", type=int, help="Principal components kept (default: full width)")
+    build.add_argument("--int8", action="store_true", help="Quantize rows to int8")
+    build.add_argument("--out", required=True)
+
+    report = sub.add_parser("report", help="Compare peak RSS, scores and verdicts against full-precision vectors")
+    report.add_argument("--table", required=True)
+    report.add_argument("--corpus", default=os.path.join(SAMPLES_DIR, "golden", "corpus.json"))
+    report.add_argument("--out", help="Save the report as JSON")
+
+    run = sub.add_parser("run", help="One measured golden run (used by 'report')")
+    run.add_argument("--corpus", required=True)
+    run.add_argument("--table", help="Run with this compact table")
+    run.add_argument("--out", required=True)
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        if args.dim is None and not args.int8:
+            parser.error("Nothing to compact: pass --dim and/or --int8")
+        table = build_table(args.model, dim=args.dim, quantize=args.int8)
+        directory = os.path.dirname(args.out)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        table.save(args.out)
+        print(f"{args.model}: {table.meta['width']} -> {table.width} dims, "
+              f"{'int8' if table.scales is not None else 'float32'}, {table.nbytes / 2**20:.1f} MiB saved to {args.out}")
+        return
+
+    if args.command == "run":
+        result = run_corpus(_load(args.corpus), pipeline_kwargs={"compact_vectors": args.table} if args.table else {})
+        result["peak_rss_mib"] = peak_rss_mib()
+        _save(result, args.out)
+        return
+
+    result = accuracy_report(args.table, args.corpus)
+    if args.out:
+        _save(result, args.out)
+    table, rss = result["table"], result["peak_rss_mib"]
+    print(f"TABLE   {table['dim']} dims, {'int8' if table['quantized'] else 'float32'}, {table['bytes'] / 2**20:.1f} MiB")
+    print(f"RSS     peak {rss['full']} MiB with en_core_web_md, {rss['compact']} MiB with the compact table")
+    for metric, stats in result["scores"].items():
+        print(f"SCORE   {metric}: max |delta| {stats['max_abs_delta']}, mean {stats['mean_abs_delta']}, "
+              f"{stats['changed']}/{result['records']} changed")
+    for change in result["verdict_changes"]:
+        print(f"VERDICT {change['id']}: {change['full']} -> {change['compact']}")
+    print("OK" if result["ok"] else "VERDICTS CHANGED")
+    sys.exit(0 if result["ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
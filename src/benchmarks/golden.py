@@ -0,0 +1,314 @@
+"""
+Golden-corpus runner: evaluates a frozen set of (query, response, context)
+records, stores scores + timings, and diffs runs to catch verdict changes,
+score drift and speed regressions.
+
+Usage (from the repo root):
+    python src/benchmarks/golden.py build --out samples/golden/corpus.json
+    python src/benchmarks/golden.py run --corpus samples/golden/corpus.json --out runs/base.json --workers 4
+    python src/benchmarks/golden.py diff runs/base.json runs/new.json
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import random
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+# Allow importing 'pipeline' from 'src'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipeline.datasets import iter_turn_pairs, load_context_chunks, load_json_lenient
+
+SAMPLES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "samples")
+SAMPLE_PAIRS = [
+    ("sample-chat-conversation-01.json", "sample_context_vectors-01.json"),
+    ("sample-chat-conversation-02.json", "sample_context_vectors-02.json"),
+]
+
+# Metrics computed and compared for drift, including the opt-in ones (latency is
+# compared through the timing summary instead)
+SCORE_METRICS = ["relevance", "completeness", "hallucination", "context_relevance", "groundedness", "estimated_cost_usd"]
+
+_NUMBER_PATTERN = re.compile(r"\d+(?:[.,]\d+)?")
+
+
+# --- Corpus ---
+
+def _shift_numbers(text: str, rng: random.Random) -> Optional[str]:
+    """Changes the first number in the text (a silent numeric hallucination)."""
+    match = _NUMBER_PATTERN.search(text)
+    if not match:
+        return None
+    value = match.group().replace(",", "")
+    shifted = str(int(float(value) * rng.choice([2, 3, 10]) + 1))
+    return text[:match.start()] + shifted + text[match.end():]
+
+
+def _first_sentence(text: str) -> Optional[str]:
+    sentences = re.split(r"(?<=[.!?])\s+", text.strip())
+    if len(sentences) < 2:
+        return None
+    return sentences[0]
+
+
+def build_corpus(samples_dir: str = SAMPLES_DIR, seed: int = 13) -> dict:
+    """
+    Builds the corpus from the sample conversations: every User -> AI turn pair,
+    plus deterministic variations (numeric shift, truncation, swapped query,
+    swapped context).
+    """
+    rng = random.Random(seed)
+    contexts = {}
+    originals = []
+    for i, (conv_file, ctx_file) in enumerate(SAMPLE_PAIRS, start=1):
+        context_id = f"ctx-{i:02d}"
+        contexts[context_id] = load_context_chunks(os.path.join(samples_dir, ctx_file))
+        conversation = load_json_lenient(os.path.join(samples_dir, conv_file))
+        for turn, query, response in iter_turn_pairs(conversation):
+            originals.append({
+                "id": f"conv-{i:02d}-t{turn}",
+                "query": query,
+                "response": response,
+                "context_id": context_id,
+                "variation": "original",
+            })
+
+    records = list(originals)
+    context_ids = sorted(contexts)
+    for n, record in enumerate(originals):
+        base_id = record["id"]
+
+        shifted = _shift_numbers(record["response"], rng)
+        if shifted:
+            records.append(dict(record, id=f"{base_id}-numeric", response=shifted, variation="numeric_shift"))
+
+        truncated = _first_sentence(record["response"])
+        if truncated:
+            records.append(dict(record, id=f"{base_id}-truncated", response=truncated, variation="truncate"))
+
+        other = originals[(n + 1) % len(originals)]
+        if other["query"] != record["query"]:
+            records.append(dict(record, id=f"{base_id}-query-swap", query=other["query"], variation="query_swap"))
+
+        other_context = context_ids[(context_ids.index(record["context_id"]) + 1) % len(context_ids)]
+        if other_context != record["context_id"]:
+            records.append(dict(record, id=f"{base_id}-context-swap", context_id=other_context, variation="context_swap"))
+
+    return {"version": 1, "seed": seed, "contexts": contexts, "records": records}
+
+
+# --- Run ---
+
+_WORKER_PIPELINE = None
+_WORKER_CONTEXTS = None
+_WORKER_READY = None
+
+# Seconds run_corpus waits for every worker to load its models
+WORKER_READY_TIMEOUT_S = 600
+
+
+def _init_worker(pipeline_kwargs: dict, contexts: Dict[str, List[str]], ready=None) -> None:
+    global _WORKER_PIPELINE, _WORKER_CONTEXTS, _WORKER_READY
+    from pipeline.evaluation import Pipeline
+
+    _WORKER_PIPELINE = Pipeline(**pipeline_kwargs)
+    _WORKER_CONTEXTS = contexts
+    _WORKER_READY = ready
+    # Load the model outside the timed region
+    _WORKER_PIPELINE.run("warm up", "warm up", ["warm up"], metrics=SCORE_METRICS)
+
+
+def _wait_ready(_) -> int:
+    """
+    Blocks until all workers are in this call. A worker only takes tasks once its
+    initializer (model load and warm-up) is done, and each one holds its task at
+    the barrier, so the `workers` calls run on `workers` distinct, warm processes.
+    """
+    _WORKER_READY.wait(WORKER_READY_TIMEOUT_S)
+    return os.getpid()
+
+
+def _evaluate_record(record: dict) -> tuple:
+    start = time.perf_counter()
+    report = _WORKER_PIPELINE.run(record["query"], record["response"], _WORKER_CONTEXTS[record["context_id"]],
+                                  metrics=SCORE_METRICS)
+    wall_ms = (time.perf_counter() - start) * 1000
+    return record["id"], {
+        "metrics": report["metrics"],
+        "verdict": report["verdict"]["status"],
+        "reasons": report["verdict"]["reasons"],
+        "wall_ms": round(wall_ms, 3),
+    }
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def run_corpus(corpus: dict, workers: int = 1, pipeline_kwargs: dict = None) -> dict:
+    pipeline_kwargs = pipeline_kwargs or {}
+    records = corpus["records"]
+
+    start = time.perf_counter()
+    if workers > 1:
+        ready = multiprocessing.Barrier(workers)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(pipeline_kwargs, corpus["contexts"], ready)) as executor:
+            # Let every worker finish loading before the clock starts
+            list(executor.map(_wait_ready, range(workers)))
+            start = time.perf_counter()
+            results = dict(executor.map(_evaluate_record, records, chunksize=4))
+    else:
+        _init_worker(pipeline_kwargs, corpus["contexts"])
+        start = time.perf_counter()
+        results = dict(_evaluate_record(record) for record in records)
+    total_s = time.perf_counter() - start
+
+    wall = [result["wall_ms"] for result in results.values()]
+    return {
+        "corpus_sha1": hashlib.sha1(json.dumps(corpus, sort_keys=True).encode("utf-8")).hexdigest(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "pipeline": pipeline_kwargs,
+        "workers": workers,
+        "summary": {
+            "records": len(records),
+            "total_s": round(total_s, 3),
+            "throughput_rps": round(len(records) / total_s, 3) if total_s else 0.0,
+            "p50_ms": round(_percentile(wall, 50), 3),
+            "p95_ms": round(_percentile(wall, 95), 3),
+            "max_ms": round(max(wall, default=0.0), 3),
+            "verdicts": {status: sum(1 for r in results.values() if r["verdict"] == status)
+                         for status in ("PASS", "WARN", "FAIL")},
+        },
+        "results": results,
+    }
+
+
+# --- Diff ---
+
+def diff_runs(old: dict, new: dict, score_tol: float = 1e-4, speed_tol: float = 0.2) -> dict:
+    """
+    Compares two runs record by record.
+    score_tol: absolute tolerance per metric. speed_tol: allowed relative slowdown of p95/throughput.
+    """
+    verdict_changes = []
+    score_drift = []
+    old_results, new_results = old["results"], new["results"]
+
+    for record_id in sorted(set(old_results) & set(new_results)):
+        before, after = old_results[record_id], new_results[record_id]
+        if before["verdict"] != after["verdict"]:
+            verdict_changes.append({"id": record_id, "old": before["verdict"], "new": after["verdict"]})
+        for metric in SCORE_METRICS:
+            if metric not in before["metrics"] or metric not in after["metrics"]:
+                continue
+            delta = after["metrics"][metric] - before["metrics"][metric]
+            if abs(delta) > score_tol:
+                score_drift.append({"id": record_id, "metric": metric, "old": before["metrics"][metric],
+                                    "new": after["metrics"][metric], "delta": round(delta, 6)})
+
+    old_summary, new_summary = old["summary"], new["summary"]
+    speed = {
+        "p95_ms": (old_summary["p95_ms"], new_summary["p95_ms"]),
+        "throughput_rps": (old_summary["throughput_rps"], new_summary["throughput_rps"]),
+    }
+    speed_regression = (
+        new_summary["p95_ms"] > old_summary["p95_ms"] * (1 + speed_tol)
+        or new_summary["throughput_rps"] < old_summary["throughput_rps"] * (1 - speed_tol)
+    )
+
+    missing = sorted(set(old_results) ^ set(new_results))
+    return {
+        "missing": missing,
+        "verdict_changes": verdict_changes,
+        "score_drift": score_drift,
+        "speed": speed,
+        "speed_regression": speed_regression,
+        "ok": not missing and not verdict_changes and not score_drift and not speed_regression,
+    }
+
+
+def _load(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save(data: dict, path: str) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=1, ensure_ascii=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Golden-corpus regression runner")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="Build the frozen corpus from samples/")
+    build.add_argument("--samples", default=SAMPLES_DIR)
+    build.add_argument("--seed", type=int, default=13)
+    build.add_argument("--out", default=os.path.join(SAMPLES_DIR, "golden", "corpus.json"))
+
+    run = sub.add_parser("run", help="Evaluate the corpus and store scores + timings")
+    run.add_argument("--corpus", default=os.path.join(SAMPLES_DIR, "golden", "corpus.json"))
+    run.add_argument("--out", required=True)
+    run.add_argument("--workers", type=int, default=1)
+    run.add_argument("--profile", default="full")
+    run.add_argument("--preselect", default="exhaustive")
+    run.add_argument("--compact-vectors", help="CompactVectors table to score similarities with")
+    run.add_argument("--baseline", help="Previous run to diff against")
+
+    diff = sub.add_parser("diff", help="Compare two runs")
+    diff.add_argument("old")
+    diff.add_argument("new")
+    diff.add_argument("--score-tol", type=float, default=1e-4)
+    diff.add_argument("--speed-tol", type=float, default=0.2)
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        corpus = build_corpus(args.samples, seed=args.seed)
+        _save(corpus, args.out)
+        print(f"Corpus with {len(corpus['records'])} records saved to {args.out}")
+        return
+
+    if args.command == "run":
+        corpus = _load(args.corpus)
+        pipeline_kwargs = {"profile": args.profile, "preselect": args.preselect}
+        if args.compact_vectors:
+            pipeline_kwargs["compact_vectors"] = args.compact_vectors
+        result = run_corpus(corpus, workers=args.workers, pipeline_kwargs=pipeline_kwargs)
+        _save(result, args.out)
+        print(json.dumps(result["summary"], indent=2))
+        if not args.baseline:
+            return
+        old, new = _load(args.baseline), result
+    else:
+        old, new = _load(args.old), _load(args.new)
+
+    report = diff_runs(old, new, score_tol=getattr(args, "score_tol", 1e-4), speed_tol=getattr(args, "speed_tol", 0.2))
+    for change in report["verdict_changes"]:
+        print(f"VERDICT {change['id']}: {change['old']} -> {change['new']}")
+    for drift in report["score_drift"]:
+        print(f"DRIFT   {drift['id']} {drift['metric']}: {drift['old']} -> {drift['new']} ({drift['delta']:+})")
+    for key, (before, after) in report["speed"].items():
+        print(f"SPEED   {key}: {before} -> {after}")
+    if report["missing"]:
+        print(f"MISSING {', '.join(report['missing'])}")
+    print("OK" if report["ok"] else "REGRESSION")
+    sys.exit(0 if report["ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Cold-start benchmark: times fresh interpreters importing the package, running
+the CLI's --help and serving /health from both API entry points, and checks
+that none of them imports spaCy (models load on the first evaluation only).
+
+Usage (from the repo root):
+    python src/benchmarks/import_time.py --runs 5 --budget-ms 800
+Exits 1 if a target imports a deferred module or its median exceeds the budget.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SRC_DIR = os.path.join(REPO_ROOT, "src")
+
+# Must not be imported before a model is actually needed
+DEFERRED_MODULES = ["spacy", "thinc", "uvicorn"]
+
+# Each snippet runs in a fresh interpreter (cwd = repo root) and must define `done()`'s inputs
+_PRELUDE = f"""
+import sys, time, json
+start = time.perf_counter()
+sys.path[:0] = [{SRC_DIR!r}, {REPO_ROOT!r}]
+"""
+_REPORT = f"""
+print(json.dumps({{
+    "elapsed_ms": (time.perf_counter() - start) * 1000,
+    "deferred_imported": [m for m in {DEFERRED_MODULES!r} if m in sys.modules],
+}}))
+"""
+_LOAD_BY_PATH = """
+import importlib.util
+def load(name, path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+"""
+
+TARGETS = {
+    "import pipeline": "import pipeline.evaluation, pipeline.reports, pipeline.registry",
+    "cli --help": (
+        "import runpy, contextlib, io\n"
+        "sys.argv = ['main.py', '--help']\n"
+        "with contextlib.redirect_stdout(io.StringIO()):\n"
+        "    try:\n"
+        f"        runpy.run_path({os.path.join(SRC_DIR, 'main.py')!r}, run_name='__main__')\n"
+        "    except SystemExit:\n"
+        "        pass\n"
+    ),
+    "src.api /health": (
+        _LOAD_BY_PATH
+        + f"app = load('src.api', {os.path.join(SRC_DIR, 'api.py')!r}).app\n"
+        "from fastapi.testclient import TestClient\n"
+        "assert TestClient(app).get('/health').status_code == 200\n"
+    ),
+    "api/index.py /health": (
+        _LOAD_BY_PATH
+        + f"app = load('api_index', {os.path.join(REPO_ROOT, 'api', 'index.py')!r}).app\n"
+        "from fastapi.testclient import TestClient\n"
+        "assert TestClient(app).get('/health').status_code == 200\n"
+    ),
+}
+
+
+def measure(target: str, runs: int = 3) -> Dict:
+    """
+    Runs the target snippet in `runs` fresh interpreters.
+    Returns median/max wall time (interpreter start included), median in-process
+    time, and the deferred modules that were imported anyway.
+    """
+    code = _PRELUDE + TARGETS[target] + _REPORT
+    wall, inside, deferred = [], [], set()
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True)
+        wall.append((time.perf_counter() - start) * 1000)
+        if result.returncode != 0:
+            raise RuntimeError(f"{target} failed:\n{result.stderr}")
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+        inside.append(report["elapsed_ms"])
+        deferred.update(report["deferred_imported"])
+    return {
+        "target": target,
+        "runs": runs,
+        "wall_median_ms": round(statistics.median(wall), 1),
+        "wall_max_ms": round(max(wall), 1),
+        "import_median_ms": round(statistics.median(inside), 1),
+        "deferred_imported": sorted(deferred),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start import benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1000.0,
+                        help="Maximum median in-process time per target")
+    parser.add_argument("--targets", help=f"Comma-separated subset of: {', '.join(TARGETS)}")
+    args = parser.parse_args()
+
+    targets: List[str] = args.targets.split(",") if args.targets else list(TARGETS)
+    ok = True
+    for target in targets:
+        result = measure(target, runs=args.runs)
+        over_budget = result["import_median_ms"] > args.budget_ms
+        ok = ok and not over_budget and not result["deferred_imported"]
+        status = "OVER BUDGET" if over_budget else ("IMPORTS " + ",".join(result["deferred_imported"]) if result["deferred_imported"] else "ok")
+        print(json.dumps(result), status)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+Load-test harness for the evaluation API: drives `src/api.py` or `api/index.py`
+in-process (ASGI, no server) or a running server over HTTP, and reports
+throughput, tail latency and error rates.
+
+Two load models:
+- closed loop (--concurrency N): N clients each send the next request as soon as
+  the previous one returns. Finds the saturation throughput.
+- open loop (--rate R): requests arrive as a Poisson process at R req/s whatever
+  the service does. Latency is measured from the scheduled arrival, so queueing
+  delay is included (no coordinated omission).
+
+Payloads are drawn (seeded) from the golden corpus built from samples/.
+
+Usage (from the repo root):
+    python src/benchmarks/loadtest.py --app src.api:app --concurrency 8 --duration 30
+    python src/benchmarks/loadtest.py --app api.index:app --rate 20 --duration 30
+    python src/benchmarks/loadtest.py --url http://localhost:8000 --rate 50 --duration 60 --out runs/load.json
+"""
+import argparse
+import asyncio
+import importlib
+import importlib.util
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from typing import List, Optional
+
+import httpx
+
+# Allow importing 'benchmarks'/'pipeline' from 'src', and 'src.api'/'api.index' from the repo root
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_ROOT = os.path.dirname(SRC_DIR)
+sys.path.append(SRC_DIR)
+sys.path.append(REPO_ROOT)
+
+from benchmarks.golden import SAMPLES_DIR, _load, _percentile, _save
+
+PERCENTILES = (50, 95, 99, 99.9)
+
+
+def load_payloads(corpus_path: str, variations: Optional[List[str]] = None) -> List[dict]:
+    """
+    /evaluate request bodies from a golden corpus, optionally restricted to
+    some variations (e.g. ['original', 'numeric_shift']).
+    """
+    corpus = _load(corpus_path)
+    return [
+        {"query": r["query"], "response": r["response"], "context": corpus["contexts"][r["context_id"]]}
+        for r in corpus["records"]
+        if not variations or r["variation"] in variations
+    ]
+
+
+def load_app(spec: str):
+    """Imports an ASGI app from 'module:attribute' (e.g. 'src.api:app')."""
+    module_name, _, attribute = spec.partition(":")
+    # Repo files are loaded by path: with src/ on sys.path, 'api' would resolve to
+    # src/api.py instead of the api/ directory of the Vercel entry point
+    path = os.path.join(REPO_ROOT, *module_name.split(".")) + ".py"
+    if os.path.exists(path):
+        module_spec = importlib.util.spec_from_file_location(module_name, path)
+        module = importlib.util.module_from_spec(module_spec)
+        sys.modules[module_name] = module
+        module_spec.loader.exec_module(module)
+    else:
+        module = importlib.import_module(module_name)
+    return getattr(module, attribute or "app")
+
+
+class _Recorder:
+    def __init__(self):
+        self.latencies_ms: List[float] = []
+        self.errors = Counter()
+
+    def record(self, latency_ms: float, error: Optional[str]) -> None:
+        if error is None:
+            self.latencies_ms.append(latency_ms)
+        else:
+            self.errors[error] += 1
+
+
+async def _send(client: httpx.AsyncClient, path: str, payload: dict, start: float, recorder: _Recorder,
+                timeout: float) -> None:
+    error = None
+    try:
+        response = await client.post(path, json=payload, timeout=timeout)
+        if response.status_code != 200:
+            error = f"http_{response.status_code}"
+    except httpx.TimeoutException:
+        error = "timeout"
+    except httpx.HTTPError as e:
+        error = type(e).__name__
+    recorder.record((time.perf_counter() - start) * 1000, error)
+
+
+async def _closed_loop(client, path, payloads, rng, recorder, concurrency, deadline, max_requests, timeout) -> int:
+    sent = 0
+
+    async def worker():
+        nonlocal sent
+        while time.perf_counter() < deadline and (max_requests is None or sent < max_requests):
+            sent += 1
+            await _send(client, path, rng.choice(payloads), time.perf_counter(), recorder, timeout)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return sent
+
+
+async def _open_loop(client, path, payloads, rng, recorder, rate, deadline, max_requests, timeout,
+                     max_in_flight) -> int:
+    sent = 0
+    tasks = set()
+    next_arrival = time.perf_counter()
+    while next_arrival < deadline and (max_requests is None or sent < max_requests):
+        delay = next_arrival - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if len(tasks) >= max_in_flight:
+            # The client itself is saturated: count it instead of silently slowing the arrivals
+            recorder.record(0.0, "client_overload")
+        else:
+            # Latency counts from the scheduled arrival, so time spent queued is included
+            task = asyncio.ensure_future(_send(client, path, rng.choice(payloads), next_arrival, recorder, timeout))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        sent += 1
+        next_arrival += rng.expovariate(rate)
+    if tasks:
+        await asyncio.gather(*tasks)
+    return sent
+
+
+async def _run(client: httpx.AsyncClient, payloads: List[dict], path: str, concurrency: int, rate: Optional[float],
+               duration: float, max_requests: Optional[int], warmup: int, timeout: float, max_in_flight: int,
+               seed: int) -> dict:
+    rng = random.Random(seed)
+    # Warm-up requests (model loading, caches) are not recorded
+    for _ in range(warmup):
+        await _send(client, path, rng.choice(payloads), time.perf_counter(), _Recorder(), timeout)
+
+    recorder = _Recorder()
+    start = time.perf_counter()
+    deadline = start + duration
+    if rate:
+        sent = await _open_loop(client, path, payloads, rng, recorder, rate, deadline, max_requests, timeout,
+                                max_in_flight)
+    else:
+        sent = await _closed_loop(client, path, payloads, rng, recorder, concurrency, deadline, max_requests,
+                                  timeout)
+    elapsed_s = time.perf_counter() - start
+
+    latencies = recorder.latencies_ms
+    errors = sum(recorder.errors.values())
+    summary = {
+        "mode": "open" if rate else "closed",
+        "concurrency": None if rate else concurrency,
+        "offered_rps": rate,
+        "requests": sent,
+        "ok": len(latencies),
+        "errors": dict(recorder.errors),
+        "error_rate": round(errors / sent, 4) if sent else 0.0,
+        "elapsed_s": round(elapsed_s, 3),
+        "throughput_rps": round(len(latencies) / elapsed_s, 3) if elapsed_s else 0.0,
+        "mean_ms": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+        "max_ms": round(max(latencies, default=0.0), 3),
+    }
+    for pct in PERCENTILES:
+        summary[f"p{pct:g}_ms"] = round(_percentile(latencies, pct), 3)
+    return summary
+
+
+def run_load(payloads: List[dict], app=None, url: Optional[str] = None, path: str = "/evaluate",
+             concurrency: int = 4, rate: Optional[float] = None, duration: float = 10.0,
+             max_requests: Optional[int] = None, warmup: int = 2, timeout: float = 30.0,
+             max_in_flight: int = 1024, seed: int = 13) -> dict:
+    """
+    Drives `app` in-process (ASGI transport) or the server at `url`.
+
+    Args:
+        concurrency (int): Clients of the closed loop (ignored when `rate` is set).
+        rate (float): Open-loop Poisson arrival rate in requests/second.
+        duration (float): Seconds to generate load for (in-flight requests are awaited).
+        max_requests (int): Optional cap on the number of requests sent.
+        max_in_flight (int): Open-loop arrivals beyond this many outstanding requests
+            are counted as 'client_overload' errors instead of being sent.
+    """
+    if (app is None) == (url is None):
+        raise ValueError("Pass exactly one of `app` (in-process) or `url`.")
+
+    async def main():
+        if app is not None:
+            transport = httpx.ASGITransport(app=app)
+            client = httpx.AsyncClient(transport=transport, base_url="http://loadtest")
+        else:
+            limits = httpx.Limits(max_connections=max_in_flight if rate else concurrency)
+            client = httpx.AsyncClient(base_url=url, limits=limits)
+        async with client:
+            return await _run(client, payloads, path, concurrency, rate, duration, max_requests, warmup, timeout,
+                              max_in_flight, seed)
+
+    return asyncio.run(main())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the evaluation API")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--app", help="In-process ASGI app, e.g. src.api:app or api.index:app")
+    target.add_argument("--url", help="Base URL of a running server, e.g. http://localhost:8000")
+    parser.add_argument("--path", default="/evaluate")
+    parser.add_argument("--corpus", default=os.path.join(SAMPLES_DIR, "golden", "corpus.json"))
+    parser.add_argument("--variations", help="Comma-separated corpus variations to draw payloads from (default: all)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Closed-loop clients")
+    parser.add_argument("--rate", type=float, help="Open-loop arrival rate (req/s); overrides --concurrency")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load")
+    parser.add_argument("--requests", type=int, help="Stop after this many requests")
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--max-in-flight", type=int, default=1024)
+    parser.add_argument("--seed", type=int, default=13)
+    parser.add_argument("--out", help="Save the summary as JSON")
+    args = parser.parse_args()
+
+    variations = args.variations.split(",") if args.variations else None
+    payloads = load_payloads(args.corpus, variations)
+    if not payloads:
+        parser.error("No payloads match --variations")
+
+    summary = run_load(
+        payloads, app=load_app(args.app) if args.app else None, url=args.url, path=args.path,
+        concurrency=args.concurrency, rate=args.rate, duration=args.duration, max_requests=args.requests,
+        warmup=args.warmup, timeout=args.timeout, max_in_flight=args.max_in_flight, seed=args.seed,
+    )
+    summary["target"] = args.app or args.url
+    if args.out:
+        _save(summary, args.out)
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
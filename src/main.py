@@ -2,7 +2,12 @@ import argparse
 import json
 import sys
 import os
+from pipeline.batch import run_batch
 from pipeline.evaluation import Pipeline
+from pipeline.log import configure_logging
+from pipeline.records import dumps
+from pipeline.registry import METRICS, resolve_metrics
+from pipeline.reports import FORMATS, open_report_writer
 
 def load_json(path: str):
     try:
@@ -17,11 +22,45 @@ def load_json(path: str):
 
 def main():
     parser = argparse.ArgumentParser(description="LLM Response Evaluation Pipeline")
-    parser.add_argument("--conv", required=True, help="Path to conversation JSON (query + response)")
-    parser.add_argument("--ctx", required=True, help="Path to context JSON (retrieved chunks)")
-    parser.add_argument("--out", default="report.json", help="Path to output JSON report")
+    parser.add_argument("--conv", help="Path to conversation JSON (query + response)")
+    parser.add_argument("--ctx", help="Path to context JSON (retrieved chunks)")
+    parser.add_argument("--input", help="Batch mode: JSONL of {id, query, response, context} records (.jsonl), "
+                                        "or a manifest of conversation/context file pairs")
+    parser.add_argument("--workers", type=int, default=1, help="Batch mode: worker processes (one model load each)")
+    parser.add_argument("--shard-size", type=int, default=64, help="Batch mode: input lines / manifest entries per shard")
+    parser.add_argument("--out", help="Path to output report (default: report.json, or report.jsonl in batch mode)")
+    parser.add_argument("--format", choices=FORMATS, default="json",
+                        help="Report format: pretty JSON (default), or one row per evaluation as CSV / Parquet")
+    opt_in = ",".join(name for name, spec in METRICS.items() if not spec.default)
+    parser.add_argument("--metrics",
+                        help=f"Comma-separated subset of metrics to compute, of {','.join(METRICS)} (default: all but {opt_in})")
     
     args = parser.parse_args()
+    if not args.input and not (args.conv and args.ctx):
+        parser.error("either --input, or both --conv and --ctx are required")
+    if args.workers < 1 or args.shard_size < 1:
+        parser.error("--workers and --shard-size must be at least 1")
+    configure_logging(json_format=False)
+
+    metrics = [name.strip() for name in args.metrics.split(",") if name.strip()] if args.metrics else None
+    try:
+        resolve_metrics(metrics)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if args.input:
+        # Batch mode: sharded across worker processes, merged in input order
+        out = args.out or ("report.jsonl" if args.format == "json" else f"report.{args.format}")
+        if not os.path.exists(args.input):
+            print(f"Error: File not found at {args.input}")
+            sys.exit(1)
+        summary = run_batch(args.input, out, fmt=args.format, workers=args.workers,
+                            shard_size=args.shard_size, metrics=metrics)
+        print(f"Batch complete: {summary['records']} records, {summary['errors']} errors "
+              f"in {summary['elapsed_s']}s. Report saved to {out}")
+        return
+    args.out = args.out or "report.json"
 
     # Load Data
     conv_data = load_json(args.conv)
@@ -43,14 +82,22 @@ def main():
     # Run Pipeline
     print(f"Starting evaluation for query: '{query[:50]}...'")
     pipeline = Pipeline()
-    report = pipeline.run(query, response, context)
+    report = pipeline.run(query, response, context, metrics=metrics)
 
     # Output
-    with open(args.out, 'w') as f:
-        json.dump(report, f, indent=2)
+    if args.format != "json":
+        with open_report_writer(args.out, args.format) as writer:
+            writer.write(report)
+        print(f"Evaluation complete. {args.format.upper()} report saved to {args.out}")
+        return
+
+    # Same shape as the API response; claims and timings are in the CSV/Parquet reports
+    body = dumps(report.public(), indent=True)
+    with open(args.out, 'wb') as f:
+        f.write(body)
     
     print(f"Evaluation complete. Report saved to {args.out}")
-    print(json.dumps(report, indent=2))
+    print(body.decode("utf-8"))
 
 if __name__ == "__main__":
     main()
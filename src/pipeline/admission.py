@@ -0,0 +1,176 @@
+import os
+import threading
+from contextlib import contextmanager
+from typing import List, NamedTuple
+
+# Estimated cost of a request, in token-equivalents:
+# every token is parsed/verified once, plus a fixed overhead per context chunk
+# (cache lookup, summary, index entry).
+CHUNK_OVERHEAD_TOKENS = 16
+# Context a degraded evaluation reads: the leading chunks within this cost
+# (see degraded_context), so its charge is the estimate of what it parses
+DEGRADED_CONTEXT_COST = 4_000
+
+# Default budgets (a typical request is a few thousand token-equivalents)
+MAX_REQUEST_BYTES = 2 * 1024 * 1024
+MAX_REQUEST_COST = 200_000
+DEGRADE_COST = 20_000
+MAX_INFLIGHT_COST = 400_000
+
+
+class AdmissionRejected(Exception):
+    """
+    Raised when a request is refused: 413 if it can never fit the per-request
+    budget, 503 (retryable) if the server is at capacity right now.
+    """
+
+    def __init__(self, status_code: int, detail: str, retry_after: int = None):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class Admission(NamedTuple):
+    cost: float       # Cost charged against the global budget until released
+    degraded: bool    # Evaluate with the cheaper 'degraded' profile
+
+
+class _HeuristicCounter:
+    """chars/4, when no tokenizer is supplied."""
+
+    def count_tokens(self, text: str) -> float:
+        return len(text) / 4
+
+    def count_context_tokens(self, context: List[str]) -> float:
+        return sum(len(chunk) for chunk in context) / 4
+
+
+def chunk_cost(token_counter, chunk: str) -> float:
+    return token_counter.count_context_tokens([chunk]) + CHUNK_OVERHEAD_TOKENS
+
+
+def degraded_context(context: List[str], token_counter, max_cost: float = DEGRADED_CONTEXT_COST) -> List[str]:
+    """
+    The leading context chunks (retrievers rank the best first) whose estimated
+    cost fits `max_cost`. The first chunk is always kept, so that claims are
+    never verified against an empty context.
+    """
+    kept = []
+    used = 0.0
+    for chunk in context:
+        cost = chunk_cost(token_counter, chunk)
+        if kept and used + cost > max_cost:
+            break
+        kept.append(chunk)
+        used += cost
+    return kept
+
+
+class AdmissionController:
+    """
+    Admits, degrades or rejects requests by estimated cost, so that a few
+    outlier payloads (e.g. a huge context list) cannot starve normal traffic.
+
+    1. Per request: above `max_request_bytes` or `max_request_cost` -> 413.
+       Above `degrade_cost` -> evaluated with the 'degraded' profile.
+    2. Globally: the cost of in-flight requests stays under `max_inflight_cost`.
+       A request that does not fit is degraded if its degraded cost fits, else 503.
+       With nothing in flight, any request under the per-request limits is admitted.
+
+    A degraded request is charged the estimated cost of what the 'degraded'
+    profile parses: the query, the response and degraded_context(context).
+    """
+
+    def __init__(self, max_request_bytes: int = MAX_REQUEST_BYTES, max_request_cost: float = MAX_REQUEST_COST,
+                 degrade_cost: float = DEGRADE_COST, max_inflight_cost: float = MAX_INFLIGHT_COST,
+                 degraded_context_cost: float = DEGRADED_CONTEXT_COST, token_counter=None):
+        """
+        Args:
+            max_request_bytes (int): UTF-8 size of query + response + context.
+            max_request_cost (float): Largest estimated cost (token-equivalents) ever admitted.
+            degrade_cost (float): Requests estimated above this are evaluated in degraded mode.
+            max_inflight_cost (float): Budget shared by all concurrent requests.
+            degraded_context_cost (float): Context cost read by a degraded evaluation;
+                must match the pipeline's `degraded_context_cost`.
+            token_counter: Object with `count_tokens(text)` and `count_context_tokens(chunks)`,
+                e.g. the pipeline's CostEvaluator (cached per chunk). Defaults to chars/4.
+        """
+        self.max_request_bytes = max_request_bytes
+        self.max_request_cost = max_request_cost
+        self.degrade_cost = degrade_cost
+        self.max_inflight_cost = max_inflight_cost
+        self.degraded_context_cost = degraded_context_cost
+        self.token_counter = token_counter if token_counter is not None else _HeuristicCounter()
+        self.inflight_cost = 0.0
+        self.inflight_requests = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, token_counter=None) -> "AdmissionController":
+        """
+        Budgets from $EVAL_MAX_REQUEST_BYTES, $EVAL_MAX_REQUEST_COST, $EVAL_DEGRADE_COST,
+        $EVAL_MAX_INFLIGHT_COST and $EVAL_DEGRADED_CONTEXT_COST (also read by the Pipeline).
+        """
+        return cls(
+            max_request_bytes=int(os.environ.get("EVAL_MAX_REQUEST_BYTES", MAX_REQUEST_BYTES)),
+            max_request_cost=float(os.environ.get("EVAL_MAX_REQUEST_COST", MAX_REQUEST_COST)),
+            degrade_cost=float(os.environ.get("EVAL_DEGRADE_COST", DEGRADE_COST)),
+            max_inflight_cost=float(os.environ.get("EVAL_MAX_INFLIGHT_COST", MAX_INFLIGHT_COST)),
+            degraded_context_cost=float(os.environ.get("EVAL_DEGRADED_CONTEXT_COST", DEGRADED_CONTEXT_COST)),
+            token_counter=token_counter,
+        )
+
+    def request_bytes(self, query: str, response: str, context: List[str]) -> int:
+        return sum(len(text.encode("utf-8")) for text in [query, response, *context])
+
+    def estimate_cost(self, query: str, response: str, context: List[str]) -> float:
+        counter = self.token_counter
+        return (counter.count_tokens(query) + counter.count_tokens(response)
+                + counter.count_context_tokens(context) + CHUNK_OVERHEAD_TOKENS * len(context))
+
+    def estimate_degraded_cost(self, query: str, response: str, context: List[str]) -> float:
+        return self.estimate_cost(query, response, degraded_context(context, self.token_counter, self.degraded_context_cost))
+
+    def admit(self, query: str, response: str, context: List[str]) -> Admission:
+        """
+        Reserves budget for a request. Every admitted request must be release()d.
+        Raises AdmissionRejected.
+        """
+        size = self.request_bytes(query, response, context)
+        if size > self.max_request_bytes:
+            raise AdmissionRejected(413, f"Request too large: {size} bytes exceeds the limit of {self.max_request_bytes} bytes.")
+
+        cost = self.estimate_cost(query, response, context)
+        if cost > self.max_request_cost:
+            raise AdmissionRejected(
+                413, f"Request too large: estimated cost {cost:.0f} exceeds the per-request budget of {self.max_request_cost:.0f}."
+            )
+
+        degraded = cost > self.degrade_cost
+        # Outside the lock: counting is the expensive part (cached per chunk by the CostEvaluator)
+        degraded_charge = self.estimate_degraded_cost(query, response, context)
+        charge = degraded_charge if degraded else cost
+        with self._lock:
+            available = self.max_inflight_cost - self.inflight_cost
+            if self.inflight_requests and charge > available:
+                if degraded or degraded_charge > available:
+                    raise AdmissionRejected(503, "Server at capacity, retry later.", retry_after=1)
+                degraded, charge = True, degraded_charge
+            self.inflight_cost += charge
+            self.inflight_requests += 1
+        return Admission(charge, degraded)
+
+    def release(self, admission: Admission) -> None:
+        with self._lock:
+            self.inflight_cost = max(0.0, self.inflight_cost - admission.cost)
+            self.inflight_requests -= 1
+
+    @contextmanager
+    def admitted(self, query: str, response: str, context: List[str]):
+        """admit() for the duration of the block."""
+        admission = self.admit(query, response, context)
+        try:
+            yield admission
+        finally:
+            self.release(admission)
@@ -0,0 +1,292 @@
+"""
+Offline batch runner: evaluates a JSONL file of records, or a manifest of
+conversation/context file pairs, across N worker processes.
+
+The input is cut into fixed-size shards (deterministic: same input, same
+shards). Each worker builds one Pipeline (so loads each spaCy model once) and
+writes every shard it evaluates to its own file; the parent merges shard files
+into the output in input order as they complete, so the output is identical
+whatever the number of workers.
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .datasets import iter_turn_pairs, load_context_chunks, load_json_lenient
+from .records import dumps
+from .reports import open_report_writer
+
+JSONL_EXTENSIONS = (".jsonl", ".ndjson")
+
+# A unit of input: ('line', line number, raw line) or ('pair', entry id, conversation path, context path)
+Unit = Tuple
+
+
+def _manifest_entries(path: str) -> List[dict]:
+    """
+    Manifest entries {"conv", "ctx", "id"?}, from a JSON list or a text file with
+    one 'conversation_path context_path' pair per line. Relative paths are
+    resolved against the manifest's directory.
+    """
+    base = os.path.dirname(os.path.abspath(path))
+    if path.endswith(".json"):
+        entries = load_json_lenient(path)
+    else:
+        entries = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                fields = line.split()
+                if fields and not fields[0].startswith("#"):
+                    if len(fields) != 2:
+                        raise ValueError(f"Manifest line must be 'conversation_path context_path': {line.strip()}")
+                    entries.append({"conv": fields[0], "ctx": fields[1]})
+    resolved = []
+    for entry in entries:
+        conv, ctx = (os.path.join(base, entry[key]) for key in ("conv", "ctx"))
+        entry_id = entry.get("id") or os.path.splitext(os.path.basename(conv))[0]
+        resolved.append({"id": str(entry_id), "conv": conv, "ctx": ctx})
+    return resolved
+
+
+def iter_units(path: str) -> Iterator[Unit]:
+    """Input units in order: JSONL lines, or manifest conversation/context pairs."""
+    if path.endswith(JSONL_EXTENSIONS):
+        with open(path, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, start=1):
+                if line.strip():
+                    yield ("line", line_no, line)
+    else:
+        for entry in _manifest_entries(path):
+            yield ("pair", entry["id"], entry["conv"], entry["ctx"])
+
+
+def iter_shards(path: str, shard_size: int) -> Iterator[List[Unit]]:
+    shard = []
+    for unit in iter_units(path):
+        shard.append(unit)
+        if len(shard) == shard_size:
+            yield shard
+            shard = []
+    if shard:
+        yield shard
+
+
+def _unit_records(unit: Unit) -> Iterator[Dict[str, Any]]:
+    """
+    (query, response, context) records of a unit, or {"id", "error"} entries
+    for input that cannot be evaluated.
+    """
+    if unit[0] == "line":
+        _, line_no, raw = unit
+        try:
+            data = json.loads(raw)
+        except json.JSONDecodeError as e:
+            yield {"id": str(line_no), "error": f"Invalid JSON: {e}"}
+            return
+        record_id = str(data.get("id", line_no))
+        if not data.get("query") or not data.get("response") or not isinstance(data.get("context"), list):
+            yield {"id": record_id, "error": "Record must contain 'query', 'response' and a 'context' list."}
+            return
+        yield {"id": record_id, "query": data["query"], "response": data["response"], "context": data["context"]}
+        return
+
+    _, entry_id, conv_path, ctx_path = unit
+    try:
+        conversation = load_json_lenient(conv_path)
+        context = load_context_chunks(ctx_path)
+    except (OSError, ValueError) as e:
+        yield {"id": entry_id, "error": f"Cannot load {conv_path} / {ctx_path}: {e}"}
+        return
+    if "conversation_turns" in conversation:
+        for turn, query, response in iter_turn_pairs(conversation):
+            yield {"id": f"{entry_id}:t{turn}", "query": query, "response": response, "context": context}
+    else:
+        query = conversation.get("query") or conversation.get("user_message")
+        response = conversation.get("response") or conversation.get("assistant_message")
+        if not query or not response:
+            yield {"id": entry_id, "error": "Conversation must contain 'conversation_turns' or 'query' and 'response'."}
+            return
+        yield {"id": entry_id, "query": query, "response": response, "context": context}
+
+
+# --- Worker side ---
+
+_WORKER_PIPELINE = None
+_WORKER_METRICS = None
+
+
+def _init_worker(pipeline_kwargs: dict, metrics: Optional[List[str]]) -> None:
+    global _WORKER_PIPELINE, _WORKER_METRICS
+    from .evaluation import Pipeline
+
+    _WORKER_PIPELINE = Pipeline(**pipeline_kwargs)
+    _WORKER_METRICS = metrics
+    # Load the model(s) once per worker, before the first shard
+    _WORKER_PIPELINE.run("warm up", "warm up", ["warm up"], metrics=metrics)
+
+
+def _public_record(record_id, report) -> Dict[str, Any]:
+    """
+    JSON output line of an evaluated record: the API response fields without the
+    measured latency, so the output only depends on the input.
+    """
+    body = report.public()
+    body["metrics"] = {name: value for name, value in body["metrics"].items() if name != "latency_ms"}
+    return {"id": record_id, **body}
+
+
+def _run_shard(index: int, units: List[Unit], shard_dir: str, fmt: str = "json") -> Tuple[int, str, int, int]:
+    """
+    Evaluates a shard into shard_dir/shard-<index>.jsonl: public records for
+    'json' output, full reports (claims, per-stage timings) for columnar formats.
+    Returns (index, shard file, records evaluated, errors).
+    """
+    path = os.path.join(shard_dir, f"shard-{index:06d}.jsonl")
+    evaluated = errors = 0
+    with open(path, "wb") as f:
+        for unit in units:
+            for record in _unit_records(unit):
+                if "error" not in record:
+                    try:
+                        report = _WORKER_PIPELINE.run(record["query"], record["response"], record["context"],
+                                                      metrics=_WORKER_METRICS)
+                        record = _public_record(record["id"], report) if fmt == "json" \
+                            else {"id": record["id"], **report}
+                    except Exception as e:
+                        record = {"id": record["id"], "error": str(e)}
+                if "error" in record:
+                    errors += 1
+                else:
+                    evaluated += 1
+                f.write(dumps(record) + b"\n")
+    return index, path, evaluated, errors
+
+
+# --- Parent side ---
+
+class _Progress:
+    """Progress lines on stderr: shards and records done, throughput, ETA."""
+
+    def __init__(self, total_shards: int, stream=None, interval_s: float = 1.0):
+        self.total_shards = total_shards
+        self.stream = stream if stream is not None else sys.stderr
+        self.interval_s = interval_s
+        self.start = time.perf_counter()
+        self._last = 0.0
+
+    def update(self, shards: int, records: int, errors: int, final: bool = False) -> None:
+        now = time.perf_counter()
+        if not final and now - self._last < self.interval_s:
+            return
+        self._last = now
+        elapsed = now - self.start
+        rate = records / elapsed if elapsed else 0.0
+        eta = elapsed / shards * (self.total_shards - shards) if shards else float("nan")
+        self.stream.write(
+            f"[{shards}/{self.total_shards} shards] {records} records, {errors} errors, "
+            f"{rate:.1f} rec/s, ETA {eta:.0f}s\n"
+        )
+        self.stream.flush()
+
+
+class _OutputMerger:
+    """Appends shard files to the output in shard order, whatever order they complete in."""
+
+    def __init__(self, out_path: str, fmt: str):
+        self.fmt = fmt
+        self.next_index = 0
+        self._pending: Dict[int, str] = {}
+        if fmt == "json":
+            self._file = open(out_path, "wb")
+            self._writer = None
+        else:
+            self._file = None
+            self._writer = open_report_writer(out_path, fmt)
+
+    def add(self, index: int, shard_path: str) -> None:
+        self._pending[index] = shard_path
+        while self.next_index in self._pending:
+            self._merge(self._pending.pop(self.next_index))
+            self.next_index += 1
+
+    def _merge(self, shard_path: str) -> None:
+        with open(shard_path, "rb") as f:
+            if self._file is not None:
+                shutil.copyfileobj(f, self._file)
+            else:
+                # Columnar formats have no error column: failed records are only in the counts
+                for line in f:
+                    record = json.loads(line)
+                    if "error" not in record:
+                        self._writer.write(record, record_id=record["id"])
+        os.remove(shard_path)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        else:
+            self._writer.close()
+
+
+def run_batch(input_path: str, out_path: str, fmt: str = "json", workers: int = 1, shard_size: int = 64,
+              metrics: Optional[List[str]] = None, pipeline_kwargs: Optional[dict] = None,
+              progress_stream=None) -> Dict[str, Any]:
+    """
+    Evaluates every record of `input_path` into `out_path`.
+
+    Args:
+        input_path (str): JSONL of {id?, query, response, context} records (.jsonl/.ndjson),
+            or a manifest of conversation/context file pairs (JSON list of
+            {"conv", "ctx", "id"?} or one 'conv ctx' pair per line).
+        fmt (str): 'json' writes JSONL ({"id", metrics, verdict, tier, config_version} without
+            latency, or {"id", "error"} per record);
+            'csv' / 'parquet' write one row per evaluated record.
+        workers (int): Worker processes. 1 evaluates in-process (same output).
+        shard_size (int): Input units (lines or manifest entries) per shard.
+    Returns: {"records", "errors", "shards", "elapsed_s"}
+    """
+    pipeline_kwargs = pipeline_kwargs or {}
+    total_shards = sum(1 for _ in iter_shards(input_path, shard_size))
+    progress = _Progress(total_shards, stream=progress_stream)
+    merger = _OutputMerger(out_path, fmt)
+    shard_dir = tempfile.mkdtemp(prefix="eval-shards-", dir=os.path.dirname(os.path.abspath(out_path)))
+    done = records = errors = 0
+
+    def collect(result):
+        nonlocal done, records, errors
+        index, path, evaluated, failed = result
+        merger.add(index, path)
+        done, records, errors = done + 1, records + evaluated, errors + failed
+        progress.update(done, records, errors)
+
+    try:
+        shards = enumerate(iter_shards(input_path, shard_size))
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(pipeline_kwargs, metrics)) as executor:
+                # Bounded submission: only a few shards per worker are in memory at once
+                in_flight = set()
+                for index, units in shards:
+                    if len(in_flight) >= 2 * workers:
+                        finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            collect(future.result())
+                    in_flight.add(executor.submit(_run_shard, index, units, shard_dir, fmt))
+                for future in wait(in_flight).done:
+                    collect(future.result())
+        else:
+            _init_worker(pipeline_kwargs, metrics)
+            for index, units in shards:
+                collect(_run_shard(index, units, shard_dir, fmt))
+    finally:
+        merger.close()
+        shutil.rmtree(shard_dir, ignore_errors=True)
+
+    progress.update(done, records, errors, final=True)
+    return {"records": records, "errors": errors, "shards": done,
+            "elapsed_s": round(time.perf_counter() - progress.start, 3)}
@@ -1,7 +1,8 @@
-import spacy
 from typing import Set, List
 
 from .model import nlp
+from .config import DEFAULT_CONFIG, EvalConfig
+from .vectors import StaticVectors
 
 class CompletenessEvaluator:
     """
@@ -9,37 +10,25 @@ class CompletenessEvaluator:
     Now scoped to Question Intent (Entity Check).
     """
 
-    def __init__(self):
-        pass
+    def __init__(self, model=None, use_vectors: bool = True, vectors: StaticVectors = None):
+        """
+        Args:
+            model: Spacy pipeline to parse with (defaults to the shared en_core_web_md).
+            use_vectors (bool): Disable for models without static vectors (fast tier).
+            vectors (StaticVectors): If set, similarity is computed from the static
+                vector table of the texts instead of the parsed Docs' vectors.
+        """
+        self.nlp = model if model is not None else nlp
+        self.use_vectors = use_vectors
+        self.vectors = vectors
 
-    def _detect_intent_slots(self, doc) -> Set[str]:
+    def _detect_intent_slots(self, doc, config: EvalConfig = DEFAULT_CONFIG) -> Set[str]:
         """
-        Heuristic to guess what the question is asking for based on Wh-words.
+        Heuristic to guess what the question is asking for based on Wh-words
+        (see the config's completeness intents).
         Returns expected Entity Labels.
         """
-        text = doc.text.lower()
-        expected = set()
-        
-        # When -> DATE, TIME
-        if "when" in text or "what time" in text:
-            expected.add("DATE")
-            expected.add("TIME")
-        
-        # How much/cost/price -> MONEY
-        if "how much" in text or "cost" in text or "price" in text:
-            expected.add("MONEY")
-            
-        # Who -> PERSON, ORG
-        if "who" in text:
-            expected.add("PERSON")
-            expected.add("ORG")
-            
-        # Where -> GPE, LOC
-        if "where" in text:
-            expected.add("GPE")
-            expected.add("LOC")
-            
-        return expected
+        return config.detect_intents(doc.text, config.completeness_intents)
 
     def _check_followup(self, text: str) -> bool:
         """
@@ -54,23 +43,31 @@ class CompletenessEvaluator:
         text_lower = text.lower()
         return any(phrase in text_lower for phrase in followup_phrases)
 
-    def evaluate(self, query: str, response: str) -> float:
+    def evaluate(self, query: str, response: str, docs: tuple = None,
+                 config: EvalConfig = DEFAULT_CONFIG) -> float:
         """
         Calculates Completeness based on:
         1. Intent Slot Fulfillment (Primary Metric).
         2. Semantic Coverage (Vector Similarity).
         3. Conversational Follow-up (Bonus).
+
+        Args:
+            docs (tuple): Optional pre-parsed (query, response) Docs from Pipeline's shared parse.
+            config (EvalConfig): Intent keyword tables to use.
         """
         if not query:
             return 1.0 
         if not response:
             return 0.0
 
-        q_doc = nlp(query)
-        r_doc = nlp(response)
+        if docs is not None:
+            q_doc, r_doc = docs
+        else:
+            q_doc = self.nlp(query)
+            r_doc = self.nlp(response)
         
         # 1. Intent Check (Gold Standard)
-        expected_slots = self._detect_intent_slots(q_doc)
+        expected_slots = self._detect_intent_slots(q_doc, config)
         intent_score = 0.5 # Default neutral
         
         if expected_slots:
@@ -83,7 +80,10 @@ class CompletenessEvaluator:
         # 2. Semantic Coverage (Silver Standard)
         # Did we cover the "meaning" of the question?
         vector_sim = 0.0
-        if q_doc.vector_norm and r_doc.vector_norm:
+        if self.use_vectors and self.vectors is not None:
+            if self.vectors.norm(q_doc.text) and self.vectors.norm(r_doc.text):
+                vector_sim = self.vectors.similarity(q_doc.text, r_doc.text)
+        elif self.use_vectors and q_doc.vector_norm and r_doc.vector_norm:
             vector_sim = q_doc.similarity(r_doc)
 
         # 3. Lemma Coverage (Bronze Standard)
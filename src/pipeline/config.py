@@ -0,0 +1,245 @@
+"""
+Evaluation config: verdict thresholds, claim verb lists and intent keyword
+tables, loaded from a versioned JSON file and reloaded when the file changes.
+
+A file only needs the keys it overrides, plus a "version":
+
+    {"version": "2024-06-01", "thresholds": {"max_cost_usd": 0.08}}
+"""
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS: Dict[str, Any] = {
+    "version": "builtin",
+    "thresholds": {
+        "hallucination_fail": 0.5,
+        "hallucination_warn": 0.1,
+        "relevance_warn": 0.2,
+        "relevance_fail": 0.05,
+        "completeness_warn": 0.5,
+        # Mandated Cost & Latency Limits
+        "max_latency_ms": 2000.0,
+        "max_cost_usd": 0.05,
+    },
+    # Verbs that imply a factual claim (Assertive)
+    # MUST include base forms (lemmas) as Spacy uses lemmas for matching
+    "assertive_verbs": [
+        "be", "is", "are", "was", "were",
+        "cost", "costs",
+        "include", "includes", "included",
+        "offer", "offers", "offered",
+        "release", "released", "releases",
+        "announce", "announced",
+        "acquire", "acquired",
+        "buy", "bought",
+        "sell", "sold",
+        "win", "won",
+        "lose", "lost",
+        "found", "founded",
+        "locate", "located",
+    ],
+    "hedging_verbs": [
+        "may", "might", "could", "can", "appears", "seems", "suggests",
+        "estimated", "likely", "possibly", "probably",
+    ],
+    # Query keywords (substrings of the lowercased query) -> expected entity labels
+    "intents": {
+        "relevance": [
+            {"keywords": ["cost", "price", "how much", "rate", "fee"], "labels": ["MONEY"]},
+            {"keywords": ["when", "time", "date", "long", "year", "month"], "labels": ["DATE", "TIME"]},
+            {"keywords": ["where", "location", "located", "place"], "labels": ["GPE", "LOC"]},
+            {"keywords": ["who", "company", "organization"], "labels": ["PERSON", "ORG"]},
+        ],
+        "completeness": [
+            {"keywords": ["when", "what time"], "labels": ["DATE", "TIME"]},
+            {"keywords": ["how much", "cost", "price"], "labels": ["MONEY"]},
+            {"keywords": ["who"], "labels": ["PERSON", "ORG"]},
+            {"keywords": ["where"], "labels": ["GPE", "LOC"]},
+        ],
+    },
+}
+
+# (compiled keyword pattern, expected entity labels)
+Intent = Tuple["re.Pattern", FrozenSet[str]]
+
+
+def _string_list(value: Any, name: str) -> List[str]:
+    if not isinstance(value, list) or not all(isinstance(item, str) and item for item in value):
+        raise ValueError(f"'{name}' must be a list of non-empty strings, got {value!r}.")
+    return value
+
+
+def _compile_intents(entries: List[dict]) -> Tuple[Intent, ...]:
+    if not isinstance(entries, list):
+        raise ValueError(f"Intent tables must be lists of entries, got {entries!r}.")
+    intents = []
+    for entry in entries:
+        if not isinstance(entry, dict):
+            raise ValueError(f"Intent entries must be objects, got {entry!r}.")
+        keywords, labels = entry.get("keywords"), entry.get("labels")
+        if not keywords or not labels:
+            raise ValueError(f"Intent entries need non-empty 'keywords' and 'labels': {entry}")
+        _string_list(keywords, "keywords")
+        _string_list(labels, "labels")
+        # One alternation per intent: a search is the same test as any(keyword in text)
+        intents.append((re.compile("|".join(re.escape(k.lower()) for k in keywords)), frozenset(labels)))
+    return tuple(intents)
+
+
+class EvalConfig:
+    """
+    One compiled, read-only version of the config. A request reads a single
+    EvalConfig from start to end, so swapping in a new one never changes the
+    rules of requests already in flight.
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        """
+        Args:
+            data (dict): Overrides of DEFAULTS; 'version' is required.
+        Raises ValueError on unknown keys, values of the wrong type or inconsistent thresholds.
+        """
+        if not isinstance(data, dict):
+            raise ValueError("Config must be a JSON object.")
+        unknown = set(data) - set(DEFAULTS)
+        if unknown:
+            raise ValueError(f"Unknown config keys {sorted(unknown)}. Expected a subset of {list(DEFAULTS)}.")
+        if not data.get("version"):
+            raise ValueError("Config has no 'version'.")
+        for key in ("thresholds", "intents"):
+            if not isinstance(data.get(key, {}), dict):
+                raise ValueError(f"'{key}' must be an object.")
+        thresholds = dict(DEFAULTS["thresholds"])
+        unknown = set(data.get("thresholds", {})) - set(thresholds)
+        if unknown:
+            raise ValueError(f"Unknown thresholds {sorted(unknown)}. Expected a subset of {list(thresholds)}.")
+        thresholds.update(data.get("thresholds", {}))
+        for name, value in thresholds.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ValueError(f"Threshold '{name}' must be a number, got {value!r}.")
+        unknown = set(data.get("intents", {})) - set(DEFAULTS["intents"])
+        if unknown:
+            raise ValueError(f"Unknown intent tables {sorted(unknown)}. Expected a subset of {list(DEFAULTS['intents'])}.")
+        intents = dict(DEFAULTS["intents"], **data.get("intents", {}))
+
+        self.version = str(data["version"])
+        self.hallucination_fail = float(thresholds["hallucination_fail"])
+        self.hallucination_warn = float(thresholds["hallucination_warn"])
+        self.relevance_warn = float(thresholds["relevance_warn"])
+        self.relevance_fail = float(thresholds["relevance_fail"])
+        self.completeness_warn = float(thresholds["completeness_warn"])
+        self.max_latency_ms = float(thresholds["max_latency_ms"])
+        self.max_cost_usd = float(thresholds["max_cost_usd"])
+        if not (self.hallucination_warn <= self.hallucination_fail and self.relevance_fail <= self.relevance_warn):
+            raise ValueError("Thresholds must satisfy hallucination_warn <= hallucination_fail "
+                             "and relevance_fail <= relevance_warn.")
+
+        self.assertive_verbs = frozenset(_string_list(data.get("assertive_verbs", DEFAULTS["assertive_verbs"]), "assertive_verbs"))
+        # Matched against lowercased token texts and lemmas of claim verbs' modals and adverbs
+        self.hedging_verbs = frozenset(
+            verb.lower() for verb in _string_list(data.get("hedging_verbs", DEFAULTS["hedging_verbs"]), "hedging_verbs")
+        )
+        self.relevance_intents = _compile_intents(intents["relevance"])
+        self.completeness_intents = _compile_intents(intents["completeness"])
+        # Assertive lemma hashes per vocab (one per model), built on first use
+        self._lemma_ids: Dict[Any, np.ndarray] = {}
+
+    def assertive_lemma_ids(self, vocab) -> np.ndarray:
+        """
+        Hashes of the assertive-verb lemmas (with their casings, as lemma_.lower() was
+        used), for the array lookup of HallucinationEvaluator._extract_claims.
+        """
+        ids = self._lemma_ids.get(vocab)
+        if ids is None:
+            forms = {form for verb in self.assertive_verbs for form in (verb, verb.capitalize(), verb.upper())}
+            ids = self._lemma_ids[vocab] = np.array(sorted(vocab.strings.add(form) for form in forms), dtype=np.uint64)
+        return ids
+
+    @staticmethod
+    def detect_intents(text: str, intents: Tuple[Intent, ...]) -> set:
+        """Entity labels expected by the intents whose keywords occur in `text` (lowercased)."""
+        text = text.lower()
+        expected = set()
+        for pattern, labels in intents:
+            if pattern.search(text):
+                expected |= labels
+        return expected
+
+
+DEFAULT_CONFIG = EvalConfig(DEFAULTS)
+
+
+def load_config(path: str) -> EvalConfig:
+    with open(path, "r", encoding="utf-8") as f:
+        return EvalConfig(json.load(f))
+
+
+class ConfigWatcher:
+    """
+    The current EvalConfig of a file, reloaded when the file changes.
+
+    Checks are lazy: current() stats the file at most every `interval_s`, so
+    every worker process picks up a new version on its next request, without a
+    watcher thread, a restart or a model reload. A file that fails to load is
+    logged and skipped; the previous version stays in use. Replace the file
+    atomically (write a temporary file, then rename it) to never read a partial one.
+    """
+
+    def __init__(self, path: str, interval_s: float = 2.0, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            path (str): JSON config file. Must be valid at startup.
+            interval_s (float): Minimum seconds between two checks of the file.
+            clock: Time source (monotonic seconds), injectable for tests.
+        """
+        self.path = path
+        self.interval_s = interval_s
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._signature = self._stat()
+        self._failed_signature = None
+        self._config = load_config(path)
+        self._checked_at = clock()
+        logger.info("Loaded config %s", self._config.version, extra={"fields": {"path": path}})
+
+    def _stat(self) -> Optional[tuple]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def current(self) -> EvalConfig:
+        now = self.clock()
+        if now - self._checked_at < self.interval_s:
+            return self._config
+        with self._lock:
+            if now - self._checked_at >= self.interval_s:
+                self._checked_at = now
+                self._reload_if_changed()
+            return self._config
+
+    def _reload_if_changed(self) -> None:
+        signature = self._stat()
+        if signature is None or signature == self._signature or signature == self._failed_signature:
+            return
+        try:
+            config = load_config(self.path)
+        except Exception as e:
+            # Never fails the request: logged once per file version, retried when the file changes again
+            self._failed_signature = signature
+            logger.warning("Config reload failed, keeping version %s: %s", self._config.version, e)
+            return
+        previous = self._config.version
+        # Single reference swap: requests holding the previous config finish with it
+        self._config, self._signature, self._failed_signature = config, signature, None
+        logger.info("Reloaded config %s -> %s", previous, config.version, extra={"fields": {"path": self.path}})
@@ -0,0 +1,185 @@
+import math
+import threading
+from collections import Counter, OrderedDict, defaultdict
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .doc_cache import DocCache
+from .vectors import StaticVectors
+
+
+class ChunkSummary(NamedTuple):
+    """
+    Everything the grounding metrics need from a context chunk,
+    computed once per chunk and shared by all requests that retrieve it.
+    """
+    lemmas: frozenset     # lowercased content lemmas (no stop words / punctuation)
+    entity_labels: Counter  # e.g. {"MONEY": 2, "DATE": 1}
+    vector: Optional[np.ndarray]  # unit-normalized doc vector (None if no static vectors)
+    terms: frozenset      # lowercased surface tokens, for the inverted index
+
+
+def content_lemmas(doc) -> frozenset:
+    # Falls back to the token text for pipelines without a lemmatizer
+    return frozenset(
+        (token.lemma_ or token.text).lower() for token in doc if not token.is_stop and not token.is_punct
+    )
+
+
+def content_terms(doc) -> frozenset:
+    return frozenset(token.lower_ for token in doc if not token.is_stop and not token.is_punct and not token.is_space)
+
+
+def unit_vector(doc) -> Optional[np.ndarray]:
+    if not doc.vector_norm:
+        return None
+    return (doc.vector / doc.vector_norm).astype(np.float32)
+
+
+class ContextIndex:
+    """
+    Summaries of the chunks of one request, with their vectors stacked into a
+    matrix for top-k cosine retrieval.
+    """
+
+    def __init__(self, summaries: List[ChunkSummary],
+                 unit_vector: Callable[..., Optional[np.ndarray]] = unit_vector):
+        """
+        Args:
+            unit_vector: Vectorizes the query Docs, in the same space as the chunk vectors.
+        """
+        self.summaries = summaries
+        self.unit_vector = unit_vector
+        self.matrix = None
+        if summaries and all(s.vector is not None for s in summaries):
+            self.matrix = np.vstack([s.vector for s in summaries])
+        self._postings = None
+
+    def __len__(self) -> int:
+        return len(self.summaries)
+
+    @property
+    def postings(self) -> Dict[str, List[int]]:
+        """Inverted index: term -> indices of the chunks containing it (built on first use)."""
+        if self._postings is None:
+            postings = defaultdict(list)
+            for i, summary in enumerate(self.summaries):
+                for term in summary.terms:
+                    postings[term].append(i)
+            self._postings = dict(postings)
+        return self._postings
+
+    def rank_chunks(self, terms: Dict[str, float]) -> List[Tuple[int, float]]:
+        """
+        Ranks chunks by the idf-weighted sum of the given (term -> weight) they contain.
+        Only chunks sharing at least one term are returned, best first.
+        """
+        postings = self.postings
+        n_chunks = len(self.summaries)
+        scores = defaultdict(float)
+        for term, weight in terms.items():
+            chunk_ids = postings.get(term)
+            if not chunk_ids:
+                continue
+            idf = math.log(1 + n_chunks / len(chunk_ids))
+            for i in chunk_ids:
+                scores[i] += weight * idf
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+    def top_k(self, doc, k: int = 3) -> List[Tuple[int, float]]:
+        """
+        Ranks chunks against `doc` and returns the best k as (chunk index, score).
+        Cosine similarity when vectors are available, otherwise lemma overlap.
+        """
+        if not self.summaries:
+            return []
+        k = min(k, len(self.summaries))
+
+        query_vector = self.unit_vector(doc) if self.matrix is not None else None
+        if query_vector is not None:
+            scores = self.matrix @ query_vector
+        else:
+            lemmas = content_lemmas(doc)
+            scores = np.array([len(lemmas & s.lemmas) / (len(lemmas) or 1) for s in self.summaries])
+
+        if k < len(scores):
+            best = np.argpartition(-scores, k - 1)[:k]
+            best = best[np.argsort(-scores[best], kind="stable")]
+        else:
+            best = np.argsort(-scores, kind="stable")
+        return [(int(i), float(scores[i])) for i in best]
+
+
+class ContextSummaryCache:
+    """
+    Per-chunk summaries on top of the DocCache, plus a small LRU of whole
+    ContextIndex objects (the same retrieved context often repeats verbatim,
+    e.g. across turns of one conversation).
+    """
+
+    def __init__(self, doc_cache: DocCache, use_vectors: bool = True,
+                 max_items: int = 4096, max_indexes: int = 256, vectors: Optional[StaticVectors] = None):
+        """
+        Args:
+            vectors (StaticVectors): Source of the chunk and query vectors (e.g. over
+                a CompactVectors table). Defaults to the parsed Docs' vectors.
+        """
+        self.doc_cache = doc_cache
+        self.use_vectors = use_vectors
+        self.vectors = vectors
+        self.max_items = max_items
+        self.max_indexes = max_indexes
+        self._summaries = OrderedDict()
+        self._indexes = OrderedDict()
+        self._lock = threading.Lock()
+
+    def unit_vector(self, doc) -> Optional[np.ndarray]:
+        if self.vectors is None:
+            return unit_vector(doc)
+        vector, norm = self.vectors.mean_vector(doc.to_array("ORTH"))
+        return (vector / norm).astype(np.float32) if norm else None
+
+    def _summarize(self, doc) -> ChunkSummary:
+        return ChunkSummary(
+            lemmas=content_lemmas(doc),
+            entity_labels=Counter(ent.label_ for ent in doc.ents),
+            vector=self.unit_vector(doc) if self.use_vectors else None,
+            terms=content_terms(doc),
+        )
+
+    def summarize(self, context: List[str]) -> List[ChunkSummary]:
+        summaries = [None] * len(context)
+        missing = []
+        with self._lock:
+            for i, chunk in enumerate(context):
+                summary = self._summaries.get(chunk)
+                if summary is None:
+                    missing.append(i)
+                else:
+                    self._summaries.move_to_end(chunk)
+                    summaries[i] = summary
+
+        if missing:
+            docs = self.doc_cache.get_docs([context[i] for i in missing])
+            with self._lock:
+                for i, doc in zip(missing, docs):
+                    summaries[i] = self._summaries[context[i]] = self._summarize(doc)
+                while len(self._summaries) > self.max_items:
+                    self._summaries.popitem(last=False)
+        return summaries
+
+    def build_index(self, context: List[str]) -> ContextIndex:
+        key = tuple(context)
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is not None:
+                self._indexes.move_to_end(key)
+                return index
+
+        index = ContextIndex(self.summarize(context), unit_vector=self.unit_vector)
+        with self._lock:
+            self._indexes[key] = index
+            while len(self._indexes) > self.max_indexes:
+                self._indexes.popitem(last=False)
+        return index
@@ -0,0 +1,87 @@
+import json
+import re
+from typing import Iterator, List, Tuple
+
+# Either a JSON string literal (kept) or a // comment (dropped), so URLs inside strings survive
+_COMMENT_PATTERN = re.compile(r'("(?:[^"\\]|\\.)*")|(//[^\n]*)')
+_TRAILING_COMMA_PATTERN = re.compile(r',\s*([\]}])')
+_TEXT_FIELD_PATTERN = re.compile(r'"text"\s*:\s*("(?:[^"\\]|\\.)*")')
+
+USER_ROLE = "User"
+AI_ROLE = "AI/Chatbot"
+
+
+def parse_json_lenient(text: str):
+    """
+    Parses JSON exported from chat tools, which may contain // comments and
+    trailing commas (same rules as the frontend's parseJsonWithComments).
+    """
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+    text = _COMMENT_PATTERN.sub(lambda m: m.group(1) or "", text)
+    text = _TRAILING_COMMA_PATTERN.sub(r"\1", text)
+    return json.loads(text, strict=False)
+
+
+def load_json_lenient(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        return parse_json_lenient(f.read())
+
+
+def iter_turn_pairs(conversation: dict) -> Iterator[Tuple[int, str, str]]:
+    """
+    Yields (turn number, user message, AI message) for every AI turn with a
+    message that answers a User turn in a `conversation_turns` export.
+    Turns without a number are numbered by their position (1-based) in the export.
+    """
+    turns = [
+        (turn.get("turn") if turn.get("turn") is not None else position, turn)
+        for position, turn in enumerate(conversation.get("conversation_turns", []), start=1)
+    ]
+    turns.sort(key=lambda numbered: numbered[0])
+    last_user = None
+    for number, turn in turns:
+        if turn.get("role") == USER_ROLE:
+            last_user = turn.get("message")
+        elif turn.get("role") == AI_ROLE and last_user:
+            if turn.get("message"):
+                yield number, last_user, turn.get("message")
+            last_user = None
+
+
+def extract_context_chunks(data) -> List[str]:
+    """
+    Returns the chunk texts of a context export: `context`/`chunks` lists,
+    or the `data.vector_data[].text` format of the vector store.
+    """
+    if isinstance(data, list):
+        return [c if isinstance(c, str) else c.get("text", "") for c in data]
+    context = data.get("context") or data.get("chunks")
+    if isinstance(context, list):
+        return extract_context_chunks(context)
+    vector_data = (data.get("data") or {}).get("vector_data")
+    if isinstance(vector_data, list):
+        return [item.get("text", "") for item in vector_data if item.get("text")]
+    return []
+
+
+def load_context_chunks(path: str) -> List[str]:
+    """
+    Loads the chunk texts of a context export. Vector-store dumps are sometimes
+    truncated or spliced; if the file is not parseable, the `"text"` fields are
+    salvaged individually.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    try:
+        return extract_context_chunks(parse_json_lenient(text))
+    except json.JSONDecodeError:
+        chunks = []
+        for literal in _TEXT_FIELD_PATTERN.findall(text):
+            try:
+                chunks.append(json.loads(literal, strict=False))
+            except json.JSONDecodeError:
+                continue
+        return [chunk for chunk in chunks if chunk]
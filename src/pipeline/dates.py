@@ -0,0 +1,128 @@
+import re
+from functools import lru_cache
+from typing import FrozenSet, Optional, Set, Tuple
+
+# Canonical date: (year, month, day), unknown parts are None
+DateKey = Tuple[Optional[int], Optional[int], Optional[int]]
+
+MONTHS = {
+    "jan": 1, "january": 1,
+    "feb": 2, "february": 2,
+    "mar": 3, "march": 3,
+    "apr": 4, "april": 4,
+    "may": 5,
+    "jun": 6, "june": 6,
+    "jul": 7, "july": 7,
+    "aug": 8, "august": 8,
+    "sep": 9, "sept": 9, "september": 9,
+    "oct": 10, "october": 10,
+    "nov": 11, "november": 11,
+    "dec": 12, "december": 12,
+}
+
+# Whole words only, so "mar" never matches inside "march" or "summary"
+_MONTH = r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\b\.?"
+_DAY = r"\d{1,2}(?:st|nd|rd|th)?\b"
+_YEAR = r"(?:19|20)\d{2}\b"
+
+# Alternatives are tried left to right at each position; the first that matches wins
+_DATE_PATTERN = re.compile(
+    rf"\b(?P<iso_y>\d{{4}})-(?P<iso_m>\d{{1,2}})-(?P<iso_d>\d{{1,2}})\b"
+    rf"|\b(?P<num_a>\d{{1,2}})/(?P<num_b>\d{{1,2}})(?:/(?P<num_y>\d{{4}}|\d{{2}}))?\b"
+    rf"|\b(?P<dash_a>\d{{2}})-(?P<dash_b>\d{{2}})(?:-(?P<dash_y>\d{{4}}))?\b"
+    rf"|\b(?P<dm_d>{_DAY})(?:\s+of)?\s+(?P<dm_m>{_MONTH})(?:,?\s+(?P<dm_y>{_YEAR}))?"
+    rf"|\b(?P<md_m>{_MONTH})(?:\s+(?P<md_d>{_DAY}))?(?:,?\s+(?P<md_y>{_YEAR}))?"
+    rf"|\b(?P<year>{_YEAR})"
+)
+_ORDINAL_SUFFIX = re.compile(r"(?:st|nd|rd|th)$")
+
+
+def _day(value: str) -> Optional[int]:
+    day = int(_ORDINAL_SUFFIX.sub("", value))
+    return day if 1 <= day <= 31 else None
+
+
+def _month(value: str) -> Optional[int]:
+    return MONTHS.get(value.rstrip("."))
+
+
+def _year(value: str) -> Optional[int]:
+    if value is None:
+        return None
+    year = int(value)
+    return year + 2000 if year < 100 else year
+
+
+def _numeric(first: str, second: str, year: str) -> Optional[DateKey]:
+    """MM/DD, or DD/MM when the first part cannot be a month."""
+    a, b = int(first), int(second)
+    if a > 12 and b <= 12:
+        a, b = b, a
+    if not 1 <= a <= 12 or not 1 <= b <= 31:
+        return None
+    return (_year(year), a, b)
+
+
+def _to_key(match: re.Match) -> Optional[DateKey]:
+    g = match.groupdict()
+    if g["iso_y"]:
+        month, day = int(g["iso_m"]), int(g["iso_d"])
+        if not 1 <= month <= 12 or not 1 <= day <= 31:
+            return None
+        return (int(g["iso_y"]), month, day)
+    if g["num_a"]:
+        return _numeric(g["num_a"], g["num_b"], g["num_y"])
+    if g["dash_a"]:
+        return _numeric(g["dash_a"], g["dash_b"], g["dash_y"])
+    if g["dm_m"]:
+        return (_year(g["dm_y"]), _month(g["dm_m"]), _day(g["dm_d"]))
+    if g["md_m"]:
+        # A bare "may" is far more often the modal verb than the month
+        if g["md_d"] is None and g["md_y"] is None and g["md_m"] == "may":
+            return None
+        return (_year(g["md_y"]), _month(g["md_m"]), _day(g["md_d"]) if g["md_d"] else None)
+    return (int(g["year"]), None, None)
+
+
+def parse_dates(text: str) -> Set[DateKey]:
+    """
+    Canonical (year, month, day) tuples of every date mentioned in `text`.
+    Handles '2024-03-05', '03/05/2024', 'March 5th, 2024', '5 March', 'Mar 2024', '2024'.
+    """
+    keys = set()
+    for match in _DATE_PATTERN.finditer(text.lower()):
+        key = _to_key(match)
+        if key is not None and key != (None, None, None):
+            keys.add(key)
+    return keys
+
+
+def _projections(key: DateKey):
+    """The key plus every less specific date it supports ('March 5, 2024' -> 'March 5', 'March', '2024', ...)."""
+    year, month, day = key
+    if month is not None:
+        for y in {year, None}:
+            yield (y, month, day)
+            yield (y, month, None)
+    if year is not None:
+        yield (year, None, None)
+
+
+@lru_cache(maxsize=256)
+def context_date_index(context_text: str) -> FrozenSet[DateKey]:
+    """
+    All dates of a context and their less specific forms, built once per
+    context text, so that verifying a date anchor is a set lookup.
+    """
+    return frozenset(
+        projection for key in parse_dates(context_text) for projection in _projections(key)
+    )
+
+
+def dates_supported(value: str, index: FrozenSet[DateKey]) -> bool:
+    """
+    True if every date in `value` is in the context index.
+    Values without a recognizable date ('two days', 'weekends') are not supported.
+    """
+    keys = parse_dates(value)
+    return bool(keys) and keys <= index
@@ -0,0 +1,246 @@
+import contextlib
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: eviction falls back to best-effort without a lock
+    fcntl = None
+
+
+class DocCache:
+    """
+    Cache of parsed context chunks.
+    Level 1: in-process LRU of Doc objects.
+    Level 2 (optional): on-disk DocBin store shared by all worker processes, so
+    parsed knowledge-base pages survive deploys and restarts.
+
+    Entries are keyed by a hash of the chunk text and the model name/version,
+    so upgrading the model never serves stale parses.
+    """
+
+    FILE_SUFFIX = ".spacy"
+    # Running total of the store's size, shared by all workers and only
+    # updated under the store lock
+    SIZE_FILE = ".size"
+
+    def __init__(self, model, cache_dir: Optional[str] = None,
+                 max_memory_items: int = 2048, max_disk_bytes: int = 256 * 1024 * 1024):
+        """
+        Args:
+            model: Spacy pipeline (or LazyNLP) used to parse cache misses.
+            cache_dir (str): Root of the on-disk store. None keeps the cache in memory only.
+            max_memory_items (int): Number of Docs kept in the in-process LRU.
+            max_disk_bytes (int): Size budget of the on-disk store before eviction.
+        """
+        self.nlp = model
+        self.cache_dir = cache_dir
+        self.max_memory_items = max_memory_items
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        # Resolved lazily: reading model meta would load the model at startup.
+        self._model_tag = None
+
+    # --- Keys & Paths ---
+
+    def _get_model_tag(self) -> str:
+        if self._model_tag is None:
+            meta = self.nlp.meta
+            self._model_tag = f"{meta.get('lang', 'xx')}_{meta.get('name', 'model')}-{meta.get('version', '0')}"
+        return self._model_tag
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    def _store_dir(self) -> str:
+        return os.path.join(self.cache_dir, self._get_model_tag())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._store_dir(), key + self.FILE_SUFFIX)
+
+    # --- Level 1 (memory) ---
+
+    def _memory_get(self, key: str):
+        with self._lock:
+            doc = self._memory.get(key)
+            if doc is not None:
+                self._memory.move_to_end(key)
+            return doc
+
+    def _memory_put(self, key: str, doc) -> None:
+        with self._lock:
+            self._memory[key] = doc
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_items:
+                self._memory.popitem(last=False)
+
+    # --- Level 2 (disk) ---
+
+    def _disk_get(self, key: str):
+        if not self.cache_dir:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            # Touch for LRU eviction
+            os.utime(path)
+        except OSError:
+            # Missing, or evicted by another worker in the meantime
+            return None
+        # Deferred: spaCy is only imported once a model is in use
+        from spacy.tokens import DocBin
+        try:
+            docs = list(DocBin().from_bytes(data).get_docs(self.nlp.vocab))
+        except Exception:
+            # Truncated or incompatible file: treat as a miss, it gets rewritten
+            return None
+        return docs[0] if docs else None
+
+    def _disk_put(self, key: str, doc) -> None:
+        if not self.cache_dir:
+            return
+        store_dir = self._store_dir()
+        os.makedirs(store_dir, exist_ok=True)
+        from spacy.tokens import DocBin
+        data = DocBin(docs=[doc]).to_bytes()
+
+        # Write to a temp file and rename: readers in other processes only
+        # ever see complete files.
+        fd, tmp_path = tempfile.mkstemp(dir=store_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        path = self._path(key)
+        with self._store_lock():
+            total = self._read_disk_bytes()
+            try:
+                replaced = os.path.getsize(path)
+            except OSError:
+                replaced = 0
+            try:
+                os.replace(tmp_path, path)
+            except OSError:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                return
+            total += len(data) - replaced
+            if total > self.max_disk_bytes:
+                total = self._evict()
+            self._write_disk_bytes(total)
+
+    @contextlib.contextmanager
+    def _store_lock(self):
+        """
+        Exclusive file lock on the store: writes, size accounting and eviction
+        of all worker processes are serialized, so they share one size budget.
+        """
+        lock_path = os.path.join(self._store_dir(), ".lock")
+        with open(lock_path, "a") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_disk_bytes(self) -> int:
+        """Size of the store, from the shared running total (rebuilt by a scan if missing)."""
+        try:
+            with open(os.path.join(self._store_dir(), self.SIZE_FILE), "r") as f:
+                return int(f.read())
+        except (OSError, ValueError):
+            return self._scan_disk_bytes()
+
+    def _write_disk_bytes(self, total: int) -> None:
+        try:
+            with open(os.path.join(self._store_dir(), self.SIZE_FILE), "w") as f:
+                f.write(str(total))
+        except OSError:
+            pass  # Rebuilt by a scan on the next write
+
+    def _scan_entries(self) -> list:
+        """Returns (mtime, size, path) for every cached file."""
+        entries = []
+        try:
+            with os.scandir(self._store_dir()) as it:
+                for entry in it:
+                    if not entry.name.endswith(self.FILE_SUFFIX):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            pass
+        return entries
+
+    def _scan_disk_bytes(self) -> int:
+        return sum(size for _, size, _ in self._scan_entries())
+
+    def _evict(self) -> int:
+        """
+        Deletes least recently used files until the store is back under 90% of
+        its budget. Called under the store lock; returns the remaining size.
+        """
+        entries = sorted(self._scan_entries())
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_disk_bytes * 0.9)
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        return total
+
+    # --- Public API ---
+
+    def get_docs(self, texts: List[str]) -> list:
+        """
+        Returns one parsed Doc per text, in order.
+        Misses are parsed in a single nlp.pipe batch and written back to both levels.
+        """
+        docs = [None] * len(texts)
+        missing = {}
+
+        for i, text in enumerate(texts):
+            key = self._key(text)
+            doc = self._memory_get(key)
+            if doc is None:
+                doc = self._disk_get(key)
+                if doc is not None:
+                    self._memory_put(key, doc)
+            if doc is None:
+                missing.setdefault(key, []).append(i)
+            docs[i] = doc
+
+        if missing:
+            keys = list(missing)
+            miss_texts = [texts[missing[key][0]] for key in keys]
+            for key, doc in zip(keys, self.nlp.pipe(miss_texts)):
+                self._memory_put(key, doc)
+                self._disk_put(key, doc)
+                for i in missing[key]:
+                    docs[i] = doc
+
+        return docs
+
+    def clear_memory(self) -> None:
+        with self._lock:
+            self._memory.clear()
@@ -1,98 +1,441 @@
-from typing import Dict, List, Any
+import contextvars
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, Iterator, List, Any, NamedTuple, Optional, Tuple
+from .model import nlp, nlp_small
+from .doc_cache import DocCache
 from .relevance import RelevanceEvaluator
 from .completeness import CompletenessEvaluator
 from .hallucination import HallucinationEvaluator
+from .context_index import ContextSummaryCache
+from .grounding import GroundingEvaluator
+from .vectors import CompactVectors, StaticVectors
+from .registry import DOC_NAMES, MetricSpec, disabled_components_per_doc, resolve_metrics
+from .records import EvalReport, Verdict
+from .config import DEFAULT_CONFIG, ConfigWatcher, EvalConfig
 from .latency_cost import CostEvaluator
+from .admission import DEGRADED_CONTEXT_COST, degraded_context
 
-class Pipeline:
-    """
-    Orchestrates the evaluation modules.
-    """
+logger = logging.getLogger(__name__)
 
-    def __init__(self):
-        self.relevance_evaluator = RelevanceEvaluator()
-        self.completeness_evaluator = CompletenessEvaluator()
-        self.hallucination_evaluator = HallucinationEvaluator()
-        self.cost_evaluator = CostEvaluator()
+# Built-in Verdict Thresholds (requests use those of their EvalConfig, see config.py)
+HALLUCINATION_FAIL = DEFAULT_CONFIG.hallucination_fail
+HALLUCINATION_WARN = DEFAULT_CONFIG.hallucination_warn
+RELEVANCE_WARN = DEFAULT_CONFIG.relevance_warn
+RELEVANCE_FAIL = DEFAULT_CONFIG.relevance_fail
+COMPLETENESS_WARN = DEFAULT_CONFIG.completeness_warn
 
-    def run(self, query: str, response: str, context: List[str]) -> Dict[str, Any]:
-        """
-        Runs all evaluators and returns a structured report.
-        """
-        self.cost_evaluator.start_timer()
+# Mandated Cost & Latency Limits
+MAX_LATENCY_MS = DEFAULT_CONFIG.max_latency_ms
+MAX_COST_USD = DEFAULT_CONFIG.max_cost_usd
 
-        # 1. Relevance
-        relevance_score = self.relevance_evaluator.evaluate(query, response)
+# Execution profiles:
+# - 'full':   en_core_web_md + full claim verification (default)
+# - 'fast':   en_core_web_sm + numeric/date anchors only, never escalates (Vercel)
+# - 'tiered': 'fast' first, escalates to 'full' when a score is near a threshold
+# - 'degraded': 'fast' on the leading context chunks only (admission control, see admission.py)
+PROFILES = ("full", "fast", "tiered", "degraded")
 
-        # 2. Completeness
-        completeness_score = self.completeness_evaluator.evaluate(query, response)
 
-        # 3. Hallucination (now returns dict with score and details)
-        hallucination_result = self.hallucination_evaluator.evaluate(response, context)
-        hallucination_score = hallucination_result["score"]
-        unsupported_claims = hallucination_result["unsupported_claims"]
+class _Tier(NamedTuple):
+    """The model and evaluators of one execution tier, as seen by registered metrics."""
+    model: Any
+    relevance: RelevanceEvaluator
+    completeness: CompletenessEvaluator
+    hallucination: HallucinationEvaluator
+    grounding: GroundingEvaluator
+    cost: CostEvaluator
+    config: EvalConfig = DEFAULT_CONFIG  # The config of the request being evaluated
 
-        self.cost_evaluator.stop_timer()
-        
-        # 4. Latency & Cost
-        latency_ms = self.cost_evaluator.get_latency_ms()
-        cost_usd = self.cost_evaluator.estimate_cost(query + response + "".join(context))
 
-        # 5. Verdict Logic
+def _round_metric(name: str, value: float) -> float:
+    return round(value, 6 if name == "estimated_cost_usd" else 4)
+
+
+class VerdictBuilder:
+    """
+    The verdict rules, applied to whatever scores are known so far: metrics can be
+    added in any order (e.g. as they finish) and verdict() always gives the result
+    the complete evaluation would give for those metrics.
+    """
+
+    def __init__(self, config: EvalConfig = DEFAULT_CONFIG):
+        self.config = config
+        self.scores: Dict[str, Any] = {}
+
+    def add(self, fields: Dict[str, Any]) -> None:
+        """Fields returned by a registered metric (e.g. {'hallucination': .., 'unsupported_claims': [..]})."""
+        self.scores.update(fields)
+
+    def verdict(self, latency_ms: Optional[float] = None) -> Verdict:
+        """
+        Status and reasons from the known scores. The latency limit is only
+        checked once `latency_ms` is given (i.e. for the final verdict).
+        """
+        hallucination_score = self.scores.get("hallucination")
+        relevance_score = self.scores.get("relevance")
+        completeness_score = self.scores.get("completeness")
+        unsupported_claims = self.scores.get("unsupported_claims", [])
+        cost_usd = self.scores.get("estimated_cost_usd")
+        config = self.config
+
         verdict = "PASS"
         reasons = []
 
-        if hallucination_score > 0.5:
+        if hallucination_score is None:
+            pass  # Not requested (or not finished yet)
+        elif hallucination_score > config.hallucination_fail:
             verdict = "FAIL"
             # Add detailed explanation of what was hallucinated
             if unsupported_claims:
-                claim_texts = [c["text"] for c in unsupported_claims[:3]]  # Limit to 3
+                claim_texts = [c.text for c in unsupported_claims[:3]]  # Limit to 3
                 reasons.append(f"High hallucination: Unsupported claims found: {', '.join(claim_texts)}")
             else:
                 reasons.append("High hallucination risk")
-        elif hallucination_score > 0.1:
+        elif hallucination_score > config.hallucination_warn:
             if verdict == "PASS": verdict = "WARN"
             if unsupported_claims:
-                claim_texts = [c["text"] for c in unsupported_claims[:2]]
+                claim_texts = [c.text for c in unsupported_claims[:2]]
                 reasons.append(f"Potential hallucination: {', '.join(claim_texts)}")
             else:
                 reasons.append("Potential hallucination")
-        
-        if relevance_score < 0.2:
+
+        if relevance_score is not None and relevance_score < config.relevance_warn:
             # Only FAIL if really irrelevant, otherwise WARN
-            if relevance_score < 0.05:
+            if relevance_score < config.relevance_fail:
                 verdict = "FAIL"
                 reasons.append("Irrelevant")
             else:
                 if verdict == "PASS": verdict = "WARN"
                 reasons.append("Low relevance")
-        
-        if completeness_score < 0.5 and verdict == "PASS":
+
+        if completeness_score is not None and completeness_score < config.completeness_warn and verdict == "PASS":
             verdict = "WARN"
             reasons.append("Incomplete answer")
 
         # Mandated Cost & Latency Checks
-        MAX_LATENCY_MS = 2000.0
-        MAX_COST_USD = 0.05
-        
-        if latency_ms > MAX_LATENCY_MS:
+        if latency_ms is not None and latency_ms > config.max_latency_ms:
             if verdict == "PASS": verdict = "WARN"
-            reasons.append(f"Latency > {int(MAX_LATENCY_MS)}ms")
-            
-        if cost_usd > MAX_COST_USD:
+            reasons.append(f"Latency > {int(config.max_latency_ms)}ms")
+
+        if cost_usd is not None and cost_usd > config.max_cost_usd:
             if verdict == "PASS": verdict = "WARN"
             reasons.append("Cost limit exceeded")
 
-        return {
-            "metrics": {
-                "relevance": round(relevance_score, 4),
-                "completeness": round(completeness_score, 4),
-                "hallucination": round(hallucination_score, 4),
-                "latency_ms": round(latency_ms, 2),
-                "estimated_cost_usd": round(cost_usd, 6)
-            },
-            "verdict": {
-                "status": verdict,
-                "reasons": reasons
-            }
+        return Verdict(verdict, reasons)
+
+
+class Pipeline:
+    """
+    Orchestrates the evaluation modules.
+    """
+
+    def __init__(self, profile: str = "full", uncertainty_margin: float = 0.05,
+                 cache_dir: Optional[str] = None, cache_max_bytes: int = 256 * 1024 * 1024,
+                 parallel: bool = False, max_workers: int = 4,
+                 preselect: str = "exhaustive", preselect_k: int = 8, preselect_max_bytes: int = 64 * 1024,
+                 compact_vectors: Optional[str] = None, config_path: Optional[str] = None,
+                 config_check_interval_s: float = 2.0, degraded_context_cost: Optional[float] = None):
+        """
+        Args:
+            profile (str): One of PROFILES.
+            uncertainty_margin (float): Distance to a verdict threshold under which
+                a 'tiered' run escalates from the fast tier to the full tier.
+            cache_dir (str): On-disk store for parsed context chunks, shared by all
+                workers and kept across restarts. Defaults to $EVAL_CACHE_DIR;
+                unset means an in-memory cache only.
+            cache_max_bytes (int): Size budget of the on-disk store (per model).
+            parallel (bool): Run relevance, completeness and hallucination concurrently
+                after the shared parse, and split verification of large anchor sets
+                into concurrent batches. Scores are identical to the sequential path.
+            max_workers (int): Threads per pool when `parallel` is set.
+            preselect (str): Hallucination evidence scope: 'exhaustive' (whole context)
+                or 'topk' (best-ranked chunks only, bounded by preselect_k / preselect_max_bytes).
+            compact_vectors (str): CompactVectors file (.npz) used by the full tier's
+                similarities instead of en_core_web_md's vector table; the full tier
+                then parses with en_core_web_sm, and en_core_web_md is not loaded.
+                Defaults to $EVAL_COMPACT_VECTORS; unset means full-precision vectors.
+            config_path (str): Versioned JSON config (thresholds, verb lists, intent
+                tables), reloaded when it changes. Defaults to $EVAL_CONFIG; unset
+                means the built-in config.
+            config_check_interval_s (float): Minimum seconds between checks of the config file.
+            degraded_context_cost (float): Context cost (token-equivalents) read by the
+                'degraded' profile. Defaults to $EVAL_DEGRADED_CONTEXT_COST, else
+                admission.DEGRADED_CONTEXT_COST; must match the AdmissionController's.
+        """
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown profile '{profile}'. Expected one of {PROFILES}.")
+        self.profile = profile
+        self.uncertainty_margin = uncertainty_margin
+        self.degraded_context_cost = degraded_context_cost if degraded_context_cost is not None else float(
+            os.environ.get("EVAL_DEGRADED_CONTEXT_COST", DEGRADED_CONTEXT_COST))
+
+        # Evaluation rules, swapped in between requests when the file changes
+        config_path = config_path or os.environ.get("EVAL_CONFIG")
+        self.config_watcher = ConfigWatcher(config_path, interval_s=config_check_interval_s) if config_path else None
+
+        # With a compact table, every similarity of the full tier reads it, so the full
+        # tier parses with the small model: en_core_web_md, whose tagger, parser and
+        # NER need its own 300-d table as input features, is never loaded
+        compact_vectors = compact_vectors or os.environ.get("EVAL_COMPACT_VECTORS")
+        table = CompactVectors.load(compact_vectors) if compact_vectors else None
+        full_nlp = nlp_small if table is not None else nlp
+
+        # Parsed context chunks (loaded lazily from disk on first lookup)
+        cache_dir = cache_dir or os.environ.get("EVAL_CACHE_DIR")
+        self.fast_doc_cache = DocCache(nlp_small, cache_dir=cache_dir, max_disk_bytes=cache_max_bytes)
+        self.doc_cache = DocCache(nlp, cache_dir=cache_dir, max_disk_bytes=cache_max_bytes) \
+            if table is None else self.fast_doc_cache
+
+        # Evaluator pool and a separate verification pool, so that hallucination
+        # (running on the first) never waits on tasks queued behind itself.
+        self.parallel = parallel
+        self._executor = None
+        verify_executor = None
+        if parallel:
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="eval")
+            verify_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="eval-verify")
+
+        # Similarities read the static vector table directly (tokenizer + gather),
+        # with the vectors of repeated queries cached
+        self.static_vectors = StaticVectors(full_nlp, table=table)
+
+        # Per-chunk summaries (computed once, reused across requests) for the
+        # grounding metrics and hallucination chunk preselection
+        self.context_summaries = ContextSummaryCache(
+            self.doc_cache, vectors=self.static_vectors if table is not None else None
+        )
+        self.fast_context_summaries = ContextSummaryCache(self.fast_doc_cache, use_vectors=False)
+        preselection = dict(preselect=preselect, preselect_k=preselect_k, preselect_max_bytes=preselect_max_bytes)
+
+        # Full tier
+        self.relevance_evaluator = RelevanceEvaluator(model=full_nlp, vectors=self.static_vectors)
+        self.completeness_evaluator = CompletenessEvaluator(model=full_nlp, vectors=self.static_vectors)
+        self.hallucination_evaluator = HallucinationEvaluator(
+            model=full_nlp, cache=self.doc_cache, summaries=self.context_summaries,
+            executor=verify_executor, parallel_batches=max_workers, **preselection
+        )
+        self.grounding_evaluator = GroundingEvaluator(self.context_summaries, model=full_nlp)
+
+        # Fast tier (small model, no vectors, no dependency-based claims)
+        self.fast_relevance_evaluator = RelevanceEvaluator(model=nlp_small, use_vectors=False)
+        self.fast_completeness_evaluator = CompletenessEvaluator(model=nlp_small, use_vectors=False)
+        self.fast_hallucination_evaluator = HallucinationEvaluator(
+            mode="fast", model=nlp_small, cache=self.fast_doc_cache, summaries=self.fast_context_summaries,
+            executor=verify_executor, parallel_batches=max_workers, **preselection
+        )
+        self.fast_grounding_evaluator = GroundingEvaluator(self.fast_context_summaries, model=nlp_small)
+
+        self.cost_evaluator = CostEvaluator()
+
+        self._tiers = {
+            "full": _Tier(full_nlp, self.relevance_evaluator, self.completeness_evaluator,
+                          self.hallucination_evaluator, self.grounding_evaluator, self.cost_evaluator),
+            "fast": _Tier(nlp_small, self.fast_relevance_evaluator, self.fast_completeness_evaluator,
+                          self.fast_hallucination_evaluator, self.fast_grounding_evaluator, self.cost_evaluator),
         }
+
+    def _parse(self, model, query: str, response: str,
+               disable: Optional[Dict[str, List[str]]] = None) -> Dict[str, Any]:
+        """
+        Shared parse of the request, batched through nlp.pipe.
+        Relevance scores the lowercased texts, completeness and hallucination the originals.
+        Args:
+            disable (dict): Doc names to parse -> components to skip for that Doc
+                (see registry.disabled_components_per_doc). None parses every Doc fully.
+        Returns: dict of DOC_NAMES -> Doc
+        """
+        texts = {"query_lower": query.lower(), "response_lower": response.lower(), "query": query, "response": response}
+        if disable is None:
+            disable = {name: [] for name in DOC_NAMES}
+        # One nlp.pipe batch per distinct component set
+        groups: Dict[Tuple[str, ...], List[str]] = {}
+        for name in DOC_NAMES:
+            if name in disable:
+                groups.setdefault(tuple(disable[name]), []).append(name)
+        docs = {}
+        for components, names in groups.items():
+            docs.update(zip(names, model.pipe([texts[name] for name in names], disable=list(components))))
+        return docs
+
+    @property
+    def config(self) -> EvalConfig:
+        """The current config (read once per request)."""
+        return self.config_watcher.current() if self.config_watcher is not None else DEFAULT_CONFIG
+
+    def _iter_scores(self, tier: str, query: str, response: str, context: List[str],
+                     specs: List[MetricSpec], timings: Dict[str, float],
+                     config: EvalConfig = DEFAULT_CONFIG,
+                     parsed_context: Optional[List[str]] = None) -> Iterator[Tuple[MetricSpec, Dict[str, Any]]]:
+        """
+        Runs the requested metrics on a single tier and yields (spec, fields) as
+        each one finishes: cheapest first when sequential, in completion order
+        when parallel. Only the request Docs and spaCy components they need are
+        computed. Per-stage wall times (parse + each metric) are added to `timings`.
+        `parsed_context` (default: `context`) is what metrics needing annotations
+        read; the others (the cost estimate) still see the whole context.
+        """
+        evaluators = self._tiers[tier]._replace(config=config)
+        if parsed_context is None:
+            parsed_context = context
+
+        disable = disabled_components_per_doc(evaluators.model.pipe_names, specs)
+        parse_start = time.perf_counter()
+        docs = self._parse(evaluators.model, query, response, disable=disable)
+        timings["parse"] = (time.perf_counter() - parse_start) * 1000
+
+        def timed(spec):
+            start = time.perf_counter()
+            fields = spec.compute(evaluators, query, response, parsed_context if spec.annotations else context, docs)
+            return spec, fields, (time.perf_counter() - start) * 1000
+
+        if self._executor is not None:
+            # Most expensive first, so that the slowest metric is never queued behind cheap ones.
+            # One context copy per task keeps the request id on the pool threads' log records
+            futures = [
+                self._executor.submit(contextvars.copy_context().run, timed, spec)
+                for spec in sorted(specs, key=lambda spec: -spec.cost)
+            ]
+            results = (future.result() for future in as_completed(futures))
+        else:
+            # Cheapest first, so that streamed results start as early as possible
+            results = (timed(spec) for spec in sorted(specs, key=lambda spec: spec.cost))
+
+        for spec, fields, elapsed_ms in results:
+            timings[spec.name] = elapsed_ms
+            yield spec, fields
+
+    def _score(self, tier: str, query: str, response: str, context: List[str],
+               specs: List[MetricSpec] = None, config: EvalConfig = DEFAULT_CONFIG) -> Dict[str, Any]:
+        """
+        Runs the requested metrics (the default metrics if none are given) on a single tier.
+        Per-stage wall times (parse + each metric) are returned under 'timings_ms'.
+        """
+        specs = specs if specs is not None else resolve_metrics()
+        timings = {}
+        scores = {}
+        for _, fields in self._iter_scores(tier, query, response, context, specs, timings, config):
+            scores.update(fields)
+        scores["timings_ms"] = timings
+        return scores
+
+    def _is_uncertain(self, scores: Dict[str, Any], config: EvalConfig = DEFAULT_CONFIG) -> bool:
+        """
+        True if any score is close enough to a verdict threshold that the
+        cheap tier could plausibly have produced the wrong verdict, or if the
+        response makes SVO claims the cheap tier could not verify.
+        """
+        # The fast tier is blind to claim hallucinations: a 0.0 there proves nothing about claims
+        if scores.get("unverified_claims"):
+            return True
+        checks = [
+            ("hallucination", (config.hallucination_fail, config.hallucination_warn)),
+            ("relevance", (config.relevance_warn, config.relevance_fail)),
+            ("completeness", (config.completeness_warn,)),
+        ]
+        for name, thresholds in checks:
+            value = scores.get(name)
+            if value is not None and any(abs(value - t) <= self.uncertainty_margin for t in thresholds):
+                return True
+        return False
+
+    def run(self, query: str, response: str, context: List[str],
+            metrics: Optional[Iterable[str]] = None, profile: Optional[str] = None) -> EvalReport:
+        """
+        Runs the evaluators and returns a structured report.
+
+        Args:
+            metrics: Names of registered metrics to compute (see registry.METRICS).
+                Defaults to all; the verdict only considers the computed ones.
+            profile (str): Overrides the pipeline's profile for this request
+                (e.g. 'degraded' for requests degraded by admission control).
+        """
+        for event, payload in self.run_events(query, response, context, metrics, profile):
+            if event == "report":
+                return payload
+
+    def run_events(self, query: str, response: str, context: List[str],
+                   metrics: Optional[Iterable[str]] = None,
+                   profile: Optional[str] = None) -> Iterator[Tuple[str, Any]]:
+        """
+        Same evaluation as run(), as a stream of (event, payload) pairs emitted as
+        each stage completes:
+        - ('metric', {name, value, tier, elapsed_ms, verdict}): a metric finished;
+          'verdict' is the provisional verdict of the metrics known so far
+        - ('claim', UnsupportedClaim): an unsupported claim, right after its hallucination score
+        - ('escalate', {from, to}): a 'tiered' run restarts on the full tier; earlier metrics are superseded
+        - ('report', EvalReport): always last, identical to what run() returns
+        """
+        specs = resolve_metrics(metrics)
+        profile = profile or self.profile
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown profile '{profile}'. Expected one of {PROFILES}.")
+        # One config for the whole request, even if a new version is swapped in meanwhile
+        config = self.config
+
+        # Local timer: a shared one would race between concurrent requests
+        start_time = time.perf_counter()
+
+        # A degraded run parses a bounded context: its cost is what admission control charged
+        parsed_context = degraded_context(context, self.cost_evaluator, self.degraded_context_cost) \
+            if profile == "degraded" else context
+
+        tier = "full" if profile == "full" else "fast"
+        while True:
+            builder = VerdictBuilder(config)
+            timings = {}
+            for spec, fields in self._iter_scores(tier, query, response, context, specs, timings, config,
+                                                  parsed_context):
+                builder.add(fields)
+                yield "metric", {
+                    "name": spec.name,
+                    "value": _round_metric(spec.name, fields[spec.name]),
+                    "tier": tier,
+                    "elapsed_ms": round(timings[spec.name], 3),
+                    "verdict": builder.verdict(),
+                }
+                for claim in fields.get("unsupported_claims", []):
+                    yield "claim", claim
+            if profile == "tiered" and tier == "fast" and self._is_uncertain(builder.scores, config):
+                yield "escalate", {"from": "fast", "to": "full"}
+                tier = "full"
+                continue
+            break
+
+        scores = builder.scores
+        hallucination_score = scores.get("hallucination")
+        unsupported_claims = scores.get("unsupported_claims", [])
+        cost_usd = scores.get("estimated_cost_usd")
+
+        # 4. Latency
+        latency_ms = (time.perf_counter() - start_time) * 1000
+
+        # 5. Verdict Logic
+        verdict = builder.verdict(latency_ms)
+
+        logger.info("evaluation complete", extra={"fields": {
+            "verdict": verdict.status, "tier": tier, "latency_ms": round(latency_ms, 2),
+            "config_version": config.version,
+            "metrics": [spec.name for spec in specs],
+            "hallucination": round(hallucination_score, 4) if hallucination_score is not None else None,
+            "unsupported_claims": len(unsupported_claims),
+            "context_chunks": len(parsed_context),
+        }})
+
+        report_metrics = {spec.name: _round_metric(spec.name, scores[spec.name]) for spec in specs}
+        report_metrics["latency_ms"] = round(latency_ms, 2)
+        # Keep the established key order: scores, latency, cost
+        if cost_usd is not None:
+            report_metrics["estimated_cost_usd"] = report_metrics.pop("estimated_cost_usd")
+
+        yield "report", EvalReport(
+            metrics=report_metrics,
+            verdict=verdict,
+            tier=tier,
+            unsupported_claims=unsupported_claims,
+            # Stages in a fixed order (parse, then metrics in registry order), whatever order they ran in
+            timings_ms={stage: round(timings[stage], 3) for stage in ["parse"] + [spec.name for spec in specs]},
+            config_version=config.version,
+        )
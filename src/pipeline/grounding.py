@@ -0,0 +1,94 @@
+from typing import List
+
+from .model import nlp
+from .config import DEFAULT_CONFIG, EvalConfig
+from .relevance import RelevanceEvaluator
+from .context_index import ContextSummaryCache, content_lemmas
+
+class GroundingEvaluator:
+    """
+    Scores the query and the response against the retrieved context:
+    1. Context Relevance: did retrieval return chunks that answer the query?
+    2. Groundedness: is the response's content drawn from the retrieved chunks?
+
+    Chunk-side work (lemmas, entity labels, vectors) comes precomputed from the
+    ContextSummaryCache, so per-request work only touches the query and response.
+    """
+
+    def __init__(self, summaries: ContextSummaryCache, model=None, top_k: int = 3):
+        """
+        Args:
+            summaries (ContextSummaryCache): Per-chunk summaries shared across requests.
+            model: Spacy pipeline to parse with (defaults to the shared en_core_web_md).
+            top_k (int): Number of best-matching chunks each metric looks at.
+        """
+        self.summaries = summaries
+        self.nlp = model if model is not None else nlp
+        self.top_k = top_k
+        # Reuse the relevance intent table (e.g. "how much" -> MONEY)
+        self._intent = RelevanceEvaluator(model=self.nlp)
+
+    def evaluate_context_relevance(self, query: str, context: List[str], doc=None,
+                                   config: EvalConfig = DEFAULT_CONFIG) -> float:
+        """
+        Best of:
+        1. Intent check: a top chunk contains the entity type the query asks for.
+        2. Mean cosine similarity of the top-k chunks.
+        3. Share of query lemmas covered by the top-k chunks.
+        """
+        if not query or not context:
+            return 0.0
+        if doc is None:
+            doc = self.nlp(query)
+
+        index = self.summaries.build_index(context)
+        top = index.top_k(doc, self.top_k)
+        top_summaries = [index.summaries[i] for i, _ in top]
+
+        # 1. Intent
+        intent_score = 0.0
+        expected = self._intent._detect_intent_entities(doc, config)
+        if expected and any(not expected.isdisjoint(s.entity_labels) for s in top_summaries):
+            intent_score = 0.85
+
+        # 2. Vector (only meaningful when the index ranked by cosine)
+        vector_score = 0.0
+        if index.matrix is not None and top:
+            vector_score = max(0.0, sum(score for _, score in top) / len(top))
+
+        # 3. Lemma coverage
+        q_lemmas = content_lemmas(doc)
+        lemma_score = 0.0
+        if q_lemmas:
+            covered = set().union(*(s.lemmas for s in top_summaries))
+            lemma_score = len(q_lemmas & covered) / len(q_lemmas)
+
+        return min(max(intent_score, vector_score, lemma_score), 1.0)
+
+    def evaluate_groundedness(self, response: str, context: List[str], doc=None) -> float:
+        """
+        Share of the response's content lemmas found in its top-k chunks,
+        blended (70/30) with the share of its entity types those chunks contain.
+        """
+        if not response or not context:
+            return 0.0
+        if doc is None:
+            doc = self.nlp(response)
+
+        r_lemmas = content_lemmas(doc)
+        if not r_lemmas:
+            return 1.0  # Nothing to ground
+
+        index = self.summaries.build_index(context)
+        top_summaries = [index.summaries[i] for i, _ in index.top_k(doc, self.top_k)]
+
+        covered = set().union(*(s.lemmas for s in top_summaries))
+        lemma_support = len(r_lemmas & covered) / len(r_lemmas)
+
+        r_labels = {ent.label_ for ent in doc.ents}
+        if not r_labels:
+            return lemma_support
+
+        context_labels = set().union(*(s.entity_labels for s in top_summaries))
+        label_support = len(r_labels & context_labels) / len(r_labels)
+        return (0.7 * lemma_support) + (0.3 * label_support)
@@ -1,10 +1,20 @@
-from typing import List, Set
-import spacy
-# Load Spacy model (Medium model used for vectors)
-from .model import nlp
+import contextvars
+import logging
+import re
+from typing import Dict, FrozenSet, List, Set
+from concurrent.futures import Executor
 
+import numpy as np
 # Load Spacy model (Medium model used for vectors)
 from .model import nlp
+from .doc_cache import DocCache
+from .context_index import ContextSummaryCache
+from .dates import DateKey, context_date_index, dates_supported
+from .log import log_sampled
+from .config import DEFAULT_CONFIG, EvalConfig
+from .records import Anchor, UnsupportedClaim
+
+logger = logging.getLogger(__name__)
 
 class HallucinationEvaluator:
     """
@@ -18,23 +28,9 @@ class HallucinationEvaluator:
     - TODO: Upgrade to Claim-Based Verification (Phase 2).
     """
 
-    # Verbs that imply a factual claim (Assertive)
-    # MUST include base forms (lemmas) as Spacy uses lemmas for matching
-    ASSERTIVE_VERBS = {
-        "be", "is", "are", "was", "were", 
-        "cost", "costs", 
-        "include", "includes", "included",
-        "offer", "offers", "offered", 
-        "release", "released", "releases", 
-        "announce", "announced",
-        "acquire", "acquired", 
-        "buy", "bought", 
-        "sell", "sold", 
-        "win", "won", 
-        "lose", "lost", 
-        "found", "founded", 
-        "locate", "located"
-    }
+    # Verbs that imply a factual claim (Assertive), from the built-in config.
+    # Requests use the verbs of the config they are evaluated with.
+    ASSERTIVE_VERBS = DEFAULT_CONFIG.assertive_verbs
     
     # ... (HEDGING_VERBS unchanged)
 
@@ -68,14 +64,16 @@ class HallucinationEvaluator:
         except ValueError:
             return None
 
-    def _verify_anchor(self, anchor: dict, context_text: str) -> bool:
+    def _verify_anchor(self, anchor: Anchor, context_text: str, dates: FrozenSet[DateKey] = None) -> bool:
         """
         Checks if an anchor is supported by the context.
+        `dates` is the context's date index (see dates.context_date_index),
+        built on demand if not given.
         Returns True if supported, False if unsupported.
         """
         # 1. Numeric Verification
-        if anchor["type"] == "numeric":
-            val = anchor["value"]
+        if anchor.type == "numeric":
+            val = anchor.value
             
             # A. Direct String Match (Fast & Simple)
             # Remove "pure" formatting chars like commas
@@ -88,7 +86,6 @@ class HallucinationEvaluator:
             if anchor_num is not None:
                 # Scan context for numbers that might match
                 # This is expensive so we rely on regex for candidates
-                import re
                 # Find all potential number-like tokens in context
                 # Matches: $100, 100k, 100.00, 100,000
                 candidates = re.findall(r'[\$£€]?\d+(?:[\.,]\d+)?[kmbKMB]?', context_text)
@@ -109,75 +106,19 @@ class HallucinationEvaluator:
             return False
 
         # 2. Date Verification
-        if anchor["type"] == "date":
+        if anchor.type == "date":
             # Direct match
-            if anchor["value"] in context_text:
-                return True
-            
-            # Simple Date Normalization
-            val = anchor["value"]
-            val_clean = val.replace(",", "").replace("st", "").replace("nd", "").replace("rd", "").replace("th", "")
-            if val_clean in context_text:
+            if anchor.value in context_text:
                 return True
-                
-            # Month Mapping
-            months_map = {
-                "january": "01", "jan": "01", 
-                "february": "02", "feb": "02",
-                "march": "03", "mar": "03", 
-                "april": "04", "apr": "04",
-                "may": "05", 
-                "june": "06", "jun": "06", 
-                "july": "07", "jul": "07",
-                "august": "08", "aug": "08", 
-                "september": "09", "sep": "09", "sept": "09",
-                "october": "10", "oct": "10", 
-                "november": "11", "nov": "11", 
-                "december": "12", "dec": "12"
-            }
-            
-            val_lower = val.lower()
-            
-            # 1. Try to detect text-month in Anchor
-            detected_month_num = None
-            detected_month_name = None
-            
-            for m_name, m_num in months_map.items():
-                # Simple substring check
-                if m_name in val_lower:
-                    detected_month_num = m_num
-                    detected_month_name = m_name
-                    break
-            
 
-            # ... (Month detection logic)
-            if detected_month_num:
-                # Try to extract day
-                import re
-                day_match = re.search(r'(\d+)(?:st|nd|rd|th)?', val_lower)
-                if day_match:
-                    day_val = day_match.group(1).zfill(2)
-                    # Construct numeric patterns: MM-DD
-                    pat_num1 = f"{detected_month_num}-{day_val}"
-                    pat_num2 = f"{detected_month_num}/{day_val}"
-                    
-                    if pat_num1 in context_text or pat_num2 in context_text:
-                        return True
-            
-            # Smart Year Check
-
-            years = re.findall(r'\b(19|20)\d{2}\b', val)
-            if years:
-                for year in years:
-                    if year not in context_text:
-                        return False 
-                return True 
-            
-            return False 
+            # Canonical (year, month, day) match against the context's date index
+            if dates is None:
+                dates = context_date_index(context_text)
+            return dates_supported(anchor.value, dates)
 
         # 3. Claim (SVO) Verification
-        if anchor["type"] == "claim":
-            subj, verb, obj = anchor["components"]
+        if anchor.type == "claim":
+            subj, verb, obj = anchor.components
             subj = subj.lower()
             obj = obj.lower()
             
@@ -188,7 +129,6 @@ class HallucinationEvaluator:
                 return False
                 
             # Distance check
-            import re
             subj_indices = [m.start() for m in re.finditer(re.escape(subj), context_text)]
             obj_indices = [m.start() for m in re.finditer(re.escape(obj), context_text)]
             
@@ -203,120 +143,210 @@ class HallucinationEvaluator:
 
             
         return True
-    HEDGING_VERBS = {
-        "may", "might", "could", "can", "appears", "seems", "suggests", 
-        "estimated", "likely", "possibly", "probably"
-    }
+    # Dependency labels of claim subjects and direct objects
+    SUBJECT_DEPS = ["nsubj", "nsubjpass"]
+    OBJECT_DEPS = ["dobj", "attr", "acomp"]
+    # Children that can hedge a claim verb ("may be", "probably costs")
+    HEDGE_DEPS = ["aux", "advmod"]
+    # Clauses that complement a hedging verb ("seems to cost", "suggests it costs")
+    COMPLEMENT_DEPS = ["xcomp", "ccomp"]
 
-    def __init__(self, n: int = 1, mode: str = "claims"):
+    def __init__(self, n: int = 1, mode: str = "claims", model=None, cache: DocCache = None,
+                 executor: Executor = None, parallel_min_anchors: int = 16, parallel_batches: int = 4,
+                 preselect: str = "exhaustive", preselect_k: int = 8, preselect_max_bytes: int = 64 * 1024,
+                 summaries: ContextSummaryCache = None):
         """
         Args:
             n (int): N-gram size for surface checking.
-            mode (str): 'legacy' (surface/entity) or 'claims' (deep verification).
+            mode (str): 'legacy' (surface/entity), 'claims' (deep verification)
+                or 'fast' (numeric/date anchors only, no SVO claims).
+            model: Spacy pipeline to parse with (defaults to the shared en_core_web_md).
+            cache (DocCache): Parsed context chunks, shared across requests.
+                Defaults to an in-memory cache for `model`.
+            executor (Executor): If set, anchor verification of large anchor sets is
+                split into batches that run concurrently, and topic drift is computed
+                alongside it. Results are identical to the sequential path.
+            parallel_min_anchors (int): Below this many anchors, verification stays sequential.
+            parallel_batches (int): Number of anchor batches to split verification into.
+            preselect (str): 'exhaustive' verifies anchors against the whole context;
+                'topk' only against the best-ranked chunks (inverted index over chunk terms).
+            preselect_k (int): Maximum number of chunks kept by 'topk'.
+            preselect_max_bytes (int): Byte budget of the chunks kept by 'topk'.
+            summaries (ContextSummaryCache): Per-chunk summaries used by 'topk'.
+                Defaults to one built on `cache`.
         """
         self.n = n
         self.mode = mode
+        self.nlp = model if model is not None else nlp
+        self.cache = cache if cache is not None else DocCache(self.nlp)
+        self.executor = executor
+        self.parallel_min_anchors = parallel_min_anchors
+        self.parallel_batches = parallel_batches
+        if preselect not in ("exhaustive", "topk"):
+            raise ValueError(f"Unknown preselect mode '{preselect}'. Expected 'exhaustive' or 'topk'.")
+        self.preselect = preselect
+        self.preselect_k = preselect_k
+        self.preselect_max_bytes = preselect_max_bytes
+        self.summaries = summaries if summaries is not None else ContextSummaryCache(self.cache, use_vectors=False)
 
     def _get_ngrams(self, text: str) -> Set[str]:
-        # Use Spacy for tokenization (already loaded) - avoids NLTK download issues
-        doc = nlp(text.lower())
+        # Tokenizer only: n-grams need no tagger/parser/NER (same tokens as a full parse)
+        doc = self.nlp.make_doc(text.lower())
         tokens = [token.text for token in doc]
-        
+        return self._ngrams_from_tokens(tokens)
+
+    def _ngrams_from_tokens(self, tokens: List[str]) -> Set[str]:
         if len(tokens) < self.n:
             return set()
             
         # Manual n-gram generation
         return {tuple(tokens[i:i+self.n]) for i in range(len(tokens) - self.n + 1)}
 
+    def _get_context_ngrams(self, context: List[str]) -> Set[str]:
+        """
+        N-grams of the context, built per chunk from cached parses so that
+        repeated knowledge-base chunks are never re-parsed.
+        """
+        ngrams = set()
+        for doc in self.cache.get_docs(context):
+            ngrams.update(self._ngrams_from_tokens([token.lower_ for token in doc]))
+        return ngrams
+
     def _extract_entities(self, text: str) -> Set[str]:
         """Legacy extraction for 'legacy' mode."""
-        doc = nlp(text)
+        doc = self.nlp(text)
         return {ent.text.lower() for ent in doc.ents}
 
-    def _extract_anchors(self, text: str) -> List[dict]:
+    def _extract_context_entities(self, context: List[str]) -> Set[str]:
+        """Legacy extraction over cached context chunks."""
+        return {ent.text.lower() for doc in self.cache.get_docs(context) for ent in doc.ents}
+
+    @staticmethod
+    def _is_hedging_word(token, hedging_verbs) -> bool:
+        return token.lower_ in hedging_verbs or token.lemma_.lower() in hedging_verbs
+
+    def _extract_claims(self, doc, config: EvalConfig = DEFAULT_CONFIG) -> List[Anchor]:
+        """
+        Subject-Verb-Object claims of the config's assertive verbs, in verb order:
+        the verb's last subject child, its last direct object (dobj/attr/acomp) or,
+        failing that, the first pobj of its last prep child that has one.
+        Hedged verbs are not assertions and yield no claim: those with a modal or
+        adverb from the config's hedging verbs ("may be"), or complementing one
+        ("seems to cost").
+        """
+        if not doc.has_annotation("DEP"):
+            return []
+        strings = doc.vocab.strings
+        subject_deps = {strings[dep] for dep in self.SUBJECT_DEPS}
+        object_deps = {strings[dep] for dep in self.OBJECT_DEPS}
+        hedge_deps = {strings[dep] for dep in self.HEDGE_DEPS}
+        complement_deps = {strings[dep] for dep in self.COMPLEMENT_DEPS}
+        prep, pobj = strings["prep"], strings["pobj"]
+        hedging_verbs = config.hedging_verbs
+
+        from spacy.attrs import LEMMA, POS
+        from spacy.parts_of_speech import VERB
+
+        # 1. Verb candidates from one vectorized pass over the POS/LEMMA columns
+        attrs = doc.to_array([POS, LEMMA])
+        candidates = np.flatnonzero((attrs[:, 0] == VERB) & np.isin(attrs[:, 1], config.assertive_lemma_ids(doc.vocab)))
+
+        claims = []
+        # 2. Only the candidates' children are visited
+        for verb_i in candidates:
+            token = doc[int(verb_i)]
+            if token.dep in complement_deps and self._is_hedging_word(token.head, hedging_verbs):
+                continue
+            subj = obj = prep_obj = None
+            hedged = False
+            for child in token.children:
+                if child.dep in hedge_deps:
+                    hedged = hedged or self._is_hedging_word(child, hedging_verbs)
+                elif child.dep in subject_deps:
+                    subj = child
+                elif child.dep in object_deps:
+                    obj = child
+                elif child.dep == prep:
+                    # 3. Prepositional object (e.g. "located in Paris"): the last prep with a pobj wins
+                    prep_obj = next((grandchild for grandchild in child.children if grandchild.dep == pobj), prep_obj)
+            obj = obj or prep_obj
+            if subj is not None and obj is not None and not hedged:
+                claims.append(Anchor(
+                    "claim", f"{subj.text} {token.text} {obj.text}",
+                    span=(subj.idx, obj.idx + len(obj.text)),
+                    components=(subj.text, token.text, obj.text),
+                ))
+        return claims
+
+    def _extract_anchors(self, text: str, claims: bool = True, doc=None,
+                         config: EvalConfig = DEFAULT_CONFIG) -> List[Anchor]:
         """
         Extracts verifiable facts (Anchors) from text.
         Includes:
         1. Numerical Values (MONEY, CARDINAL, QUANTITY)
         2. Dates (DATE)
-        3. Subject-Verb-Object Triplets (only with ASSERTIVE verbs)
+        3. Subject-Verb-Object Triplets (only with unhedged ASSERTIVE verbs, skipped if claims=False)
+
+        `doc` is an optional pre-parsed Doc of `text` (Pipeline's shared parse).
         """
-        doc = nlp(text)
+        if doc is None:
+            doc = self.nlp(text)
         anchors = []
 
         # 1. Extract Named Entities & Numbers
         for ent in doc.ents:
             if ent.label_ in ["MONEY", "CARDINAL", "QUANTITY", "DATE", "TIME", "PERCENT"]:
-                anchors.append({
-                    "type": "numeric" if ent.label_ != "DATE" else "date",
-                    "text": ent.text,
-                    "value": ent.text.lower(),
-                    "span": (ent.start_char, ent.end_char)
-                })
+                anchors.append(Anchor(
+                    "numeric" if ent.label_ != "DATE" else "date", ent.text,
+                    value=ent.text.lower(), span=(ent.start_char, ent.end_char),
+                ))
 
         # 2. Extract Action/Assertion Claims (Dependency Parse)
-        # Look for Subject + Verb + Object
-        for token in doc:
-            # Check if token is a verb and strict match for assertive verbs
-            if token.pos_ == "VERB" and token.lemma_.lower() in self.ASSERTIVE_VERBS:
-                
-                # Find Subject (nsubj) and Object (dobj, attr, prep+pobj)
-                subj = None
-                obj = None
-                
-                for child in token.children:
-                    if child.dep_ in ["nsubj", "nsubjpass"]:
-                        subj = child
-                    if child.dep_ in ["dobj", "attr", "acomp"]:
-                        obj = child
-                
-                # If direct object missing, check for prepositional object (e.g. "located in Paris")
-                if not obj:
-                    for child in token.children:
-                        if child.dep_ == "prep":
-                            for grandchild in child.children:
-                                if grandchild.dep_ == "pobj":
-                                    obj = grandchild
-                                    break
-
-                if subj and obj:
-                    # Construct the claim
-                    claim_text = f"{subj.text} {token.text} {obj.text}"
-                    anchors.append({
-                        "type": "claim",
-                        "text": claim_text,
-                        "components": (subj.text, token.text, obj.text),
-                        "span": (subj.idx, obj.idx + len(obj.text))
-                    })
-        
+        if claims:
+            anchors.extend(self._extract_claims(doc, config))
         return anchors
 
-    def evaluate(self, response: str, context: List[str]) -> dict:
+    def extract_anchors_batch(self, texts: List[str], claims: bool = True, batch_size: int = 64,
+                              config: EvalConfig = DEFAULT_CONFIG) -> List[List[Anchor]]:
+        """
+        Anchors of many texts, parsed together through nlp.pipe.
+        """
+        return [
+            self._extract_anchors(doc.text, claims=claims, doc=doc, config=config)
+            for doc in self.nlp.pipe(texts, batch_size=batch_size)
+        ]
+
+    def evaluate(self, response: str, context: List[str], doc=None, config: EvalConfig = DEFAULT_CONFIG) -> dict:
         """
         Dispatches evaluation based on selected mode.
-        Returns: dict with 'score' and 'unsupported_claims'
+        `doc` is an optional pre-parsed Doc of the response; `config` provides the assertive verbs.
+        Returns: dict with 'score' and 'unsupported_claims', plus 'unverified_claims'
+        in 'fast' mode (number of SVO claims found but not verified)
         """
         if not response:
             return {"score": 0.0, "unsupported_claims": []}
         if not context:
-            return {"score": 1.0, "unsupported_claims": [{"type": "context", "text": "No context provided", "reason": "Cannot verify claims without context"}]}
+            return {"score": 1.0, "unsupported_claims": [UnsupportedClaim("context", "No context provided", "Cannot verify claims without context")]}
 
         if self.mode == "legacy":
             score = self._evaluate_legacy(response, context)
             return {"score": score, "unsupported_claims": []}
-        else:
-            score, claims = self._evaluate_claims(response, context)
-            return {"score": score, "unsupported_claims": claims}
+        if doc is None:
+            doc = self.nlp(response)
+        score, claims = self._evaluate_claims(response, context, doc=doc, config=config)
+        result = {"score": score, "unsupported_claims": claims}
+        if self.mode == "fast":
+            # Claims are extracted (cheap) but not verified: a 'tiered' run escalates on them
+            result["unverified_claims"] = len(self._extract_claims(doc, config))
+        return result
 
     def _evaluate_legacy(self, response: str, context: List[str]) -> float:
         """
         DEPRECATED: Old heuristic scoring using entity & n-gram overlap.
         """
-        full_context = " ".join(context)
-        
         # 1. N-gram Check (Surface)
         response_ngrams = self._get_ngrams(response)
-        context_ngrams = self._get_ngrams(full_context)
+        context_ngrams = self._get_context_ngrams(context)
         
         ngram_score = 0.0
         if response_ngrams:
@@ -325,7 +355,7 @@ class HallucinationEvaluator:
         
         # 2. Entity Check (Deep)
         response_entities = self._extract_entities(response)
-        context_entities = self._extract_entities(full_context)
+        context_entities = self._extract_context_entities(context)
         
         # Simple set difference of proper nouns
         unsupported_fact_ratio = 0.0
@@ -337,19 +367,94 @@ class HallucinationEvaluator:
 
         return float((0.6 * unsupported_fact_ratio) + (0.4 * ngram_score))
 
-    def _evaluate_claims(self, response: str, context: List[str]) -> tuple:
+    def _verify_anchors(self, anchors: List[Anchor], context_text: str) -> List[bool]:
+        """
+        Verifies every anchor, in order.
+        Large anchor sets are split into batches verified concurrently on the executor;
+        each anchor is still checked against the full context, so results are identical.
+        """
+        # Dates of the context are parsed once, not once per date anchor
+        dates = context_date_index(context_text) if any(a.type == "date" for a in anchors) else None
+        if self.executor is None or len(anchors) < self.parallel_min_anchors:
+            return [self._verify_anchor(anchor, context_text, dates) for anchor in anchors]
+
+        batch_size = -(-len(anchors) // self.parallel_batches)  # ceil
+        batches = [anchors[i:i + batch_size] for i in range(0, len(anchors), batch_size)]
+        verify_batch = lambda batch: [self._verify_anchor(anchor, context_text, dates) for anchor in batch]
+        # One context copy per task keeps the request id on the pool threads' log records
+        futures = [self.executor.submit(contextvars.copy_context().run, verify_batch, batch) for batch in batches]
+        results = []
+        for future in futures:
+            results.extend(future.result())
+        return results
+
+    def _preselection_terms(self, doc, anchors: List[Anchor]) -> Dict[str, float]:
+        """
+        Weighted lookup terms: response content tokens, with anchor tokens
+        (the things actually being verified) counting double.
+        """
+        terms = {
+            token.lower_: 1.0 for token in doc
+            if not token.is_stop and not token.is_punct and not token.is_space
+        }
+        for anchor in anchors:
+            for token in self.nlp.make_doc(anchor.text.lower()):
+                if not token.is_punct and not token.is_space:
+                    terms[token.lower_] = 2.0
+        return terms
+
+    def _preselect_chunks(self, context: List[str], anchors: List[Anchor], doc) -> List[str]:
+        """
+        Top-k chunks ranked against the response, within the byte budget,
+        returned in their original context order. The best-ranked chunk is kept
+        even if it alone exceeds the budget.
+        """
+        index = self.summaries.build_index(context)
+        ranked = index.rank_chunks(self._preselection_terms(doc, anchors))
+        if not ranked:
+            # No chunk shares a term: verifying against nothing would flag every
+            # anchor, so take the first chunks in context order instead
+            ranked = [(i, 0.0) for i in range(len(context))]
+
+        selected = []
+        used_bytes = 0
+        for i, _ in ranked[:self.preselect_k]:
+            size = len(context[i].encode("utf-8"))
+            if selected and used_bytes + size > self.preselect_max_bytes:
+                continue
+            selected.append(i)
+            used_bytes += size
+        return [context[i] for i in sorted(selected)]
+
+    def _evaluate_claims(self, response: str, context: List[str], doc=None,
+                         config: EvalConfig = DEFAULT_CONFIG) -> tuple:
         """
         Claim-Based Verification with detailed reporting.
         Returns: (score, unsupported_claims_list)
         """
-        full_context_text = " ".join(context).lower()
-        
-        # Step 1: Extract Anchors
-        anchors = self._extract_anchors(response)
+        if doc is None:
+            doc = self.nlp(response)
+
+        # Step 1: Extract Anchors ('fast' mode skips the dependency-based SVO claims)
+        anchors = self._extract_anchors(response, claims=self.mode != "fast", doc=doc, config=config)
+
+        if self.preselect == "topk" and anchors:
+            full_context_text = " ".join(self._preselect_chunks(context, anchors, doc)).lower()
+        else:
+            full_context_text = " ".join(context).lower()
         
+        # Topic drift is independent of verification: overlap the two when parallel
+        if self.executor is not None:
+            drift_future = self.executor.submit(
+                contextvars.copy_context().run, self._get_topic_drift_score, response, context
+            )
+            get_drift = drift_future.result
+        else:
+            get_drift = lambda: self._get_topic_drift_score(response, context)
+
         # If no verifiable claims are made, we can't fact-check.
         if not anchors:
-            drift_score = self._get_topic_drift_score(response, context)
+            drift_score = get_drift()
             return (drift_score, [])
 
         # Step 2: Verification (Evidence Matching)
@@ -357,20 +462,20 @@ class HallucinationEvaluator:
         error_weight = 0.0
         unsupported_claims = []
         
-        for anchor in anchors:
+        verified = self._verify_anchors(anchors, full_context_text)
+        for anchor, is_supported in zip(anchors, verified):
             # Assign weights
-            weight = 1.0 if anchor["type"] in ["numeric", "date"] else 0.5
+            weight = 1.0 if anchor.type in ["numeric", "date"] else 0.5
             total_weight += weight
             
-            is_supported = self._verify_anchor(anchor, full_context_text)
+            log_sampled(logger, logging.DEBUG, "anchor verified",
+                        anchor_type=anchor.type, anchor=anchor.text, supported=is_supported)
             if not is_supported:
                 error_weight += weight
                 # Track the unsupported claim for reporting
-                unsupported_claims.append({
-                    "type": anchor["type"],
-                    "text": anchor["text"],
-                    "reason": f"'{anchor['text']}' not found in context"
-                })
+                unsupported_claims.append(UnsupportedClaim(
+                    anchor.type, anchor.text, f"'{anchor.text}' not found in context"
+                ))
         
         # Step 3: Calculation
         if total_weight > 0:
@@ -379,7 +484,7 @@ class HallucinationEvaluator:
             claim_error_rate = 0.0
         
         # Step 4: Topic Drift Gate
-        drift_penalty = self._get_topic_drift_score(response, context)
+        drift_penalty = get_drift()
         final_score = max(claim_error_rate, drift_penalty if claim_error_rate == 0 else 0)
         
         return (float(final_score), unsupported_claims)
@@ -389,12 +494,11 @@ class HallucinationEvaluator:
 
     def _get_topic_drift_score(self, response: str, context: List[str]) -> float:
         """Calculates simple N-gram overlap for topic drift detection."""
-        full_context = " ".join(context)
         response_ngrams = self._get_ngrams(response)
         if not response_ngrams: 
             return 0.0 # No text, no drift? Or 1.0?
             
-        context_ngrams = self._get_ngrams(full_context)
+        context_ngrams = self._get_context_ngrams(context)
         overlap = response_ngrams.intersection(context_ngrams)
         overlap_ratio = len(overlap) / len(response_ngrams)
         
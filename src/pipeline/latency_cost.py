@@ -1,23 +1,47 @@
 import logging
+import os
 import time
+from typing import List
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+from .tokenizer import CachedTokenCounter, load_tokenizer
+
+# Logging is configured by the entry point (see log.configure_logging), never at import
 logger = logging.getLogger(__name__)
 
+# USD per 1k tokens: (input, output)
+MODEL_PRICES = {
+    "default": (0.002, 0.002),  # GPT-3.5 input/output avg (previous flat rate)
+    "gpt-3.5-turbo": (0.0005, 0.0015),
+    "gpt-4o-mini": (0.00015, 0.0006),
+    "gpt-4o": (0.0025, 0.01),
+    "gpt-4-turbo": (0.01, 0.03),
+}
+
 class CostEvaluator:
     """
     Tracks the latency and estimated cost of the operation.
     """
 
-    def __init__(self):
+    def __init__(self, price_model: str = None, tokenizer=None, cache_size: int = 8192):
+        """
+        Args:
+            price_model (str): Key of MODEL_PRICES (defaults to $EVAL_PRICE_MODEL or 'default').
+            tokenizer: Object with `count(text)`. Defaults to load_tokenizer(), i.e. the
+                BPE vocab at $EVAL_TOKENIZER_VOCAB, else the shipped cl100k_base vocab.
+            cache_size (int): Number of per-chunk token counts to memoize.
+        """
         self.start_time = 0
         self.end_time = 0
-        # Approximate cost per 1k tokens (e.g., GPT-3.5 input/output avg)
-        self.cost_per_1k_tokens = 0.002 
+        price_model = price_model or os.environ.get("EVAL_PRICE_MODEL", "default")
+        if price_model not in MODEL_PRICES:
+            raise ValueError(f"Unknown price model '{price_model}'. Expected one of {list(MODEL_PRICES)}.")
+        self.price_model = price_model
+        self.input_cost_per_1k, self.output_cost_per_1k = MODEL_PRICES[price_model]
+        # Kept for callers of estimate_cost()
+        self.cost_per_1k_tokens = self.input_cost_per_1k
+
+        self.tokenizer = tokenizer if tokenizer is not None else load_tokenizer()
+        self.token_counter = CachedTokenCounter(self.tokenizer, max_items=cache_size)
 
     def start_timer(self):
         self.start_time = time.time()
@@ -28,11 +52,27 @@ class CostEvaluator:
     def get_latency_ms(self) -> float:
         return (self.end_time - self.start_time) * 1000
 
+    def count_tokens(self, text: str) -> float:
+        """Tokens in `text`, uncached (query/response are rarely repeated)."""
+        return self.tokenizer.count(text)
+
+    def count_context_tokens(self, context: List[str]) -> float:
+        """Tokens across all chunks, memoized per chunk."""
+        return sum(self.token_counter.count(chunk) for chunk in context)
+
+    def estimate_request_cost(self, query: str, response: str, context: List[str]) -> float:
+        """
+        Cost of one RAG call: query + context are billed as input, response as output.
+        Counts each part separately, never building the concatenated prompt.
+        """
+        input_tokens = self.count_tokens(query) + self.count_context_tokens(context)
+        output_tokens = self.count_tokens(response)
+        return (input_tokens / 1000) * self.input_cost_per_1k + (output_tokens / 1000) * self.output_cost_per_1k
+
     def estimate_cost(self, text: str) -> float:
         """
-        Rough estimate of cost based on character count (4 chars ~= 1 token).
+        Cost of a single text billed at the input rate.
         """
-        num_chars = len(text)
-        num_tokens = num_chars / 4
+        num_tokens = self.count_tokens(text)
         cost = (num_tokens / 1000) * self.cost_per_1k_tokens
         return cost
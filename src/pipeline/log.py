@@ -0,0 +1,129 @@
+import atexit
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Optional
+
+# Correlation id of the request being evaluated (propagated to pool threads by Pipeline)
+request_id_var = contextvars.ContextVar("request_id", default=None)
+
+# Fraction of high-volume debug events (e.g. per-anchor decisions) that are emitted
+DEFAULT_SAMPLE_RATE = float(os.environ.get("EVAL_LOG_SAMPLE_RATE", "0.1"))
+
+_listener = None
+
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+@contextmanager
+def request_context(request_id: Optional[str] = None):
+    """
+    Binds a correlation id to everything logged inside the block.
+    """
+    token = request_id_var.set(request_id or new_request_id())
+    try:
+        yield request_id_var.get()
+    finally:
+        request_id_var.reset(token)
+
+
+class RequestIdFilter(logging.Filter):
+    """
+    Stamps records with the current request id. Must run on the logging
+    thread's caller (before the queue), where the context variable is set.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            record.request_id = request_id_var.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line. Structured fields passed as
+    `extra={"fields": {...}}` are merged into the object.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["request_id"] = request_id
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(fields)
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class _PreparedQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that keeps args/exc_info unformatted until the listener
+    thread formats them, so the request thread only pays for an enqueue.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def configure_logging(level: str = None, json_format: bool = True, stream=None):
+    """
+    Routes the root logger through a non-blocking queue: request threads only
+    enqueue records, a background listener formats and writes them.
+    Call once from an entry point (API startup, CLI); never at import time.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    level = level or os.environ.get("EVAL_LOG_LEVEL", "INFO")
+    handler = logging.StreamHandler(stream or sys.stderr)
+    if json_format:
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = _PreparedQueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+    return _listener
+
+
+def log_sampled(logger: logging.Logger, level: int, msg: str, *args,
+                sample_rate: float = None, **fields) -> None:
+    """
+    Logs a high-volume event for a fraction of calls. The level check comes
+    first, so disabled events cost one cached lookup and no formatting.
+    """
+    if not logger.isEnabledFor(level):
+        return
+    rate = DEFAULT_SAMPLE_RATE if sample_rate is None else sample_rate
+    if rate < 1.0 and random.random() >= rate:
+        return
+    fields["sample_rate"] = rate
+    logger.log(level, msg, *args, extra={"fields": fields})
@@ -1,6 +1,10 @@
-import spacy
+import importlib
+import logging
 import subprocess
 import sys
+import threading
+
+logger = logging.getLogger(__name__)
 
 class LazyNLP:
     """
@@ -10,28 +14,39 @@ class LazyNLP:
     def __init__(self, model_name="en_core_web_md"):
         self.model_name = model_name
         self._model = None
+        # Requests run on a threadpool: only the first caller loads the model
+        self._lock = threading.Lock()
 
     def _load(self):
         if self._model:
             return
-            
-        print(f"Lazy Loading Spacy Model ({self.model_name})...")
+        with self._lock:
+            if self._model:
+                return
+            self._load_model()
+
+    def _load_model(self):
+        # spaCy itself is imported here, not at module level: importing the
+        # package (CLI --help, /health) must stay cheap
+        import spacy
+
+        logger.info("Lazy loading spacy model %s", self.model_name)
         try:
             # 1. Try direct import (fastest/cleanest for prod)
-            import en_core_web_md
-            self._model = en_core_web_md.load()
-            print("Model loaded via package import.")
+            model_package = importlib.import_module(self.model_name)
+            self._model = model_package.load()
+            logger.info("Model %s loaded via package import", self.model_name)
         except ImportError:
             try:
                 # 2. Try spacy registry
                 self._model = spacy.load(self.model_name)
-                print("Model loaded via spacy.load().")
+                logger.info("Model %s loaded via spacy.load()", self.model_name)
             except OSError:
                 # 3. Fallback: Download runtime
-                print("Model not found. Downloading...")
+                logger.warning("Model %s not found, downloading", self.model_name)
                 subprocess.run([sys.executable, "-m", "spacy", "download", self.model_name])
                 self._model = spacy.load(self.model_name)
-                print("Model downloaded and loaded.")
+                logger.info("Model %s downloaded and loaded", self.model_name)
 
     def __call__(self, *args, **kwargs):
         self._load()
@@ -44,3 +59,7 @@ class LazyNLP:
 # Global singleton is now an instance of LazyNLP
 # This is lightweight and initializes instantly.
 nlp = LazyNLP("en_core_web_md")
+
+# Small model for the fast tier (no static vectors, ~12MB).
+# Only loaded if a 'fast' or 'tiered' Pipeline is created.
+nlp_small = LazyNLP("en_core_web_sm")
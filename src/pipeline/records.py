@@ -0,0 +1,124 @@
+import json
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # Optional: falls back to the standard json module
+    orjson = None
+
+
+class _Fields:
+    """
+    Read access by key (record["text"], record.get("tier"), {**record}) on the
+    __slots__ records below, so code written against the former dicts keeps working.
+    Fields set to None are treated as absent.
+    """
+    __slots__ = ()
+
+    def __getitem__(self, key: str):
+        try:
+            value = getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default=None):
+        value = getattr(self, key, None)
+        return default if value is None else value
+
+    def __contains__(self, key: str) -> bool:
+        return getattr(self, key, None) is not None
+
+    def keys(self) -> List[str]:
+        return [f.name for f in fields(self) if getattr(self, f.name) is not None]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow dict of the set fields (nested records are left as they are)."""
+        return {name: getattr(self, name) for name in self.keys()}
+
+
+def _slots(cls):
+    """
+    @dataclass(slots=True) for Python 3.9 (the flag needs 3.10): recreates the
+    dataclass `cls` with __slots__ for its fields. Defaults stay in the
+    generated __init__, so the class attributes holding them are dropped.
+    """
+    names = tuple(f.name for f in fields(cls))
+    namespace = {key: value for key, value in cls.__dict__.items()
+                 if key not in names and key not in ("__dict__", "__weakref__")}
+    namespace["__slots__"] = names
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+
+@_slots
+@dataclass
+class Anchor(_Fields):
+    """A verifiable fact of a response: a number, a date or an SVO claim."""
+    type: str                                    # 'numeric', 'date' or 'claim'
+    text: str
+    value: Optional[str] = None                  # Lowercased text (numeric/date)
+    span: Optional[Tuple[int, int]] = None       # Character offsets in the response
+    components: Optional[Tuple[str, str, str]] = None  # (subject, verb, object) of a claim
+
+
+@_slots
+@dataclass
+class UnsupportedClaim(_Fields):
+    type: str
+    text: str
+    reason: str
+
+
+@_slots
+@dataclass
+class Verdict(_Fields):
+    status: str
+    reasons: List[str]
+
+
+@_slots
+@dataclass
+class EvalReport(_Fields):
+    """Result of Pipeline.run."""
+    metrics: Dict[str, float]
+    verdict: Verdict
+    tier: str
+    # Details for bulk reports (see reports.py); not part of the API response
+    unsupported_claims: List[UnsupportedClaim]
+    timings_ms: Dict[str, float]
+    # Version of the EvalConfig the report was scored with
+    config_version: Optional[str] = None
+    # 'degraded' when admission control downgraded the request to the 'degraded' profile
+    admission: Optional[str] = None
+
+    def public(self) -> Dict[str, Any]:
+        """The API response (EvalResponse): metrics, verdict, tier, config version and admission if set."""
+        body = {"metrics": self.metrics, "verdict": self.verdict, "tier": self.tier}
+        if self.config_version is not None:
+            body["config_version"] = self.config_version
+        if self.admission is not None:
+            body["admission"] = self.admission
+        return body
+
+
+def _default(obj):
+    if isinstance(obj, _Fields):
+        return obj.to_dict()
+    if hasattr(obj, "item"):  # NumPy scalar
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj, indent: bool = False) -> bytes:
+    """
+    JSON bytes of reports/records, directly from the objects (no intermediate
+    dicts or model validation). Uses orjson when installed; unset fields are omitted.
+    """
+    if orjson is not None:
+        # Dataclasses go through _default too, so that unset fields are omitted either way
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATACLASS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, default=_default, option=option)
+    return json.dumps(obj, default=_default, ensure_ascii=False, indent=2 if indent else None).encode("utf-8")
@@ -0,0 +1,145 @@
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Set
+
+# Annotations a metric can need on the request Docs, and the spaCy components
+# producing them. Static vectors and tokens come from the vocab/tokenizer alone.
+ANNOTATION_COMPONENTS = {
+    "tokens": set(),
+    "vectors": set(),
+    "lemmas": {"tok2vec", "tagger", "attribute_ruler", "lemmatizer"},
+    "entities": {"tok2vec", "ner"},
+    "deps": {"tok2vec", "tagger", "attribute_ruler", "parser"},
+}
+KNOWN_COMPONENTS = set().union(*ANNOTATION_COMPONENTS.values())
+
+# Shared request Docs (see Pipeline._parse)
+DOC_NAMES = ("query_lower", "response_lower", "query", "response")
+
+
+class MetricSpec(NamedTuple):
+    """
+    A registered metric.
+    `compute(tier, query, response, context, docs)` returns the fields it adds to
+    the scores, where `tier` holds the tier's evaluators and the request's
+    EvalConfig (`tier.config`), and `docs` the parsed request Docs listed in `docs`.
+    """
+    name: str
+    compute: Callable[..., Dict[str, Any]]
+    annotations: frozenset
+    docs: frozenset
+    cost: float  # Relative cost, used to schedule expensive metrics first
+    default: bool = True  # Computed when no metrics are requested
+
+
+METRICS: Dict[str, MetricSpec] = {}
+
+
+def register_metric(name: str, annotations: Iterable[str] = (), docs: Iterable[str] = (), cost: float = 1.0,
+                    default: bool = True):
+    """
+    Decorator registering `compute` under `name`. Metrics are reported in registration order.
+
+    Args:
+        annotations: Keys of ANNOTATION_COMPONENTS the metric reads from the request Docs.
+        docs: Names in DOC_NAMES the metric needs parsed.
+        cost (float): Relative cost (the cheapest built-in metric is ~1).
+        default (bool): Part of the default metric set. Opt-in metrics (False) only
+            run when requested by name.
+    """
+    annotations = frozenset(annotations)
+    docs = frozenset(docs)
+    unknown = (annotations - set(ANNOTATION_COMPONENTS)) | (docs - set(DOC_NAMES))
+    if unknown:
+        raise ValueError(f"Unknown annotations/docs for metric '{name}': {sorted(unknown)}")
+
+    def decorator(compute):
+        METRICS[name] = MetricSpec(name, compute, annotations, docs, cost, default)
+        return compute
+    return decorator
+
+
+def resolve_metrics(names: Optional[Iterable[str]] = None) -> List[MetricSpec]:
+    """
+    Specs of the requested metrics (the default ones if `names` is None), in registration order.
+    """
+    if names is None:
+        return [spec for spec in METRICS.values() if spec.default]
+    names = set(names)
+    unknown = names - set(METRICS)
+    if unknown:
+        raise ValueError(f"Unknown metrics {sorted(unknown)}. Expected a subset of {list(METRICS)}.")
+    if not names:
+        raise ValueError("At least one metric must be requested.")
+    return [spec for name, spec in METRICS.items() if name in names]
+
+
+def disabled_components(pipe_names: List[str], specs: List[MetricSpec]) -> List[str]:
+    """
+    Components of a pipeline that none of the metrics needs. Components this
+    registry does not know about are left enabled.
+    """
+    needed: Set[str] = set()
+    for spec in specs:
+        for annotation in spec.annotations:
+            needed |= ANNOTATION_COMPONENTS[annotation]
+    return [name for name in pipe_names if name in KNOWN_COMPONENTS and name not in needed]
+
+
+def disabled_components_per_doc(pipe_names: List[str], specs: List[MetricSpec]) -> Dict[str, List[str]]:
+    """
+    For each request Doc the metrics need, the components none of the metrics
+    reading that Doc needs: the relevance and completeness Docs skip the
+    parser even when hallucination (which needs it on the response) runs.
+    """
+    return {
+        name: disabled_components(pipe_names, [spec for spec in specs if name in spec.docs])
+        for name in DOC_NAMES
+        if any(name in spec.docs for spec in specs)
+    }
+
+
+# --- Built-in metrics ---
+
+@register_metric("relevance", annotations=("lemmas", "entities", "vectors"),
+                 docs=("query_lower", "response_lower"), cost=2.0)
+def _relevance(tier, query, response, context, docs):
+    return {"relevance": tier.relevance.evaluate(
+        query, response, docs=(docs["query_lower"], docs["response_lower"]), config=tier.config
+    )}
+
+
+@register_metric("completeness", annotations=("lemmas", "entities", "vectors"),
+                 docs=("query", "response"), cost=2.0)
+def _completeness(tier, query, response, context, docs):
+    return {"completeness": tier.completeness.evaluate(
+        query, response, docs=(docs["query"], docs["response"]), config=tier.config
+    )}
+
+
+@register_metric("hallucination", annotations=("lemmas", "entities", "deps"),
+                 docs=("response",), cost=10.0)
+def _hallucination(tier, query, response, context, docs):
+    result = tier.hallucination.evaluate(response, context, doc=docs["response"], config=tier.config)
+    fields = {"hallucination": result["score"], "unsupported_claims": result["unsupported_claims"]}
+    if "unverified_claims" in result:
+        fields["unverified_claims"] = result["unverified_claims"]
+    return fields
+
+
+# Retrieval diagnostics: informational (no verdict rule), so opt-in rather than
+# charged to every request
+@register_metric("context_relevance", annotations=("lemmas", "vectors"), docs=("query",), cost=3.0, default=False)
+def _context_relevance(tier, query, response, context, docs):
+    return {"context_relevance": tier.grounding.evaluate_context_relevance(
+        query, context, doc=docs["query"], config=tier.config
+    )}
+
+
+@register_metric("groundedness", annotations=("lemmas", "entities", "vectors"), docs=("response",), cost=3.0,
+                 default=False)
+def _groundedness(tier, query, response, context, docs):
+    return {"groundedness": tier.grounding.evaluate_groundedness(response, context, doc=docs["response"])}
+
+
+@register_metric("estimated_cost_usd", cost=1.0)
+def _estimated_cost(tier, query, response, context, docs):
+    return {"estimated_cost_usd": tier.cost.estimate_request_cost(query, response, context)}
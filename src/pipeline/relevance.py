@@ -1,8 +1,9 @@
-import spacy
 from typing import Set
 
 # Load Spacy
 from .model import nlp
+from .config import DEFAULT_CONFIG, EvalConfig
+from .vectors import StaticVectors
 
 class RelevanceEvaluator:
     """
@@ -10,49 +11,46 @@ class RelevanceEvaluator:
     Precision: Intent Entities > Vector Similarity > Lemma Overlap.
     """
 
-    def __init__(self):
-        pass
+    def __init__(self, model=None, use_vectors: bool = True, vectors: StaticVectors = None):
+        """
+        Args:
+            model: Spacy pipeline to parse with (defaults to the shared en_core_web_md).
+            use_vectors (bool): Disable for models without static vectors (fast tier).
+            vectors (StaticVectors): If set, similarity is computed from the static
+                vector table of the texts instead of the parsed Docs' vectors.
+        """
+        self.nlp = model if model is not None else nlp
+        self.use_vectors = use_vectors
+        self.vectors = vectors
 
-    def _detect_intent_entities(self, doc) -> Set[str]:
+    def _detect_intent_entities(self, doc, config: EvalConfig = DEFAULT_CONFIG) -> Set[str]:
         """
-        Detects expected Named Entity labels based on query intent.
+        Detects expected Named Entity labels based on query intent
+        (e.g. cost/price -> MONEY, see the config's relevance intents).
         """
-        text = doc.text.lower()
-        expected = set()
-        
-        # Cost/Price -> MONEY
-        if any(w in text for w in ["cost", "price", "how much", "rate", "fee"]):
-            expected.add("MONEY")
-            
-        # Time/Date -> DATE, TIME
-        if any(w in text for w in ["when", "time", "date", "long", "year", "month"]):
-            expected.add("DATE")
-            expected.add("TIME")
-            
-        # Location -> GPE, LOC
-        if any(w in text for w in ["where", "location", "located", "place"]):
-            expected.add("GPE")
-            expected.add("LOC")
-            
-        # Person/Org -> PERSON, ORG
-        if any(w in text for w in ["who", "company", "organization"]):
-            expected.add("PERSON")
-            expected.add("ORG")
-            
-        return expected
+        return config.detect_intents(doc.text, config.relevance_intents)
 
-    def evaluate(self, query: str, response: str) -> float:
+    def evaluate(self, query: str, response: str, docs: tuple = None,
+                 config: EvalConfig = DEFAULT_CONFIG) -> float:
         """
         Computes relevance using Intent Entities & Vector Cosine Similarity.
+
+        Args:
+            docs (tuple): Optional pre-parsed (query, response) Docs of the
+                *lowercased* texts, as produced by Pipeline's shared parse.
+            config (EvalConfig): Intent keyword tables to use.
         """
         if not query or not response:
             return 0.0
 
-        q_doc = nlp(query.lower())
-        r_doc = nlp(response.lower())
+        if docs is not None:
+            q_doc, r_doc = docs
+        else:
+            q_doc = self.nlp(query.lower())
+            r_doc = self.nlp(response.lower())
 
         # 1. Intent-Entity Check (Gold Standard)
-        expected_entities = self._detect_intent_entities(q_doc)
+        expected_entities = self._detect_intent_entities(q_doc, config)
         found_entities = {ent.label_ for ent in r_doc.ents}
         
         intent_score = 0.0
@@ -65,7 +63,10 @@ class RelevanceEvaluator:
         # Catches: "Sad" <-> "Unhappy"
         # Spacy .similarity is Cosine Similarity of averaged word vectors
         vector_sim = 0.0
-        if q_doc.vector_norm and r_doc.vector_norm:
+        if self.use_vectors and self.vectors is not None:
+            if self.vectors.norm(q_doc.text) and self.vectors.norm(r_doc.text):
+                vector_sim = self.vectors.similarity(q_doc.text, r_doc.text)
+        elif self.use_vectors and q_doc.vector_norm and r_doc.vector_norm:
             vector_sim = q_doc.similarity(r_doc)
             
         # 3. Lemma Jaccard (Bronze Standard - Fallback)
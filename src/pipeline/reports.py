@@ -0,0 +1,147 @@
+import abc
+import csv
+import json
+from typing import Any, Dict, List, Optional
+
+from .registry import METRICS
+
+# One row per evaluation. The schema is fixed (derived from the metric registry),
+# so every row group / file of a bulk run has the same columns.
+METRIC_COLUMNS = list(METRICS) + ["latency_ms"]
+TIMING_STAGES = ["parse"] + list(METRICS)
+COLUMNS = (
+    ["id", "tier", "config_version", "verdict", "reasons", "unsupported_claims"]
+    + METRIC_COLUMNS
+    + [f"{stage}_ms" for stage in TIMING_STAGES]
+)
+LIST_COLUMNS = ("reasons", "unsupported_claims")
+
+FORMATS = ("json", "csv", "parquet")
+
+
+def flatten_report(report: Dict[str, Any], record_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Flattens a Pipeline.run report into a row of COLUMNS.
+    Metrics that were not computed are None; list columns hold plain strings.
+    """
+    metrics = report["metrics"]
+    timings = report.get("timings_ms", {})
+    row = {
+        "id": None if record_id is None else str(record_id),
+        "tier": report.get("tier"),
+        "config_version": report.get("config_version"),
+        "verdict": report["verdict"]["status"],
+        "reasons": list(report["verdict"]["reasons"]),
+        "unsupported_claims": [claim["text"] for claim in report.get("unsupported_claims", [])],
+    }
+    for name in METRIC_COLUMNS:
+        row[name] = metrics.get(name)
+    for stage in TIMING_STAGES:
+        row[f"{stage}_ms"] = timings.get(stage)
+    return row
+
+
+class ReportWriter(abc.ABC):
+    """
+    Buffers flattened rows and writes them in row groups of `row_group_size`.
+    Use as a context manager (or call close()) so the last partial group is flushed.
+    """
+
+    def __init__(self, path: str, row_group_size: int = 4096):
+        self.path = path
+        self.row_group_size = row_group_size
+        self.rows_written = 0
+        self._buffer: List[Dict[str, Any]] = []
+
+    def write(self, report: Dict[str, Any], record_id: Optional[str] = None) -> None:
+        self._buffer.append(flatten_report(report, record_id))
+        if len(self._buffer) >= self.row_group_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._write_rows(self._buffer)
+            self.rows_written += len(self._buffer)
+            self._buffer = []
+
+    @abc.abstractmethod
+    def _write_rows(self, rows: List[Dict[str, Any]]) -> None:
+        """Writes one row group."""
+
+    def _close(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.flush()
+        self._close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class CsvReportWriter(ReportWriter):
+    """
+    Compact CSV. List columns are JSON-encoded so that reasons containing
+    separators round-trip.
+    """
+
+    def __init__(self, path: str, row_group_size: int = 4096):
+        super().__init__(path, row_group_size)
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._file, fieldnames=COLUMNS)
+        self._writer.writeheader()
+
+    def _write_rows(self, rows: List[Dict[str, Any]]) -> None:
+        self._writer.writerows(
+            {**row, **{column: json.dumps(row[column], ensure_ascii=False) for column in LIST_COLUMNS}}
+            for row in rows
+        )
+
+    def _close(self) -> None:
+        self._file.close()
+
+
+class ParquetReportWriter(ReportWriter):
+    """
+    Parquet via pyarrow (optional dependency), one row group per flush.
+    List columns are native list<string> columns.
+    """
+
+    def __init__(self, path: str, row_group_size: int = 4096):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet reports require pyarrow (pip install pyarrow); use the 'csv' format otherwise.") from e
+
+        super().__init__(path, row_group_size)
+        self._pa = pa
+        fields = []
+        for column in COLUMNS:
+            if column in LIST_COLUMNS:
+                fields.append(pa.field(column, pa.list_(pa.string())))
+            elif column in ("id", "tier", "config_version", "verdict"):
+                fields.append(pa.field(column, pa.string()))
+            else:
+                fields.append(pa.field(column, pa.float64()))
+        self._schema = pa.schema(fields)
+        self._writer = pq.ParquetWriter(path, self._schema, compression="zstd")
+
+    def _write_rows(self, rows: List[Dict[str, Any]]) -> None:
+        table = self._pa.Table.from_pylist(rows, schema=self._schema)
+        self._writer.write_table(table, row_group_size=len(rows))
+
+    def _close(self) -> None:
+        self._writer.close()
+
+
+def open_report_writer(path: str, fmt: str, row_group_size: int = 4096) -> ReportWriter:
+    """Columnar writer for `fmt` ('csv' or 'parquet')."""
+    if fmt == "csv":
+        return CsvReportWriter(path, row_group_size)
+    if fmt == "parquet":
+        return ParquetReportWriter(path, row_group_size)
+    raise ValueError(f"Unknown report format '{fmt}'. Expected 'csv' or 'parquet'.")
@@ -0,0 +1,244 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .datasets import iter_turn_pairs
+
+VERDICT_ORDER = ("PASS", "WARN", "FAIL")
+
+# Default bounds of the session store
+MAX_SESSIONS = 1024
+SESSION_IDLE_TTL_S = 30 * 60
+SESSION_WINDOW = 8
+
+
+class StaleTurn(ValueError):
+    """Raised when a turn is appended that is not after the last evaluated one."""
+
+
+class Session:
+    """
+    Evaluation state of one conversation: its context, the reports of the last
+    `window` turn pairs and running sums, so that appending a turn pair costs the
+    same whatever the conversation length.
+    """
+
+    def __init__(self, chat_id, context: List[str], window: int = SESSION_WINDOW):
+        self.chat_id = chat_id
+        self.context = list(context)
+        self.last_turn = 0
+        self.turns_evaluated = 0
+        self.last_access = 0.0
+        # Serializes appends to the same conversation
+        self.lock = threading.Lock()
+
+        self._window = deque(maxlen=window)
+        self._sums: Dict[str, float] = {}
+        self._counts: Dict[str, int] = {}
+        self._window_sums: Dict[str, float] = {}
+        self._window_counts: Dict[str, int] = {}
+        self._verdicts = {status: 0 for status in VERDICT_ORDER}
+
+    def record(self, turn: int, report: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Adds a turn report to the rolling metrics. Returns the compact turn entry.
+        """
+        entry = {
+            "turn": turn,
+            "metrics": dict(report["metrics"]),
+            "verdict": report["verdict"]["status"],
+            "reasons": list(report["verdict"]["reasons"]),
+        }
+        # 1. The oldest turn leaves the window: subtract it
+        if len(self._window) == self._window.maxlen:
+            for name, value in self._window[0]["metrics"].items():
+                self._window_sums[name] -= value
+                self._window_counts[name] -= 1
+        self._window.append(entry)
+
+        # 2. Add the new turn to the conversation and window sums
+        for name, value in entry["metrics"].items():
+            self._sums[name] = self._sums.get(name, 0.0) + value
+            self._counts[name] = self._counts.get(name, 0) + 1
+            self._window_sums[name] = self._window_sums.get(name, 0.0) + value
+            self._window_counts[name] = self._window_counts.get(name, 0) + 1
+        self._verdicts[entry["verdict"]] = self._verdicts.get(entry["verdict"], 0) + 1
+
+        self.last_turn = turn
+        self.turns_evaluated += 1
+        return entry
+
+    def summary(self) -> Dict[str, Any]:
+        """Conversation-level metrics: means over all turns and over the window."""
+        worst = max((status for status, n in self._verdicts.items() if n), key=VERDICT_ORDER.index, default=None)
+        window_verdicts = [entry["verdict"] for entry in self._window]
+        return {
+            "chat_id": self.chat_id,
+            "turns_evaluated": self.turns_evaluated,
+            "last_turn": self.last_turn,
+            "status": worst,
+            "verdicts": dict(self._verdicts),
+            "mean": {name: round(self._sums[name] / n, 4) for name, n in self._counts.items() if n},
+            "total_cost_usd": round(self._sums.get("estimated_cost_usd", 0.0), 6),
+            "window": {
+                "turns": [entry["turn"] for entry in self._window],
+                "mean": {name: round(self._window_sums[name] / n, 4) for name, n in self._window_counts.items() if n},
+                "status": max(window_verdicts, key=VERDICT_ORDER.index, default=None),
+            },
+        }
+
+
+class SessionStore:
+    """
+    Bounded, thread-safe store of Sessions keyed by chat_id (as a string, so the
+    numeric ids of exports and URL path ids match): least recently used sessions
+    are evicted beyond `max_sessions`, idle ones after `idle_ttl_s`.
+    """
+
+    def __init__(self, max_sessions: int = MAX_SESSIONS, idle_ttl_s: float = SESSION_IDLE_TTL_S,
+                 window: int = SESSION_WINDOW, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            max_sessions (int): Number of conversations kept.
+            idle_ttl_s (float): Seconds without an access after which a session expires.
+            window (int): Turn pairs in the rolling window of each session.
+            clock: Time source (monotonic seconds), injectable for tests.
+        """
+        self.max_sessions = max_sessions
+        self.idle_ttl_s = idle_ttl_s
+        self.window = window
+        self.clock = clock
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float) -> None:
+        # Least recently used first: stop at the first live session
+        while self._sessions:
+            chat_id, session = next(iter(self._sessions.items()))
+            if now - session.last_access <= self.idle_ttl_s:
+                break
+            del self._sessions[chat_id]
+
+    def get(self, chat_id) -> Optional[Session]:
+        chat_id = str(chat_id)
+        with self._lock:
+            now = self.clock()
+            self._expire(now)
+            session = self._sessions.get(chat_id)
+            if session is not None:
+                session.last_access = now
+                self._sessions.move_to_end(chat_id)
+            return session
+
+    def get_or_create(self, chat_id, context: Optional[List[str]] = None) -> Session:
+        """The live session of `chat_id`, or a new one over `context`."""
+        chat_id = str(chat_id)
+        with self._lock:
+            now = self.clock()
+            self._expire(now)
+            session = self._sessions.get(chat_id)
+            if session is None:
+                session = Session(chat_id, context or [], window=self.window)
+                self._sessions[chat_id] = session
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+            session.last_access = now
+            self._sessions.move_to_end(chat_id)
+            return session
+
+    def delete(self, chat_id) -> bool:
+        chat_id = str(chat_id)
+        with self._lock:
+            return self._sessions.pop(chat_id, None) is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._expire(self.clock())
+            return len(self._sessions)
+
+
+class SessionEvaluator:
+    """
+    Incremental evaluation of growing conversations: each new User/AI turn pair
+    is evaluated alone against the session's context, and the conversation-level
+    metrics are updated from running sums instead of re-scoring the history.
+    Parsed context chunks are shared through the pipeline's caches.
+    """
+
+    def __init__(self, pipeline, store: Optional[SessionStore] = None):
+        """
+        Args:
+            pipeline: Pipeline used for each turn pair.
+            store (SessionStore): Where sessions live. Defaults to a new store.
+        """
+        self.pipeline = pipeline
+        self.store = store if store is not None else SessionStore()
+
+    def append(self, chat_id, user_message: str, ai_message: str, turn: Optional[int] = None,
+               context: Optional[List[str]] = None, metrics: Optional[Iterable[str]] = None,
+               profile: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Evaluates one turn pair and adds it to the session of `chat_id` (created if needed).
+
+        Args:
+            turn (int): Number of the AI turn. Defaults to the one after the last evaluated turn.
+            context (list): Replaces the session's context from this turn on.
+        Returns: {"turn": entry, "report": full report, "conversation": summary}
+        Raises StaleTurn if `turn` is not after the last evaluated turn.
+        """
+        session = self.store.get_or_create(chat_id, context)
+        with session.lock:
+            return self._append(session, user_message, ai_message, turn, context, metrics, profile)
+
+    def _append(self, session: Session, user_message, ai_message, turn, context, metrics, profile) -> Dict[str, Any]:
+        if turn is None:
+            turn = session.last_turn + 1
+        elif turn <= session.last_turn:
+            raise StaleTurn(f"Turn {turn} of chat {session.chat_id} is not after the last evaluated turn {session.last_turn}.")
+        if context is not None:
+            session.context = list(context)
+
+        report = self.pipeline.run(user_message, ai_message, session.context, metrics, profile)
+        entry = session.record(turn, report)
+        return {"turn": entry, "report": report, "conversation": session.summary()}
+
+    def pending(self, conversation: dict) -> List[Tuple[int, str, str]]:
+        """
+        The (turn, user message, AI message) pairs of a `conversation_turns` export
+        that a sync would evaluate now: those after the session's last evaluated
+        turn, or all of them if the chat has no live session.
+        """
+        session = self.store.get(conversation.get("chat_id"))
+        last_turn = session.last_turn if session is not None else 0
+        return [pair for pair in iter_turn_pairs(conversation) if pair[0] > last_turn]
+
+    def sync(self, conversation: dict, context: Optional[List[str]] = None,
+             metrics: Optional[Iterable[str]] = None, profile: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Brings the session of a `conversation_turns` export (keyed by its chat_id) up
+        to date: only turn pairs after the last evaluated turn are evaluated, so
+        re-sending the whole history after every new turn costs one pair.
+        Returns: {"turns": [new turn entries], "conversation": summary}
+        """
+        chat_id = conversation.get("chat_id")
+        if chat_id is None:
+            raise ValueError("Conversation has no chat_id.")
+        session = self.store.get_or_create(chat_id, context)
+        with session.lock:
+            if context is not None:
+                session.context = list(context)
+            new_turns = []
+            for turn, user_message, ai_message in iter_turn_pairs(conversation):
+                if turn <= session.last_turn:
+                    continue
+                result = self._append(session, user_message, ai_message, turn, None, metrics, profile)
+                new_turns.append(result["turn"])
+            return {"turns": new_turns, "conversation": session.summary()}
+
+    def summary(self, chat_id) -> Optional[Dict[str, Any]]:
+        session = self.store.get(chat_id)
+        if session is None:
+            return None
+        with session.lock:
+            return session.summary()
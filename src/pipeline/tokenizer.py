@@ -0,0 +1,141 @@
+import base64
+import functools
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# cl100k_base ranks file shipped with the package, used unless
+# $EVAL_TOKENIZER_VOCAB points at another one
+DEFAULT_VOCAB_PATH = os.path.join(os.path.dirname(__file__), "data", "cl100k_base.tiktoken")
+
+# cl100k pre-tokenization split, expressed with the stdlib `re`: contractions,
+# words with an optional leading symbol, numbers in groups of up to 3 digits,
+# punctuation runs, newlines and other whitespace.
+PRETOKENIZE_PATTERN = re.compile(
+    r"""(?i:'s|'t|'re|'ve|'m|'ll|'d)|(?:[^\r\n\w]|_)?[^\W\d_]+|\d{1,3}| ?(?:[^\s\w]|_)+[\r\n]*|\s*[\r\n]|\s+(?!\S)|\s+"""
+)
+
+
+class HeuristicTokenizer:
+    """
+    Last-resort fallback when no vocab file can be read: 4 chars ~= 1 token.
+    """
+
+    name = "chars/4"
+
+    def count(self, text: str) -> float:
+        return len(text) / 4
+
+
+class BPETokenizer:
+    """
+    Offline byte-level BPE token counter.
+    Loads a tiktoken-style ranks file (one `<base64 token> <rank>` per line),
+    so no network access or tokenizer package is needed at runtime.
+    """
+
+    def __init__(self, ranks: Dict[bytes, int], name: str = "bpe", piece_cache_size: int = 65536):
+        self.ranks = ranks
+        self.name = name
+        self.piece_cache_size = piece_cache_size
+        # Words repeat heavily across requests: memoize token counts per pre-token piece
+        self._piece_cache = {}
+
+    @classmethod
+    def from_file(cls, path: str) -> "BPETokenizer":
+        ranks = {}
+        with open(path, "rb") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                token, rank = line.split()
+                ranks[base64.b64decode(token)] = int(rank)
+        return cls(ranks, name=os.path.basename(path))
+
+    def _count_piece(self, piece: bytes) -> int:
+        if piece in self.ranks:
+            return 1
+
+        # Standard BPE: repeatedly merge the adjacent pair with the lowest rank
+        parts = [piece[i:i + 1] for i in range(len(piece))]
+        while len(parts) > 1:
+            best_rank = None
+            best_index = None
+            for i in range(len(parts) - 1):
+                rank = self.ranks.get(parts[i] + parts[i + 1])
+                if rank is not None and (best_rank is None or rank < best_rank):
+                    best_rank = rank
+                    best_index = i
+            if best_index is None:
+                break
+            parts[best_index:best_index + 2] = [parts[best_index] + parts[best_index + 1]]
+        return len(parts)
+
+    def count(self, text: str) -> int:
+        total = 0
+        cache = self._piece_cache
+        for match in PRETOKENIZE_PATTERN.finditer(text):
+            piece = match.group()
+            n = cache.get(piece)
+            if n is None:
+                n = self._count_piece(piece.encode("utf-8"))
+                if len(cache) >= self.piece_cache_size:
+                    cache.clear()
+                cache[piece] = n
+            total += n
+        return total
+
+
+class CachedTokenCounter:
+    """
+    Memoizes token counts per text (LRU), so context chunks that appear in
+    many requests are tokenized once.
+    """
+
+    def __init__(self, tokenizer, max_items: int = 8192):
+        self.tokenizer = tokenizer
+        self.max_items = max_items
+        self._counts = OrderedDict()
+        self._lock = threading.Lock()
+
+    def count(self, text: str) -> float:
+        with self._lock:
+            n = self._counts.get(text)
+            if n is not None:
+                self._counts.move_to_end(text)
+                return n
+        n = self.tokenizer.count(text)
+        with self._lock:
+            self._counts[text] = n
+            if len(self._counts) > self.max_items:
+                self._counts.popitem(last=False)
+        return n
+
+
+@functools.lru_cache(maxsize=None)
+def _load_bpe(path: str) -> BPETokenizer:
+    # Parsing the ~100k-entry cl100k file takes a noticeable fraction of a second:
+    # read each vocab once per process and share it between evaluators
+    return BPETokenizer.from_file(path)
+
+
+def load_tokenizer(vocab_path: Optional[str] = None):
+    """
+    Returns a BPETokenizer for `vocab_path`, else $EVAL_TOKENIZER_VOCAB, else the
+    shipped cl100k_base vocab. Everything is read from local files, so counting
+    never touches the network; the chars/4 heuristic is only used if the shipped
+    file is missing.
+    """
+    vocab_path = vocab_path or os.environ.get("EVAL_TOKENIZER_VOCAB")
+    if vocab_path:
+        return _load_bpe(os.path.abspath(vocab_path))
+    if os.path.exists(DEFAULT_VOCAB_PATH):
+        return _load_bpe(DEFAULT_VOCAB_PATH)
+    logger.warning("No tokenizer vocab at %s and $EVAL_TOKENIZER_VOCAB is unset: counting chars/4 tokens", DEFAULT_VOCAB_PATH)
+    return HeuristicTokenizer()
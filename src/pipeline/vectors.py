@@ -0,0 +1,191 @@
+import json
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class CompactVectors:
+    """
+    Reduced copy of a static vector table for the similarity paths: rows
+    projected onto their top `dim` principal axes (uncentered, so that dot
+    products, hence cosines, are preserved as well as possible) and/or
+    int8-quantized with one float32 scale per row.
+
+    Built offline from the model's table (see benchmarks/compact_vectors.py),
+    saved as a .npz file and looked up by token orth ids, like vocab.vectors.
+    """
+
+    def __init__(self, keys: np.ndarray, rows: np.ndarray, data: np.ndarray,
+                 scales: Optional[np.ndarray] = None, meta: Optional[dict] = None):
+        """
+        Args:
+            keys (np.ndarray): Sorted uint64 orth ids.
+            rows (np.ndarray): Row of each key in `data`.
+            data (np.ndarray): (n_rows, width) float32, or int8 if `scales` is set.
+            scales (np.ndarray): Per-row dequantization scales of int8 data.
+            meta (dict): Provenance (source table, original width, dim, quantized).
+        """
+        self.keys = keys
+        self.rows = rows
+        self.data = data
+        self.scales = scales
+        self.meta = meta or {}
+
+    @classmethod
+    def build(cls, vectors, dim: Optional[int] = None, quantize: bool = True, source: str = "") -> "CompactVectors":
+        """
+        Compacts a spaCy Vectors table.
+
+        Args:
+            vectors: The model's vocab.vectors.
+            dim (int): Number of principal components kept. None keeps the full width.
+            quantize (bool): Store rows as int8 (4x smaller) instead of float32.
+            source (str): Name of the model the table comes from, kept in `meta`.
+        """
+        data = np.asarray(vectors.data, dtype=np.float32)
+        width = data.shape[1]
+        if dim is not None and dim < width:
+            # Top eigenvectors of X^T X: the rank-`dim` projection closest to X X^T
+            eigenvalues, eigenvectors = np.linalg.eigh(data.T.astype(np.float64) @ data)
+            projection = eigenvectors[:, np.argsort(eigenvalues)[::-1][:dim]].astype(np.float32)
+            data = data @ projection
+
+        scales = None
+        if quantize:
+            scales = np.abs(data).max(axis=1) / 127.0
+            scales[scales == 0] = 1.0
+            data = np.rint(data / scales[:, None]).astype(np.int8)
+            scales = scales.astype(np.float32)
+
+        key2row = vectors.key2row
+        keys = np.fromiter(key2row.keys(), dtype=np.uint64, count=len(key2row))
+        rows = np.fromiter(key2row.values(), dtype=np.int32, count=len(key2row))
+        order = np.argsort(keys)
+        meta = {"source": source, "width": width, "dim": int(data.shape[1]), "quantized": quantize}
+        return cls(keys[order], rows[order], np.ascontiguousarray(data), scales, meta)
+
+    def save(self, path: str) -> None:
+        arrays = {"keys": self.keys, "rows": self.rows, "data": self.data,
+                  "meta": np.frombuffer(json.dumps(self.meta).encode("utf-8"), dtype=np.uint8)}
+        if self.scales is not None:
+            arrays["scales"] = self.scales
+        with open(path, "wb") as f:
+            np.savez(f, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "CompactVectors":
+        with np.load(path) as npz:
+            scales = npz["scales"] if "scales" in npz.files else None
+            return cls(npz["keys"], npz["rows"], npz["data"], scales, json.loads(npz["meta"].tobytes()))
+
+    @property
+    def width(self) -> int:
+        return self.data.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.nbytes for a in (self.keys, self.rows, self.data) if a is not None) + (
+            self.scales.nbytes if self.scales is not None else 0)
+
+    def find(self, orths: np.ndarray) -> np.ndarray:
+        """Rows of the given orth ids (-1 for ids without a vector)."""
+        orths = np.asarray(orths, dtype=np.uint64)
+        positions = np.minimum(np.searchsorted(self.keys, orths), len(self.keys) - 1)
+        return np.where(self.keys[positions] == orths, self.rows[positions], -1)
+
+    def sum_rows(self, rows: np.ndarray) -> np.ndarray:
+        """Sum of the (dequantized) rows, as float32."""
+        if self.scales is None:
+            return self.data[rows].sum(axis=0, dtype=np.float32)
+        # Dequantize and sum in one product: scales . int8 rows
+        return self.scales[rows] @ self.data[rows].astype(np.float32)
+
+
+
+class StaticVectors:
+    """
+    Mean static word vectors computed from tokenization alone: the token `orth`
+    ids are looked up in the vector table with one NumPy gather, so no tagger,
+    parser or NER is needed. Reproduces Doc.vector / Doc.similarity (same
+    tokenizer, same table; float32 summation order may differ in the last ulp).
+
+    Vectors of short strings (typically queries, which repeat) are cached.
+    With a CompactVectors `table`, vectors come from it instead of the model's
+    table (smaller cached vectors, scores within the table's approximation).
+    """
+
+    def __init__(self, model, max_items: int = 4096, max_cache_chars: int = 512,
+                 table: Optional[CompactVectors] = None):
+        """
+        Args:
+            model: Spacy pipeline (or LazyNLP) with static vectors. Only its
+                tokenizer and vector table are used, loaded on first use.
+            max_items (int): Number of string vectors kept in the LRU cache.
+            max_cache_chars (int): Longer strings (e.g. responses) are not cached.
+            table (CompactVectors): Reduced table used in place of the model's.
+        """
+        self.nlp = model
+        self.table = table
+        self.max_items = max_items
+        self.max_cache_chars = max_cache_chars
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def mean_vector(self, orths: np.ndarray) -> Tuple[np.ndarray, float]:
+        """(mean vector, its norm) of the tokens with the given orth ids."""
+        # Tokens without a vector contribute zeros but still count in the mean, as in Doc.vector
+        if self.table is not None:
+            if not len(orths):
+                vector = np.zeros((self.table.width,), dtype=np.float32)
+            else:
+                rows = self.table.find(orths)
+                vector = self.table.sum_rows(rows[rows >= 0]) / len(orths)
+        else:
+            vectors = self.nlp.vocab.vectors
+            if not len(orths):
+                vector = np.zeros((vectors.shape[1],), dtype=np.float32)
+            else:
+                rows = vectors.find(keys=orths)
+                vector = vectors.data[rows[rows >= 0]].sum(axis=0, dtype=np.float32) / len(orths)
+        return vector, float(np.sqrt((vector ** 2).sum()))
+
+    def _compute(self, text: str) -> Tuple[np.ndarray, float, bytes]:
+        orths = self.nlp.make_doc(text).to_array("ORTH")
+        vector, norm = self.mean_vector(orths)
+        return vector, norm, orths.tobytes()
+
+    def vector(self, text: str) -> Tuple[np.ndarray, float, bytes]:
+        """
+        (mean vector, its norm, token orth ids as bytes) of `text`.
+        """
+        if len(text) > self.max_cache_chars:
+            return self._compute(text)
+        with self._lock:
+            entry = self._cache.get(text)
+            if entry is not None:
+                self._cache.move_to_end(text)
+                return entry
+        entry = self._compute(text)
+        with self._lock:
+            self._cache[text] = entry
+            while len(self._cache) > self.max_items:
+                self._cache.popitem(last=False)
+        return entry
+
+    def norm(self, text: str) -> float:
+        return self.vector(text)[1]
+
+    def similarity(self, a: str, b: str) -> float:
+        """
+        Cosine similarity of the mean vectors, with Doc.similarity's special cases:
+        identical token sequences score 1.0, a zero vector on either side scores 0.0.
+        """
+        a_vector, a_norm, a_orths = self.vector(a)
+        b_vector, b_norm, b_orths = self.vector(b)
+        if a_orths == b_orths:
+            return 1.0
+        if a_norm == 0 or b_norm == 0:
+            return 0.0
+        return float(np.dot(a_vector, b_vector) / (a_norm * b_norm))
@@ -0,0 +1,62 @@
+import os
+import sys
+import unittest
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pipeline.admission import AdmissionController, AdmissionRejected, _HeuristicCounter, degraded_context
+
+class TestAdmission(unittest.TestCase):
+    def setUp(self):
+        # chars/4 estimate: 400 chars of context ~ 100 tokens (+16 per chunk)
+        self.controller = AdmissionController(
+            max_request_bytes=10_000, max_request_cost=1_000, degrade_cost=300, max_inflight_cost=600,
+            degraded_context_cost=50,
+        )
+
+    def test_small_request_admitted_full(self):
+        with self.controller.admitted("q" * 40, "r" * 40, ["c" * 400]) as admission:
+            self.assertFalse(admission.degraded)
+            self.assertEqual(self.controller.inflight_requests, 1)
+        self.assertEqual(self.controller.inflight_requests, 0)
+        self.assertEqual(self.controller.inflight_cost, 0.0)
+
+    def test_expensive_request_degraded(self):
+        admission = self.controller.admit("q", "r", ["c" * 400] * 5)  # ~580
+        self.assertTrue(admission.degraded)
+        # Charged for the context the degraded profile reads: the first chunk only
+        self.assertAlmostEqual(admission.cost, self.controller.estimate_cost("q", "r", ["c" * 400]))
+
+    def test_degraded_context_keeps_leading_chunks_within_budget(self):
+        counter = _HeuristicCounter()
+        context = ["a" * 100, "b" * 100, "c" * 100]  # 41 each
+        self.assertEqual(degraded_context(context, counter, max_cost=90), context[:2])
+        self.assertEqual(degraded_context(context, counter, max_cost=1_000), context)
+        # The first chunk is kept even over budget; later ones never skip ahead
+        self.assertEqual(degraded_context(["a" * 400, "b"], counter, max_cost=50), ["a" * 400])
+        self.assertEqual(degraded_context([], counter), [])
+
+    def test_oversized_requests_rejected_413(self):
+        for context in (["c" * 20_000], ["c" * 3_000] * 2):  # too many bytes / too expensive
+            with self.assertRaises(AdmissionRejected) as raised:
+                self.controller.admit("q", "r", context)
+            self.assertEqual(raised.exception.status_code, 413)
+
+    def test_global_budget_degrades_then_sheds(self):
+        first = self.controller.admit("q", "r", ["c" * 1000])   # ~266
+        second = self.controller.admit("q", "r", ["c" * 1000])  # ~266, still fits the 600 budget
+        self.assertFalse(second.degraded)
+        third = self.controller.admit("q", "r", ["c" * 100] * 4)  # ~165 > ~67 left: degraded to one chunk, ~41
+        self.assertTrue(third.degraded)
+        with self.assertRaises(AdmissionRejected) as raised:      # one chunk: degraded (~266) does not fit either
+            self.controller.admit("q", "r", ["c" * 1000])
+        self.assertEqual(raised.exception.status_code, 503)
+        self.assertEqual(raised.exception.retry_after, 1)
+
+        for admission in (first, second, third):
+            self.controller.release(admission)
+        self.assertFalse(self.controller.admit("q", "r", ["c" * 1000]).degraded)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,10 @@
 from fastapi.testclient import TestClient
-from src.api import app
+from starlette.requests import ClientDisconnect
+from src.api import app, _AdmittedStreamingResponse
+from src.pipeline.admission import AdmissionController
+import asyncio
 import json
+import pytest
 
 client = TestClient(app)
 
@@ -42,3 +46,98 @@ def test_empty_input():
     }
     response = client.post("/evaluate", json=payload)
     assert response.status_code == 400
+
+def test_stream_reports_invalid_lines():
+    body = "\n".join([
+        json.dumps({"id": "a", "query": "", "response": "", "context": []}),
+        "not json",
+    ])
+    response = client.post("/evaluate/stream", content=body, headers={"Content-Type": "application/x-ndjson"})
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["line"] for line in lines] == [1, 2]
+    assert lines[0]["id"] == "a"
+    assert all("error" in line for line in lines)
+
+def test_stream_lines_carry_the_public_report(monkeypatch):
+    import src.api as api
+    from src.pipeline.records import EvalReport, UnsupportedClaim, Verdict
+
+    class ReportPipeline:
+        def run(self, query, response, context, metrics=None, profile=None):
+            return EvalReport(
+                metrics={"relevance": 1.0}, verdict=Verdict(status="PASS", reasons=[]), tier="full",
+                unsupported_claims=[UnsupportedClaim(type="numeric", text="$5", reason="not in context")],
+                timings_ms={"parse_ms": 1.0}, config_version="v1",
+            )
+
+    monkeypatch.setattr(api, "_pipeline", ReportPipeline())
+    monkeypatch.setattr(api, "_admission", AdmissionController())
+    body = json.dumps({"id": "a", "query": "q", "response": "r", "context": ["c"]})
+    response = client.post("/evaluate/stream", content=body, headers={"Content-Type": "application/x-ndjson"})
+    assert response.status_code == 200
+    line = json.loads(response.text)
+    assert set(line) == {"line", "id", "metrics", "verdict", "tier", "config_version"}
+
+def test_unknown_session():
+    assert client.get("/sessions/unknown-chat").status_code == 404
+    assert client.delete("/sessions/unknown-chat").status_code == 404
+
+def test_sync_requires_chat_id():
+    response = client.post("/sessions/sync", json={"conversation": {"conversation_turns": []}})
+    assert response.status_code == 400
+
+def test_events_rejects_empty_input():
+    response = client.post("/evaluate/events", json={"query": "", "response": "", "context": []})
+    assert response.status_code == 400
+
+def test_events_ticket_released_on_early_disconnect():
+    admission = AdmissionController()
+    ticket = admission.admit("query", "response", ["context"])
+    started = []
+
+    async def body():
+        started.append(True)
+        yield b"never sent"
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        raise OSError("client went away")
+
+    response = _AdmittedStreamingResponse(body(), admission, ticket, media_type="text/event-stream")
+    with pytest.raises(ClientDisconnect):
+        asyncio.run(response({"type": "http", "asgi": {"spec_version": "2.4"}}, receive, send))
+    assert not started
+    assert admission.inflight_requests == 0
+    assert admission.inflight_cost == 0.0
+
+class _ConstantPipeline:
+    def run(self, query, response, context, metrics=None, profile=None):
+        return {"metrics": {"relevance": 1.0}, "verdict": {"status": "PASS", "reasons": []}}
+
+def test_incremental_sync_of_long_chat_is_admitted(monkeypatch):
+    import src.api as api
+    from src.pipeline.session import SessionEvaluator
+
+    def export(n_pairs):
+        turns = []
+        for k in range(n_pairs):
+            turns.append({"turn": 2 * k + 1, "role": "User", "message": "question " * 20})
+            turns.append({"turn": 2 * k + 2, "role": "AI/Chatbot", "message": "answer " * 40})
+        return {"chat_id": "long-chat", "conversation_turns": turns}
+
+    sessions = SessionEvaluator(_ConstantPipeline())
+    sessions.sync(export(200), context=["chunk"])
+    # A single pair fits, the whole 200-pair export (~50k chars/4 tokens) does not
+    admission = AdmissionController(max_request_cost=1_000, degrade_cost=1_000, max_inflight_cost=1_000)
+    monkeypatch.setattr(api, "_pipeline", object())
+    monkeypatch.setattr(api, "_admission", admission)
+    monkeypatch.setattr(api, "_sessions", sessions)
+
+    response = client.post("/sessions/sync", json={"conversation": export(201)})
+    assert response.status_code == 200
+    assert [turn["turn"] for turn in response.json()["turns"]] == [402]
+    assert response.json()["conversation"]["turns_evaluated"] == 201
+    assert admission.inflight_requests == 0
@@ -0,0 +1,107 @@
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pipeline import batch
+from pipeline.records import EvalReport, Verdict
+
+SAMPLES_DIR = os.path.join(os.path.dirname(__file__), '..', 'samples')
+
+class FakePipeline:
+    def run(self, query, response, context, metrics=None):
+        if response == "boom":
+            raise RuntimeError("boom")
+        # Latency and timings differ on every run, like the real pipeline's
+        elapsed_ms = time.perf_counter() * 1000
+        return EvalReport(
+            metrics={"relevance": len(response) / 100, "latency_ms": elapsed_ms},
+            verdict=Verdict(status="PASS", reasons=[]), tier="full", unsupported_claims=[],
+            timings_ms={"parse": elapsed_ms}, config_version="v1",
+        )
+
+def fake_init_worker(pipeline_kwargs, metrics):
+    batch._WORKER_PIPELINE = FakePipeline()
+    batch._WORKER_METRICS = metrics
+
+class TestBatchRunner(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        original = batch._init_worker
+        batch._init_worker = fake_init_worker
+        self.addCleanup(setattr, batch, "_init_worker", original)
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def test_manifest_expands_conversation_turns(self):
+        manifest = self.path("manifest.json")
+        with open(manifest, "w") as f:
+            json.dump([{"conv": os.path.abspath(os.path.join(SAMPLES_DIR, "sample-chat-conversation-02.json")),
+                        "ctx": os.path.abspath(os.path.join(SAMPLES_DIR, "sample_context_vectors-02.json")),
+                        "id": "c2"}], f)
+        records = [r for unit in batch.iter_units(manifest) for r in batch._unit_records(unit)]
+        self.assertTrue(records)
+        self.assertTrue(all(r["id"].startswith("c2:t") and r["context"] for r in records))
+
+    def test_jsonl_output_is_in_input_order(self):
+        source = self.path("records.jsonl")
+        lines = [json.dumps({"id": f"r{i}", "query": "q", "response": "x" * i, "context": ["c"]}) for i in range(1, 8)]
+        lines[2] = "not json"
+        lines[4] = json.dumps({"id": "r5", "query": "q", "response": "boom", "context": ["c"]})
+        with open(source, "w") as f:
+            f.write("\n".join(lines) + "\n")
+
+        with open(os.devnull, "w") as devnull:
+            summary = batch.run_batch(source, self.path("out.jsonl"), shard_size=2, progress_stream=devnull)
+        self.assertEqual(summary, {**summary, "records": 5, "errors": 2, "shards": 4})
+
+        with open(self.path("out.jsonl")) as f:
+            out = [json.loads(line) for line in f]
+        self.assertEqual([r["id"] for r in out], ["r1", "r2", "3", "r4", "r5", "r6", "r7"])
+        self.assertIn("error", out[2])
+        self.assertEqual(out[4]["error"], "boom")
+        # Shard files are removed once merged
+        self.assertEqual(sorted(os.listdir(self.tmp.name)), ["out.jsonl", "records.jsonl"])
+
+    def test_output_does_not_depend_on_workers(self):
+        source = self.path("records.jsonl")
+        with open(source, "w") as f:
+            for i in range(1, 12):
+                response = "boom" if i == 6 else "x" * i
+                f.write(json.dumps({"id": f"r{i}", "query": "q", "response": response, "context": ["c"]}) + "\n")
+
+        outputs = []
+        for workers in (1, 3):
+            out_path = self.path(f"out-{workers}.jsonl")
+            with open(os.devnull, "w") as devnull:
+                summary = batch.run_batch(source, out_path, workers=workers, shard_size=2, progress_stream=devnull)
+            self.assertEqual(summary, {**summary, "records": 10, "errors": 1, "shards": 6})
+            with open(out_path, "rb") as f:
+                outputs.append(f.read())
+        self.assertEqual(outputs[0], outputs[1])
+        # Only the input-determined fields are written: no latency, no timings
+        records = [json.loads(line) for line in outputs[0].splitlines()]
+        self.assertEqual(records[5], {"id": "r6", "error": "boom"})
+        for record in records[:5] + records[6:]:
+            self.assertEqual(set(record), {"id", "metrics", "verdict", "tier", "config_version"})
+            self.assertEqual(set(record["metrics"]), {"relevance"})
+
+    def test_merger_reorders_shards(self):
+        merger = batch._OutputMerger(self.path("out.jsonl"), "json")
+        for index in (2, 0, 1):
+            with open(self.path(f"shard-{index}"), "w") as f:
+                f.write(json.dumps({"id": str(index)}) + "\n")
+            merger.add(index, self.path(f"shard-{index}"))
+        merger.close()
+        with open(self.path("out.jsonl")) as f:
+            self.assertEqual([json.loads(line)["id"] for line in f], ["0", "1", "2"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+import os
+import random
+import sys
+import unittest
+
+import spacy
+from spacy.tokens import Doc
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pipeline.hallucination import HallucinationEvaluator
+
+def reference_claims(doc, assertive_verbs):
+    """The original token loop that the vectorized candidate lookup replaces."""
+    anchors = []
+    for token in doc:
+        if token.pos_ == "VERB" and token.lemma_.lower() in assertive_verbs:
+            subj = None
+            obj = None
+            for child in token.children:
+                if child.dep_ in ["nsubj", "nsubjpass"]:
+                    subj = child
+                if child.dep_ in ["dobj", "attr", "acomp"]:
+                    obj = child
+            if not obj:
+                for child in token.children:
+                    if child.dep_ == "prep":
+                        for grandchild in child.children:
+                            if grandchild.dep_ == "pobj":
+                                obj = grandchild
+                                break
+            if subj and obj:
+                anchors.append({
+                    "type": "claim",
+                    "text": f"{subj.text} {token.text} {obj.text}",
+                    "components": (subj.text, token.text, obj.text),
+                    "span": (subj.idx, obj.idx + len(obj.text))
+                })
+    return anchors
+
+class TestClaimPatterns(unittest.TestCase):
+    def setUp(self):
+        self.nlp = spacy.blank("en")
+        self.evaluator = HallucinationEvaluator(model=self.nlp)
+
+    def make_doc(self, words, heads, deps, pos, lemmas):
+        return Doc(self.nlp.vocab, words=words, heads=heads, deps=deps, pos=pos, lemmas=lemmas)
+
+    def test_direct_object(self):
+        doc = self.make_doc(
+            ["Google", "released", "the", "Pixel", "phone", "in", "Paris"],
+            [1, 1, 4, 4, 1, 1, 5],
+            ["nsubj", "ROOT", "det", "compound", "dobj", "prep", "pobj"],
+            ["PROPN", "VERB", "DET", "PROPN", "NOUN", "ADP", "PROPN"],
+            ["Google", "release", "the", "Pixel", "phone", "in", "Paris"],
+        )
+        claims = self.evaluator._extract_claims(doc)
+        self.assertEqual([c["text"] for c in claims], ["Google released phone"])
+        self.assertEqual([c.to_dict() for c in claims], reference_claims(doc, self.evaluator.ASSERTIVE_VERBS))
+
+    def test_prepositional_object_of_last_prep(self):
+        doc = self.make_doc(
+            ["Hotel", "is", "located", "near", "beach", "in", "Goa"],
+            [2, 2, 2, 2, 3, 2, 5],
+            ["nsubjpass", "auxpass", "ROOT", "prep", "pobj", "prep", "pobj"],
+            ["NOUN", "AUX", "VERB", "ADP", "NOUN", "ADP", "PROPN"],
+            ["hotel", "be", "Locate", "near", "beach", "in", "Goa"],
+        )
+        claims = self.evaluator._extract_claims(doc)
+        self.assertEqual([c["text"] for c in claims], ["Hotel located Goa"])
+        self.assertEqual([c.to_dict() for c in claims], reference_claims(doc, self.evaluator.ASSERTIVE_VERBS))
+
+    def test_hedged_verbs_make_no_claims(self):
+        # "The revenue may be around 1 million": modal child
+        may_be = self.make_doc(
+            ["The", "revenue", "may", "be", "around", "1", "million"],
+            [1, 3, 3, 3, 3, 6, 4],
+            ["det", "nsubj", "aux", "ROOT", "prep", "compound", "pobj"],
+            ["DET", "NOUN", "AUX", "VERB", "ADP", "NUM", "NUM"],
+            ["the", "revenue", "may", "be", "around", "1", "million"],
+        )
+        # "The room probably costs $100": adverb child
+        probably = self.make_doc(
+            ["The", "room", "probably", "costs", "$100"],
+            [1, 3, 3, 3, 3],
+            ["det", "nsubj", "advmod", "ROOT", "dobj"],
+            ["DET", "NOUN", "ADV", "VERB", "NUM"],
+            ["the", "room", "probably", "cost", "$100"],
+        )
+        # "The room seems to cost $100": complement of a hedging verb
+        seems = self.make_doc(
+            ["The", "room", "seems", "to", "cost", "$100"],
+            [1, 2, 2, 4, 2, 4],
+            ["det", "nsubj", "ROOT", "aux", "xcomp", "dobj"],
+            ["DET", "NOUN", "VERB", "PART", "VERB", "NUM"],
+            ["the", "room", "seem", "to", "cost", "$100"],
+        )
+        for doc in (may_be, probably, seems):
+            self.assertEqual(self.evaluator._extract_claims(doc), [], doc.text)
+
+        # The same claim without the hedge is an assertion
+        costs = self.make_doc(
+            ["The", "room", "costs", "$100"],
+            [1, 2, 2, 2],
+            ["det", "nsubj", "ROOT", "dobj"],
+            ["DET", "NOUN", "VERB", "NUM"],
+            ["the", "room", "cost", "$100"],
+        )
+        self.assertEqual([c["text"] for c in self.evaluator._extract_claims(costs)], ["room costs $100"])
+
+    def test_fast_mode_counts_unverified_claims(self):
+        evaluator = HallucinationEvaluator(mode="fast", model=self.nlp)
+        doc = self.make_doc(
+            ["Google", "released", "the", "Pixel", "phone", "in", "Paris"],
+            [1, 1, 4, 4, 1, 1, 5],
+            ["nsubj", "ROOT", "det", "compound", "dobj", "prep", "pobj"],
+            ["PROPN", "VERB", "DET", "PROPN", "NOUN", "ADP", "PROPN"],
+            ["Google", "release", "the", "Pixel", "phone", "in", "Paris"],
+        )
+        result = evaluator.evaluate(doc.text, ["Apple sold a phone."], doc=doc)
+        # No numeric/date anchors to verify: the unsupported claim is not reported
+        self.assertEqual(result["unsupported_claims"], [])
+        self.assertEqual(result["unverified_claims"], 1)
+        self.assertNotIn("unverified_claims", self.evaluator.evaluate(doc.text, ["Apple sold a phone."], doc=doc))
+
+    def test_unparsed_doc_has_no_claims(self):
+        self.assertEqual(self.evaluator._extract_claims(self.nlp("Google released the Pixel.")), [])
+
+    def test_random_trees_match_reference(self):
+        rng = random.Random(7)
+        deps = ["nsubj", "nsubjpass", "dobj", "attr", "acomp", "prep", "pobj", "det", "amod"]
+        lemmas = ["be", "Cost", "SELL", "locate", "run", "buy", "x"]
+        for _ in range(500):
+            n = rng.randint(2, 12)
+            order = list(range(n))
+            rng.shuffle(order)
+            heads = [0] * n
+            heads[order[0]] = order[0]
+            for k in range(1, n):
+                heads[order[k]] = order[rng.randrange(k)]
+            doc = self.make_doc(
+                [f"w{i}" for i in range(n)],
+                heads,
+                ["ROOT" if heads[i] == i else rng.choice(deps) for i in range(n)],
+                [rng.choice(["VERB", "NOUN", "ADP"]) for _ in range(n)],
+                [rng.choice(lemmas) for _ in range(n)],
+            )
+            claims = [c.to_dict() for c in self.evaluator._extract_claims(doc)]
+            self.assertEqual(claims, reference_claims(doc, self.evaluator.ASSERTIVE_VERBS))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pipeline.config import DEFAULT_CONFIG, ConfigWatcher, EvalConfig
+from pipeline.evaluation import VerdictBuilder
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestEvalConfig(unittest.TestCase):
+    def test_overrides_merge_with_defaults(self):
+        config = EvalConfig({"version": "v2", "thresholds": {"max_cost_usd": 0.08}, "assertive_verbs": ["cost"]})
+        self.assertEqual(config.version, "v2")
+        self.assertEqual(config.max_cost_usd, 0.08)
+        self.assertEqual(config.hallucination_fail, DEFAULT_CONFIG.hallucination_fail)
+        self.assertEqual(config.assertive_verbs, frozenset(["cost"]))
+        self.assertEqual(config.relevance_intents, DEFAULT_CONFIG.relevance_intents)
+
+    def test_invalid_configs_rejected(self):
+        for data in [
+            {"thresholds": {}},                                          # no version
+            {"version": "v", "threshold": {}},                           # unknown key
+            {"version": "v", "thresholds": {"max_cost": 1}},             # unknown threshold
+            {"version": "v", "thresholds": {"hallucination_warn": 0.9}}, # warn above fail
+            {"version": "v", "intents": {"relevance": [{"keywords": ["cost"]}]}},
+            {"version": "v", "intents": {"relevance": [{"keywords": [5], "labels": ["MONEY"]}]}},
+            {"version": "v", "intents": {"relevance": ["cost"]}},
+            {"version": "v", "intents": {"relevance": {"keywords": ["cost"]}}},
+            {"version": "v", "thresholds": {"max_cost_usd": "high"}},
+            {"version": "v", "hedging_verbs": "may"},
+            ["version"],
+        ]:
+            with self.assertRaises(ValueError, msg=data):
+                EvalConfig(data)
+
+    def test_intents_match_substrings(self):
+        config = DEFAULT_CONFIG
+        self.assertEqual(config.detect_intents("How much is the PRICE?", config.relevance_intents), {"MONEY"})
+        self.assertEqual(config.detect_intents("Who founded it, and where?", config.completeness_intents),
+                         {"PERSON", "ORG", "GPE", "LOC"})
+        self.assertEqual(config.detect_intents("Tell me more.", config.relevance_intents), set())
+        custom = EvalConfig({"version": "v", "intents": {"relevance": [{"keywords": ["a.b"], "labels": ["X"]}]}})
+        self.assertEqual(config.detect_intents("axb", custom.relevance_intents), set())  # Keywords are literal
+
+    def test_verdict_uses_config_thresholds(self):
+        scores = {"relevance": 0.9, "estimated_cost_usd": 0.06}
+        default = VerdictBuilder()
+        default.add(scores)
+        self.assertEqual(default.verdict().status, "WARN")
+        relaxed = VerdictBuilder(EvalConfig({"version": "v", "thresholds": {"max_cost_usd": 0.1}}))
+        relaxed.add(scores)
+        self.assertEqual(relaxed.verdict().status, "PASS")
+
+class TestConfigWatcher(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "config.json")
+        self.write({"version": "v1"})
+        self.clock = FakeClock()
+        self.watcher = ConfigWatcher(self.path, interval_s=5.0, clock=self.clock)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, data):
+        # Atomic replace, with a distinct mtime/size per version
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(data if isinstance(data, str) else json.dumps(data))
+        os.replace(tmp, self.path)
+
+    def test_reloads_after_interval_only(self):
+        self.write({"version": "v2", "thresholds": {"max_latency_ms": 500}})
+        self.assertEqual(self.watcher.current().version, "v1")
+        self.clock.now = 6.0
+        config = self.watcher.current()
+        self.assertEqual(config.version, "v2")
+        self.assertEqual(config.max_latency_ms, 500.0)
+        self.assertIs(self.watcher.current(), config)
+
+    def test_invalid_file_keeps_previous_version(self):
+        previous = self.watcher.current()
+        self.write("{not json")
+        self.clock.now = 6.0
+        self.assertIs(self.watcher.current(), previous)
+        self.write({"version": "v3"})
+        self.clock.now = 12.0
+        self.assertEqual(self.watcher.current().version, "v3")
+
+    def test_malformed_intents_keep_previous_version(self):
+        previous = self.watcher.current()
+        self.write({"version": "v2", "intents": {"relevance": [{"keywords": [5], "labels": ["MONEY"]}]}})
+        self.clock.now = 6.0
+        self.assertIs(self.watcher.current(), previous)
+        self.clock.now = 12.0
+        self.assertIs(self.watcher.current(), previous)  # Same file version: not retried
+        self.write({"version": "v3", "intents": {"relevance": ["cost"]}})
+        self.clock.now = 18.0
+        self.assertIs(self.watcher.current(), previous)
+
+    def test_invalid_file_at_startup_raises(self):
+        self.write({"thresholds": {}})
+        with self.assertRaises(ValueError):
+            ConfigWatcher(self.path)
+
+if __name__ == '__main__':
+    unittest.main()
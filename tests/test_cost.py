@@ -0,0 +1,84 @@
+import base64
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pipeline.latency_cost import CostEvaluator
+from pipeline import tokenizer as tokenizer_module
+from pipeline.tokenizer import BPETokenizer, HeuristicTokenizer, load_tokenizer
+
+def write_vocab(path, merges):
+    """Byte-level vocab: all 256 single bytes, then `merges` in rank order."""
+    tokens = [bytes([i]) for i in range(256)] + [m.encode("utf-8") for m in merges]
+    with open(path, "wb") as f:
+        for rank, token in enumerate(tokens):
+            f.write(base64.b64encode(token) + b" " + str(rank).encode() + b"\n")
+
+class TestCost(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.vocab = os.path.join(self.tmp.name, "tiny.tiktoken")
+        write_vocab(self.vocab, ["th", "the", " th", " the", "pr", "ic", "ice"])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_bpe_merges(self):
+        tokenizer = BPETokenizer.from_file(self.vocab)
+        # "the" -> 1, " the" -> 1, " price" -> " ", "pr", "ice" -> 3
+        self.assertEqual(tokenizer.count("the the price"), 5)
+        # Numbers split in groups of 3 digits, each digit a byte here
+        self.assertEqual(tokenizer.count("12345"), 5)
+
+    def test_vocab_file_takes_precedence(self):
+        self.assertIsInstance(load_tokenizer(self.vocab), BPETokenizer)
+
+    def test_shipped_cl100k_vocab_is_the_default(self):
+        with mock.patch.dict(os.environ):
+            os.environ.pop("EVAL_TOKENIZER_VOCAB", None)
+            tokenizer = load_tokenizer()
+        self.assertIsInstance(tokenizer, BPETokenizer)
+        self.assertEqual(tokenizer.name, "cl100k_base.tiktoken")
+        # Same counts as tiktoken's cl100k_base encode_ordinary()
+        self.assertEqual(tokenizer.count("Hello world"), 2)
+        self.assertEqual(tokenizer.count("https://example.com/a/b?x=12345&y=67"), 15)
+        self.assertEqual(tokenizer.count("Price: $1,234,567.89 on 2024-06-01"), 18)
+        self.assertEqual(tokenizer.count("def _init_worker(self):\n\n    pass"), 8)
+
+    def test_missing_vocab_falls_back_to_heuristic(self):
+        with mock.patch.dict(os.environ), \
+                mock.patch.object(tokenizer_module, "DEFAULT_VOCAB_PATH", os.path.join(self.tmp.name, "missing")):
+            os.environ.pop("EVAL_TOKENIZER_VOCAB", None)
+            tokenizer = load_tokenizer()
+        self.assertIsInstance(tokenizer, HeuristicTokenizer)
+        self.assertEqual(tokenizer.count("12345678"), 2.0)
+
+    def test_heuristic_matches_previous_estimate(self):
+        evaluator = CostEvaluator(price_model="default", tokenizer=HeuristicTokenizer())
+        query, response, context = "What is the price?", "It is $10.", ["Price: $10", "Ships in 2 days"]
+        old_estimate = (len(query + response + "".join(context)) / 4 / 1000) * 0.002
+        self.assertAlmostEqual(evaluator.estimate_request_cost(query, response, context), old_estimate)
+
+    def test_input_output_prices(self):
+        evaluator = CostEvaluator(price_model="gpt-4o", tokenizer=BPETokenizer.from_file(self.vocab))
+        # 1 input token, 1 output token
+        self.assertAlmostEqual(evaluator.estimate_request_cost("the", "the", []), (0.0025 + 0.01) / 1000)
+
+    def test_context_counts_are_memoized(self):
+        evaluator = CostEvaluator(tokenizer=BPETokenizer.from_file(self.vocab))
+        chunk = "the price " * 50
+        first = evaluator.count_context_tokens([chunk, chunk])
+        self.assertEqual(len(evaluator.token_counter._counts), 1)
+        self.assertEqual(evaluator.count_context_tokens([chunk]) * 2, first)
+
+    def test_unknown_price_model(self):
+        with self.assertRaises(ValueError):
+            CostEvaluator(price_model="gpt-9")
+
+if __name__ == '__main__':
+    unittest.main()
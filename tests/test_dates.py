@@ -0,0 +1,41 @@
+import unittest
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pipeline.dates import context_date_index, dates_supported, parse_dates
+
+
+class TestDates(unittest.TestCase):
+    def test_formats_normalize_to_same_key(self):
+        for text in ["March 5th, 2024", "5 March 2024", "the 5th of march 2024", "2024-03-05", "03/05/2024", "Mar. 5, 2024"]:
+            self.assertEqual(parse_dates(text), {(2024, 3, 5)}, text)
+
+    def test_partial_dates(self):
+        self.assertEqual(parse_dates("August 12"), {(None, 8, 12)})
+        self.assertEqual(parse_dates("march 2024"), {(2024, 3, None)})
+        self.assertEqual(parse_dates("in 2023"), {(2023, None, None)})
+
+    def test_no_substring_months(self):
+        """'mar' inside 'summary', 'may' as a modal verb and ordinals in words are not dates"""
+        self.assertEqual(parse_dates("a summary of the smartest options"), set())
+        self.assertEqual(parse_dates("prices may change"), set())
+
+    def test_day_first_when_month_impossible(self):
+        self.assertEqual(parse_dates("25/12/2024"), {(2024, 12, 25)})
+
+    def test_context_index_lookup(self):
+        index = context_date_index("checkout is on 2024-08-03. the offer ends in december.")
+        self.assertTrue(dates_supported("august 3rd", index))
+        self.assertTrue(dates_supported("aug 3, 2024", index))
+        self.assertTrue(dates_supported("2024", index))
+        self.assertTrue(dates_supported("december", index))
+        self.assertFalse(dates_supported("august 4th", index))
+        self.assertFalse(dates_supported("aug 3, 2025", index))
+        self.assertFalse(dates_supported("two days", index))
+
+
+if __name__ == '__main__':
+    unittest.main()
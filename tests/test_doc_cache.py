@@ -0,0 +1,72 @@
+import multiprocessing
+import os
+import sys
+import unittest
+import tempfile
+
+import spacy
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pipeline import doc_cache
+from pipeline.doc_cache import DocCache
+
+def fill_cache(cache_dir, worker, n_chunks, max_disk_bytes, peaks):
+    """Writes `n_chunks` new entries, reporting the largest store size seen between writes."""
+    cache = DocCache(spacy.blank("en"), cache_dir=cache_dir, max_disk_bytes=max_disk_bytes)
+    peak = 0
+    for i in range(n_chunks):
+        cache.get_docs([f"worker {worker} chunk {i} " * 20])
+        with cache._store_lock():
+            peak = max(peak, cache._scan_disk_bytes())
+    peaks.put(peak)
+
+class TestDocCache(unittest.TestCase):
+    def setUp(self):
+        # Blank pipeline: tokenizer only, no model download needed
+        self.nlp = spacy.blank("en")
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip_across_instances(self):
+        """A fresh cache (e.g. after a restart) serves parses from disk."""
+        texts = ["The price is $100.", "Shipping takes 2-3 business days."]
+        first = DocCache(self.nlp, cache_dir=self.tmp.name)
+        docs = first.get_docs(texts)
+
+        second = DocCache(self.nlp, cache_dir=self.tmp.name)
+        self.assertIsNotNone(second._disk_get(second._key(texts[0])))
+        reloaded = second.get_docs(texts)
+        self.assertEqual([d.text for d in reloaded], [d.text for d in docs])
+        self.assertEqual([t.text for t in reloaded[0]], [t.text for t in docs[0]])
+
+    def test_duplicate_chunks_parsed_once(self):
+        cache = DocCache(self.nlp)
+        docs = cache.get_docs(["same chunk", "other chunk", "same chunk"])
+        self.assertIs(docs[0], docs[2])
+
+    def test_disk_store_is_size_bounded(self):
+        cache = DocCache(self.nlp, cache_dir=self.tmp.name, max_disk_bytes=4096)
+        cache.get_docs([f"chunk number {i} " * 20 for i in range(50)])
+        self.assertLessEqual(cache._scan_disk_bytes(), 4096)
+
+    @unittest.skipUnless(doc_cache.fcntl, "the store lock needs fcntl")
+    def test_size_bound_is_shared_by_processes(self):
+        """Two workers on one store stay within one budget, not one each."""
+        context = multiprocessing.get_context("fork")
+        peaks = context.Queue()
+        workers = [context.Process(target=fill_cache, args=(self.tmp.name, w, 40, 4096, peaks)) for w in range(2)]
+        for worker in workers:
+            worker.start()
+        self.assertLessEqual(max(peaks.get(timeout=60) for _ in workers), 4096)
+        for worker in workers:
+            worker.join()
+            self.assertEqual(worker.exitcode, 0)
+        cache = DocCache(self.nlp, cache_dir=self.tmp.name, max_disk_bytes=4096)
+        self.assertEqual(cache._read_disk_bytes(), cache._scan_disk_bytes())
+
+if __name__ == '__main__':
+    unittest.main()
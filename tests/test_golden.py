@@ -0,0 +1,71 @@
+import multiprocessing
+import os
+import sys
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from benchmarks import golden
+from benchmarks.golden import build_corpus, diff_runs
+from benchmarks.compact_vectors import compare_runs
+
+def make_run(verdict="PASS", hallucination=0.0, p95_ms=50.0, throughput_rps=20.0):
+    return {
+        "summary": {"p95_ms": p95_ms, "throughput_rps": throughput_rps},
+        "results": {"conv-01-t6": {"metrics": {"relevance": 0.9, "hallucination": hallucination}, "verdict": verdict}},
+    }
+
+def slow_init_worker(ready):
+    # Stands in for golden._init_worker: model loading takes a while
+    time.sleep(0.3)
+    golden._WORKER_READY = ready
+
+class TestGolden(unittest.TestCase):
+    def test_corpus_build_is_deterministic(self):
+        first, second = build_corpus(seed=13), build_corpus(seed=13)
+        self.assertEqual(first, second)
+        ids = [r["id"] for r in first["records"]]
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertTrue(all(r["context_id"] in first["contexts"] for r in first["records"]))
+
+    def test_identical_runs_are_ok(self):
+        self.assertTrue(diff_runs(make_run(), make_run())["ok"])
+
+    def test_verdict_change_and_drift_flagged(self):
+        report = diff_runs(make_run(), make_run(verdict="WARN", hallucination=0.2))
+        self.assertFalse(report["ok"])
+        self.assertEqual(report["verdict_changes"][0]["new"], "WARN")
+        self.assertEqual(report["score_drift"][0]["metric"], "hallucination")
+
+    def test_missing_records_are_not_ok(self):
+        new = make_run()
+        new["results"]["conv-01-t7"] = new["results"]["conv-01-t6"]
+        report = diff_runs(make_run(), new)
+        self.assertEqual(report["missing"], ["conv-01-t7"])
+        self.assertFalse(report["ok"])
+
+    def test_wait_ready_runs_once_on_every_worker(self):
+        workers = 3
+        ready = multiprocessing.Barrier(workers)
+        with ProcessPoolExecutor(max_workers=workers, initializer=slow_init_worker, initargs=(ready,)) as executor:
+            pids = list(executor.map(golden._wait_ready, range(workers)))
+        self.assertEqual(len(set(pids)), workers)
+
+    def test_speed_regression_flagged(self):
+        report = diff_runs(make_run(), make_run(p95_ms=80.0))
+        self.assertTrue(report["speed_regression"])
+
+    def test_compact_report_flags_verdict_changes_only(self):
+        full = make_run()
+        compact = make_run()
+        compact["results"]["conv-01-t6"]["metrics"]["relevance"] = 0.89
+        report = compare_runs(full, compact)
+        self.assertTrue(report["ok"])
+        self.assertEqual(report["scores"]["relevance"]["max_abs_delta"], 0.01)
+        self.assertFalse(compare_runs(full, make_run(verdict="WARN"))["ok"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+import spacy
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pipeline.doc_cache import DocCache
+from pipeline.context_index import ContextSummaryCache
+from pipeline.grounding import GroundingEvaluator
+from pipeline.hallucination import HallucinationEvaluator
+
+class TestGrounding(unittest.TestCase):
+    def setUp(self):
+        # Blank pipeline with a handful of orthogonal vectors: no model download needed
+        self.nlp = spacy.blank("en")
+        for i, word in enumerate(["hotel", "room", "price", "ivf", "clinic", "doctor"]):
+            vector = np.zeros(6, dtype=np.float32)
+            vector[i] = 1.0
+            self.nlp.vocab.set_vector(word, vector)
+        self.summaries = ContextSummaryCache(DocCache(self.nlp))
+        self.evaluator = GroundingEvaluator(self.summaries, model=self.nlp, top_k=1)
+        self.context = ["ivf clinic doctor", "hotel room price"]
+
+    def test_top_k_ranks_by_cosine(self):
+        index = self.summaries.build_index(self.context)
+        top = index.top_k(self.nlp("hotel price"), k=1)
+        self.assertEqual(top[0][0], 1)
+
+    def test_rank_chunks_inverted_index(self):
+        context = ["home menu contact", "room price 100", "room menu", "clinic doctor"]
+        index = self.summaries.build_index(context)
+        ranked = index.rank_chunks({"room": 1.0, "100": 2.0})
+        self.assertEqual([i for i, _ in ranked], [1, 2])
+
+    def preselect(self, context, response, k=8, max_bytes=64 * 1024):
+        evaluator = HallucinationEvaluator(model=self.nlp, preselect="topk", preselect_k=k,
+                                           preselect_max_bytes=max_bytes, summaries=self.summaries)
+        return evaluator._preselect_chunks(context, [], self.nlp(response))
+
+    def test_preselect_respects_byte_budget_in_context_order(self):
+        context = ["room price 100", "clinic doctor", "room menu", "room"]
+        # Ranked 0, 2, 3: the third (4 bytes) does not fit 25 bytes after the first two (14 + 9)
+        self.assertEqual(self.preselect(context, "room price menu", max_bytes=25),
+                         ["room price 100", "room menu"])
+        self.assertEqual(self.preselect(context, "room price menu", k=1), ["room price 100"])
+
+    def test_preselect_keeps_best_chunk_over_budget(self):
+        context = ["hotel room price " * 10, "clinic doctor"]
+        self.assertEqual(self.preselect(context, "hotel price", max_bytes=16), [context[0]])
+
+    def test_preselect_falls_back_to_context_order(self):
+        context = ["ivf clinic", "doctor", "hotel room " * 10]
+        self.assertEqual(self.preselect(context, "zebra", max_bytes=20), ["ivf clinic", "doctor"])
+
+    def test_summaries_computed_once_per_chunk(self):
+        self.summaries.summarize(self.context)
+        first = self.summaries.summarize(self.context + ["new chunk"])
+        self.assertIs(first[0], self.summaries.summarize(self.context)[0])
+
+    def test_groundedness(self):
+        grounded = self.evaluator.evaluate_groundedness("hotel room price", self.context)
+        ungrounded = self.evaluator.evaluate_groundedness("doctor price", self.context)
+        self.assertEqual(grounded, 1.0)
+        self.assertLess(ungrounded, grounded)
+
+    def test_context_relevance_empty_context(self):
+        self.assertEqual(self.evaluator.evaluate_context_relevance("hotel price", []), 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,11 +2,13 @@
 import unittest
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 # Add src to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from pipeline.hallucination import HallucinationEvaluator
+from pipeline.records import Anchor
 
 class TestHallucinationUpgraded(unittest.TestCase):
     def setUp(self):
@@ -68,5 +70,21 @@ class TestHallucinationUpgraded(unittest.TestCase):
         claim_anchors = [a for a in anchors if a['type'] == 'claim']
         self.assertEqual(len(claim_anchors), 0, "Hedging verbs should not trigger claim extraction.")
 
+    def test_parallel_verification_matches_sequential(self):
+        """Test Case 5: Batched concurrent verification returns the sequential results, in order"""
+        context_text = "the room costs $100 per night. offer valid until march 2024. 50% discount for 10 days."
+        values = ["$100", "$150", "50%", "10", "12", "march 2024", "april 2025"]
+        anchors = [
+            Anchor("date" if "20" in v else "numeric", v, value=v)
+            for v in values * 5
+        ]
+        sequential = self.evaluator._verify_anchors(anchors, context_text)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            parallel_evaluator = HallucinationEvaluator(executor=executor, parallel_min_anchors=1)
+            parallel = parallel_evaluator._verify_anchors(anchors, context_text)
+
+        self.assertEqual(parallel, sequential)
+
 if __name__ == '__main__':
     unittest.main()
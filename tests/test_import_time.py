@@ -0,0 +1,18 @@
+import os
+import sys
+import unittest
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from benchmarks.import_time import TARGETS, measure
+
+class TestColdImport(unittest.TestCase):
+    def test_no_target_imports_spacy(self):
+        """Importing the package, CLI --help and /health must not load spaCy (or uvicorn)"""
+        for target in TARGETS:
+            result = measure(target, runs=1)
+            self.assertEqual(result["deferred_imported"], [], target)
+
+if __name__ == '__main__':
+    unittest.main()
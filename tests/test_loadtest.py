@@ -0,0 +1,51 @@
+import os
+import sys
+import unittest
+
+from fastapi import FastAPI, HTTPException
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from benchmarks.loadtest import load_payloads, run_load
+
+def make_app():
+    """Stand-in service: fails every request whose query mentions 'refund'."""
+    app = FastAPI()
+
+    @app.post("/evaluate")
+    async def evaluate(payload: dict):
+        if "refund" in payload["query"].lower():
+            raise HTTPException(status_code=500)
+        return {"ok": True}
+
+    return app
+
+class TestLoadTest(unittest.TestCase):
+    def setUp(self):
+        self.payloads = [{"query": "price?", "response": "$5", "context": []}] * 3 + [
+            {"query": "refund?", "response": "no", "context": []}
+        ]
+
+    def test_closed_loop_counts_and_percentiles(self):
+        summary = run_load(self.payloads, app=make_app(), concurrency=4, duration=30, max_requests=40, warmup=0)
+        self.assertEqual(summary["mode"], "closed")
+        self.assertEqual(summary["requests"], 40)
+        self.assertEqual(summary["ok"] + summary["errors"].get("http_500", 0), 40)
+        self.assertGreater(summary["errors"]["http_500"], 0)
+        self.assertLessEqual(summary["p50_ms"], summary["p99.9_ms"])
+
+    def test_open_loop_respects_request_cap(self):
+        summary = run_load(self.payloads[:3], app=make_app(), rate=200, duration=30, max_requests=20, warmup=0)
+        self.assertEqual(summary["mode"], "open")
+        self.assertEqual(summary["requests"], 20)
+        self.assertEqual(summary["error_rate"], 0.0)
+
+    def test_payloads_from_golden_corpus(self):
+        payloads = load_payloads(os.path.join(os.path.dirname(__file__), '..', 'samples', 'golden', 'corpus.json'),
+                                 variations=["original"])
+        self.assertTrue(payloads)
+        self.assertTrue(all(isinstance(p["context"], list) and p["context"] for p in payloads))
+
+if __name__ == '__main__':
+    unittest.main()
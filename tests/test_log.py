@@ -0,0 +1,53 @@
+import json
+import logging
+import os
+import sys
+import unittest
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pipeline.log import JsonFormatter, RequestIdFilter, log_sampled, request_context
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+class TestStructuredLogging(unittest.TestCase):
+    def setUp(self):
+        self.logger = logging.getLogger("test.pipeline.log")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.DEBUG)
+        self.handler = ListHandler()
+        self.handler.addFilter(RequestIdFilter())
+        self.logger.addHandler(self.handler)
+
+    def tearDown(self):
+        self.logger.removeHandler(self.handler)
+
+    def test_json_lines_carry_request_id_and_fields(self):
+        with request_context("req-42"):
+            self.logger.info("scored %s", "x", extra={"fields": {"verdict": "PASS"}})
+        entry = json.loads(JsonFormatter().format(self.handler.records[0]))
+        self.assertEqual(entry["msg"], "scored x")
+        self.assertEqual(entry["request_id"], "req-42")
+        self.assertEqual(entry["verdict"], "PASS")
+
+    def test_sampling(self):
+        for _ in range(20):
+            log_sampled(self.logger, logging.DEBUG, "anchor verified", sample_rate=0.0)
+        self.assertEqual(self.handler.records, [])
+        log_sampled(self.logger, logging.DEBUG, "anchor verified", sample_rate=1.0, supported=True)
+        self.assertEqual(self.handler.records[0].fields["supported"], True)
+
+    def test_disabled_level_is_skipped(self):
+        self.logger.setLevel(logging.INFO)
+        log_sampled(self.logger, logging.DEBUG, "anchor verified", sample_rate=1.0)
+        self.assertEqual(self.handler.records, [])
+
+if __name__ == '__main__':
+    unittest.main()
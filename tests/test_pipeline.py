@@ -0,0 +1,65 @@
+import itertools
+import unittest
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pipeline.evaluation import Pipeline, VerdictBuilder
+from pipeline.records import UnsupportedClaim
+
+class TestPipelineProfiles(unittest.TestCase):
+    def test_unknown_profile_rejected(self):
+        with self.assertRaises(ValueError):
+            Pipeline(profile="turbo")
+
+    def test_unknown_profile_override_rejected(self):
+        with self.assertRaises(ValueError):
+            Pipeline().run("query", "response", ["context"], profile="turbo")
+
+    def test_clear_cut_scores_do_not_escalate(self):
+        pipeline = Pipeline(profile="tiered", uncertainty_margin=0.05)
+        scores = {"relevance": 0.9, "completeness": 0.9, "hallucination": 0.0}
+        self.assertFalse(pipeline._is_uncertain(scores))
+
+    def test_scores_near_thresholds_escalate(self):
+        pipeline = Pipeline(profile="tiered", uncertainty_margin=0.05)
+        # Hallucination just above the WARN threshold (0.1)
+        self.assertTrue(pipeline._is_uncertain({"relevance": 0.9, "completeness": 0.9, "hallucination": 0.12}))
+        # Relevance just below the WARN threshold (0.2)
+        self.assertTrue(pipeline._is_uncertain({"relevance": 0.18, "completeness": 0.9, "hallucination": 0.0}))
+        # Completeness just above the WARN threshold (0.5)
+        self.assertTrue(pipeline._is_uncertain({"relevance": 0.9, "completeness": 0.53, "hallucination": 0.0}))
+
+    def test_unverified_claims_escalate(self):
+        pipeline = Pipeline(profile="tiered", uncertainty_margin=0.05)
+        scores = {"relevance": 0.9, "completeness": 0.9, "hallucination": 0.0}
+        self.assertFalse(pipeline._is_uncertain(dict(scores, unverified_claims=0)))
+        self.assertTrue(pipeline._is_uncertain(dict(scores, unverified_claims=2)))
+
+class TestVerdictBuilder(unittest.TestCase):
+    def test_verdict_does_not_depend_on_metric_order(self):
+        fields = [
+            {"hallucination": 0.3, "unsupported_claims": [UnsupportedClaim("numeric", "$150", "not found")]},
+            {"relevance": 0.1},
+            {"completeness": 0.2},
+            {"estimated_cost_usd": 0.06},
+        ]
+        verdicts = set()
+        for order in itertools.permutations(fields):
+            builder = VerdictBuilder()
+            for metric_fields in order:
+                builder.add(metric_fields)
+            verdict = builder.verdict(latency_ms=10.0)
+            verdicts.add((verdict.status, tuple(verdict.reasons)))
+        self.assertEqual(verdicts, {("WARN", ("Potential hallucination: $150", "Low relevance", "Cost limit exceeded"))})
+
+    def test_provisional_verdict_skips_latency(self):
+        builder = VerdictBuilder()
+        builder.add({"completeness": 0.2})
+        self.assertEqual(builder.verdict().reasons, ["Incomplete answer"])
+        self.assertEqual(builder.verdict(latency_ms=5000.0).reasons, ["Incomplete answer", "Latency > 2000ms"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import json
+import os
+import sys
+import unittest
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pipeline import records
+from pipeline.records import Anchor, EvalReport, UnsupportedClaim, Verdict, dumps
+
+def make_report(**overrides):
+    fields = dict(
+        metrics={"hallucination": 1.0, "latency_ms": 3.5},
+        verdict=Verdict("FAIL", ["High hallucination: Unsupported claims found: $150"]),
+        tier="full",
+        unsupported_claims=[UnsupportedClaim("numeric", "$150", "'$150' not found in context")],
+        timings_ms={"parse": 1.2},
+    )
+    fields.update(overrides)
+    return EvalReport(**fields)
+
+class TestRecords(unittest.TestCase):
+    def test_key_access_matches_former_dicts(self):
+        anchor = Anchor("numeric", "$150", value="$150", span=(13, 17))
+        self.assertEqual(anchor["text"], "$150")
+        self.assertNotIn("components", anchor)
+        with self.assertRaises(KeyError):
+            anchor["components"]
+        self.assertEqual(anchor.to_dict(), {"type": "numeric", "text": "$150", "value": "$150", "span": (13, 17)})
+        self.assertFalse(hasattr(anchor, "__dict__"))
+
+        report = make_report()
+        self.assertEqual(report["verdict"]["status"], "FAIL")
+        self.assertEqual(list({"id": "r1", **report}), ["id", "metrics", "verdict", "tier", "unsupported_claims", "timings_ms"])
+
+    def test_dumps_omits_unset_fields(self):
+        body = json.loads(dumps(make_report()))
+        self.assertNotIn("admission", body)
+        self.assertEqual(body["unsupported_claims"][0]["text"], "$150")
+
+        public = json.loads(dumps(make_report(admission="degraded").public()))
+        self.assertEqual(list(public), ["metrics", "verdict", "tier", "admission"])
+
+    def test_json_fallback_matches_orjson(self):
+        if records.orjson is None:
+            self.skipTest("orjson not installed")
+        report = make_report(admission="degraded")
+        fast = json.loads(dumps(report))
+        original, records.orjson = records.orjson, None
+        try:
+            self.assertEqual(json.loads(dumps(report)), fast)
+        finally:
+            records.orjson = original
+
+if __name__ == '__main__':
+    unittest.main()
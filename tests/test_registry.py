@@ -0,0 +1,52 @@
+import unittest
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pipeline.registry import METRICS, disabled_components, disabled_components_per_doc, resolve_metrics
+
+MD_PIPE_NAMES = ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "ner"]
+
+
+class TestRegistry(unittest.TestCase):
+    def test_default_is_every_metric_but_the_opt_in_ones(self):
+        self.assertEqual([spec.name for spec in resolve_metrics()],
+                         ["relevance", "completeness", "hallucination", "estimated_cost_usd"])
+        # Opt-in metrics run when requested by name
+        self.assertEqual([spec.name for spec in resolve_metrics(["context_relevance", "groundedness"])],
+                         ["context_relevance", "groundedness"])
+
+    def test_subset_keeps_registration_order(self):
+        names = [spec.name for spec in resolve_metrics(["groundedness", "relevance"])]
+        self.assertEqual(names, ["relevance", "groundedness"])
+
+    def test_unknown_or_empty_selection_rejected(self):
+        with self.assertRaises(ValueError):
+            resolve_metrics(["relevance", "toxicity"])
+        with self.assertRaises(ValueError):
+            resolve_metrics([])
+
+    def test_only_needed_components_run(self):
+        # Cost needs no parse at all
+        self.assertEqual(disabled_components(MD_PIPE_NAMES, resolve_metrics(["estimated_cost_usd"])), MD_PIPE_NAMES)
+        # Context relevance needs lemmas but no parser or NER
+        self.assertEqual(disabled_components(MD_PIPE_NAMES, resolve_metrics(["context_relevance"])), ["parser", "ner"])
+        # Everything enabled for the full metric set
+        self.assertEqual(disabled_components(MD_PIPE_NAMES, resolve_metrics()), [])
+
+    def test_only_the_response_is_dependency_parsed(self):
+        disable = disabled_components_per_doc(MD_PIPE_NAMES, resolve_metrics())
+        self.assertEqual(disable, {"query_lower": ["parser"], "response_lower": ["parser"],
+                                   "query": ["parser"], "response": []})
+        # Docs no requested metric reads are not parsed
+        self.assertEqual(list(disabled_components_per_doc(MD_PIPE_NAMES, resolve_metrics(["relevance"]))),
+                         ["query_lower", "response_lower"])
+
+    def test_unknown_components_stay_enabled(self):
+        self.assertEqual(disabled_components(["entity_ruler", "ner"], resolve_metrics(["context_relevance"])), ["ner"])
+
+
+if __name__ == '__main__':
+    unittest.main()
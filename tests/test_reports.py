@@ -0,0 +1,71 @@
+import csv
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pipeline.reports import COLUMNS, CsvReportWriter, ReportWriter, flatten_report, open_report_writer
+
+REPORT = {
+    "metrics": {"relevance": 0.85, "hallucination": 1.0, "latency_ms": 12.5, "estimated_cost_usd": 0.0001},
+    "verdict": {"status": "FAIL", "reasons": ["High hallucination: Unsupported claims found: $150, 2025"]},
+    "tier": "full",
+    "unsupported_claims": [{"type": "numeric", "text": "$150", "reason": "..."}, {"type": "date", "text": "2025", "reason": "..."}],
+    "timings_ms": {"parse": 3.2, "relevance": 1.1, "hallucination": 7.9},
+}
+
+
+class TestReports(unittest.TestCase):
+    def test_flatten_has_fixed_columns(self):
+        row = flatten_report(REPORT, record_id=7)
+        self.assertEqual(list(row), COLUMNS)
+        self.assertEqual(row["id"], "7")
+        self.assertEqual(row["hallucination"], 1.0)
+        self.assertIsNone(row["completeness"])  # not computed
+        self.assertEqual(row["unsupported_claims"], ["$150", "2025"])
+        self.assertEqual(row["parse_ms"], 3.2)
+
+    def test_csv_flushes_row_groups_and_round_trips_lists(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "report.csv")
+            with CsvReportWriter(path, row_group_size=2) as writer:
+                for i in range(5):
+                    writer.write(REPORT, record_id=f"r{i}")
+                self.assertEqual(writer.rows_written, 4)  # two full groups, one row still buffered
+            self.assertEqual(writer.rows_written, 5)
+
+            with open(path, newline="", encoding="utf-8") as f:
+                rows = list(csv.DictReader(f))
+        self.assertEqual([r["id"] for r in rows], ["r0", "r1", "r2", "r3", "r4"])
+        self.assertEqual(json.loads(rows[0]["reasons"]), REPORT["verdict"]["reasons"])
+        self.assertEqual(rows[0]["completeness"], "")
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow not installed")
+    def test_parquet_writes_one_row_group_per_flush(self):
+        import pyarrow.parquet as pq
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "report.parquet")
+            with open_report_writer(path, "parquet", row_group_size=2) as writer:
+                for i in range(5):
+                    writer.write(REPORT, record_id=f"r{i}")
+            parquet = pq.ParquetFile(path)
+            self.assertEqual(parquet.metadata.num_row_groups, 3)
+            table = parquet.read()
+        self.assertEqual(table.column_names, COLUMNS)
+        self.assertEqual(table.column("id").to_pylist(), ["r0", "r1", "r2", "r3", "r4"])
+        self.assertEqual(table.column("unsupported_claims").to_pylist()[0], ["$150", "2025"])
+        self.assertIsNone(table.column("completeness").to_pylist()[0])
+
+    def test_writer_needs_write_rows(self):
+        with self.assertRaises(TypeError):
+            ReportWriter("report.out")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import sys
+import unittest
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pipeline.session import SessionEvaluator, SessionStore, StaleTurn
+
+class FakePipeline:
+    """Scores each pair by the length of the AI message; records what was evaluated."""
+    def __init__(self):
+        self.calls = []
+
+    def run(self, query, response, context, metrics=None, profile=None):
+        self.calls.append((query, response, list(context)))
+        score = len(response) / 10
+        return {
+            "metrics": {"relevance": score, "latency_ms": 1.0},
+            "verdict": {"status": "FAIL" if score < 0.3 else "PASS", "reasons": []},
+        }
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def conversation(chat_id, n_pairs):
+    turns = [{"turn": 1, "role": "AI/Chatbot", "message": "Hello"}]
+    for k in range(n_pairs):
+        turns.append({"turn": 2 * k + 2, "role": "User", "message": f"question {k}"})
+        turns.append({"turn": 2 * k + 3, "role": "AI/Chatbot", "message": "a" * (k + 1)})
+    return {"chat_id": chat_id, "conversation_turns": turns}
+
+class TestSessionEvaluator(unittest.TestCase):
+    def setUp(self):
+        self.pipeline = FakePipeline()
+        self.clock = FakeClock()
+        self.sessions = SessionEvaluator(self.pipeline, SessionStore(max_sessions=2, idle_ttl_s=60, window=2,
+                                                                     clock=self.clock))
+
+    def test_sync_evaluates_only_new_pairs(self):
+        first = self.sessions.sync(conversation(78128, 2), context=["chunk"])
+        self.assertEqual([t["turn"] for t in first["turns"]], [3, 5])
+
+        second = self.sessions.sync(conversation(78128, 3))
+        self.assertEqual([t["turn"] for t in second["turns"]], [7])
+        self.assertEqual(len(self.pipeline.calls), 3)
+        # The session keeps the context of the first sync
+        self.assertEqual(self.pipeline.calls[-1], ("question 2", "aaa", ["chunk"]))
+
+        summary = second["conversation"]
+        self.assertEqual(summary["chat_id"], "78128")
+        self.assertEqual(summary["turns_evaluated"], 3)
+        self.assertAlmostEqual(summary["mean"]["relevance"], 0.2)
+        # Window of the last 2 pairs: 0.2 and 0.3
+        self.assertEqual(summary["window"]["turns"], [5, 7])
+        self.assertAlmostEqual(summary["window"]["mean"]["relevance"], 0.25)
+        self.assertEqual(summary["window"]["status"], "FAIL")
+        self.assertEqual(summary["verdicts"], {"PASS": 1, "WARN": 0, "FAIL": 2})
+        self.assertEqual(summary["status"], "FAIL")
+
+    def test_pending_lists_pairs_after_last_turn(self):
+        self.assertEqual([pair[0] for pair in self.sessions.pending(conversation(78128, 2))], [3, 5])
+        self.sessions.sync(conversation(78128, 2))
+        self.assertEqual(self.sessions.pending(conversation(78128, 3)), [(7, "question 2", "aaa")])
+        self.assertEqual(self.sessions.pending(conversation(78128, 2)), [])
+
+    def test_resync_skips_unnumbered_and_empty_turns(self):
+        export = conversation(78128, 2)
+        del export["conversation_turns"][-1]["turn"]                   # numbered 5 by position
+        export["conversation_turns"].append({"turn": 7, "role": "User", "message": "question 2"})
+        export["conversation_turns"].append({"turn": 8, "role": "AI/Chatbot", "message": None})
+        first = self.sessions.sync(export, context=["chunk"])
+        self.assertEqual([t["turn"] for t in first["turns"]], [3, 5])
+
+        second = self.sessions.sync(export)
+        self.assertEqual(second["turns"], [])
+        self.assertEqual(len(self.pipeline.calls), 2)
+        self.assertEqual(second["conversation"]["turns_evaluated"], 2)
+
+    def test_append_rejects_stale_turn(self):
+        self.sessions.append("c", "q", "aaaa", turn=4, context=["x"])
+        with self.assertRaises(StaleTurn):
+            self.sessions.append("c", "q", "aaaa", turn=4)
+        result = self.sessions.append("c", "q", "aaaa")
+        self.assertEqual(result["turn"]["turn"], 5)
+
+    def test_idle_sessions_expire(self):
+        self.sessions.append("c", "q", "aaaa")
+        self.clock.now = 61
+        self.assertIsNone(self.sessions.summary("c"))
+
+    def test_store_is_bounded(self):
+        for chat_id in ("a", "b", "c"):
+            self.sessions.append(chat_id, "q", "aaaa")
+        self.assertEqual(len(self.sessions.store), 2)
+        self.assertIsNone(self.sessions.summary("a"))
+
+if __name__ == '__main__':
+    unittest.main()
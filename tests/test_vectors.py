@@ -0,0 +1,114 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+import spacy
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pipeline.context_index import ContextIndex, ContextSummaryCache
+from pipeline.vectors import CompactVectors, StaticVectors
+
+class TestStaticVectors(unittest.TestCase):
+    def setUp(self):
+        # Blank pipeline with random vectors: no model download needed
+        self.nlp = spacy.blank("en")
+        rng = np.random.default_rng(0)
+        for word in ["the", "hotel", "Hotel", "room", "price", "is", "cheap", "clinic", "doctor", "?", "."]:
+            self.nlp.vocab.set_vector(word, rng.normal(size=16).astype(np.float32))
+        self.vectors = StaticVectors(self.nlp)
+
+    def test_matches_doc_similarity(self):
+        pairs = [
+            ("what is the room price?", "the hotel room is cheap."),
+            ("Hotel price", "hotel price"),          # case-sensitive lookups, like spaCy
+            ("clinic doctor", "unknown words only"),  # OOV tokens count as zeros in the mean
+            ("the room", "the room"),                # identical tokens -> 1.0
+            ("zzz qqq", "the price"),                # zero vector -> 0.0
+        ]
+        for a, b in pairs:
+            expected = self.nlp(a).similarity(self.nlp(b))
+            self.assertAlmostEqual(self.vectors.similarity(a, b), expected, places=5, msg=(a, b))
+
+    def test_norm_matches_doc(self):
+        for text in ["the hotel room", "", "zzz"]:
+            self.assertAlmostEqual(self.vectors.norm(text), float(self.nlp(text).vector_norm), places=5)
+
+    def test_short_strings_cached_long_strings_not(self):
+        vectors = StaticVectors(self.nlp, max_items=2, max_cache_chars=20)
+        first = vectors.vector("the room price")
+        self.assertIs(vectors.vector("the room price"), first)
+        vectors.vector("the hotel room is cheap and the price is low")
+        self.assertEqual(list(vectors._cache), ["the room price"])
+
+class TestCompactVectors(unittest.TestCase):
+    WORDS = ["the", "hotel", "room", "price", "is", "cheap", "clinic", "doctor", "visit", "fee", "?", "."]
+
+    def setUp(self):
+        # Vectors close to an 8-dimensional subspace of 32 dimensions, as real tables mostly are
+        self.nlp = spacy.blank("en")
+        rng = np.random.default_rng(1)
+        basis = rng.normal(size=(8, 32))
+        for word in self.WORDS:
+            vector = rng.normal(size=8) @ basis + rng.normal(scale=0.01, size=32)
+            self.nlp.vocab.set_vector(word, vector.astype(np.float32))
+        self.full = StaticVectors(self.nlp)
+        self.pairs = [
+            ("what is the room price?", "the hotel room is cheap."),
+            ("clinic visit fee", "the doctor is cheap"),
+            ("hotel", "zzz hotel unknown"),
+        ]
+
+    def test_float32_full_width_is_exact(self):
+        compact = StaticVectors(self.nlp, table=CompactVectors.build(self.nlp.vocab.vectors, quantize=False))
+        for a, b in self.pairs:
+            self.assertAlmostEqual(compact.similarity(a, b), self.full.similarity(a, b), places=5)
+
+    def test_pca_int8_close_and_smaller(self):
+        table = CompactVectors.build(self.nlp.vocab.vectors, dim=8, quantize=True)
+        self.assertEqual(table.width, 8)
+        self.assertEqual(table.data.dtype, np.int8)
+        self.assertLess(table.data.nbytes, self.nlp.vocab.vectors.data.nbytes / 10)
+        compact = StaticVectors(self.nlp, table=table)
+        for a, b in self.pairs:
+            self.assertAlmostEqual(compact.similarity(a, b), self.full.similarity(a, b), delta=0.02, msg=(a, b))
+        # Special cases are unchanged: identical tokens, no vector at all
+        self.assertEqual(compact.similarity("the room", "the room"), 1.0)
+        self.assertEqual(compact.similarity("zzz qqq", "the price"), 0.0)
+
+    def test_save_load_round_trip(self):
+        table = CompactVectors.build(self.nlp.vocab.vectors, dim=8, quantize=True, source="blank")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "table.npz")
+            table.save(path)
+            loaded = CompactVectors.load(path)
+        self.assertEqual(loaded.meta, {"source": "blank", "width": 32, "dim": 8, "quantized": True})
+        orths = self.nlp.make_doc("the hotel zzz").to_array("ORTH")
+        np.testing.assert_array_equal(loaded.find(orths), table.find(orths))
+        self.assertEqual(loaded.find(orths)[-1], -1)
+
+    def test_context_index_ranks_in_compact_space(self):
+        table = CompactVectors.build(self.nlp.vocab.vectors, dim=8, quantize=True)
+        summaries = ContextSummaryCache(doc_cache=None, vectors=StaticVectors(self.nlp, table=table))
+        chunks = [self.nlp("the clinic doctor visit fee"), self.nlp("the hotel room price is cheap")]
+        index = ContextIndex([summaries._summarize(doc) for doc in chunks], unit_vector=summaries.unit_vector)
+        self.assertEqual(index.matrix.shape, (2, 8))
+        self.assertEqual(index.top_k(self.nlp("hotel room price"), k=1)[0][0], 1)
+
+    def test_compact_pipeline_never_uses_the_md_model(self):
+        from pipeline.evaluation import Pipeline
+        from pipeline.model import nlp_small
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "table.npz")
+            CompactVectors.build(self.nlp.vocab.vectors, dim=8).save(path)
+            pipeline = Pipeline(compact_vectors=path)
+        self.assertIs(pipeline._tiers["full"].model, nlp_small)
+        self.assertIs(pipeline.static_vectors.nlp, nlp_small)
+        self.assertIs(pipeline.doc_cache, pipeline.fast_doc_cache)
+
+if __name__ == '__main__':
+    unittest.main()